@@ -0,0 +1,12 @@
+-- Migration: Incremental Meilisearch sync
+-- Created: 2026-10-16
+-- Purpose: Let the search sync pull only rows changed since its watermark
+--          (stored in job_watermarks as "meilisearch:<index>")
+
+-- The sweep includes soft-deleted and unpublished rows (they are removed
+-- from the index), so these indexes are not partial on deleted_at
+CREATE INDEX IF NOT EXISTS idx_institutions_updated_at_all
+ON public.institutions(updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_programs_updated_at_all
+ON public.programs(updated_at);
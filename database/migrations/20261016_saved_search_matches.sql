@@ -0,0 +1,65 @@
+-- Migration: Incremental saved-search matching
+-- Created: 2026-10-16
+-- Purpose: Queue (saved search, program) matches found by evaluating changed
+--          programs against saved searches, instead of re-running every search
+
+-- Pending and sent matches. One row per pair, so a program is announced to a
+-- saved search at most once.
+CREATE TABLE IF NOT EXISTS public.saved_search_matches (
+    saved_search_id UUID NOT NULL REFERENCES public.user_saved_searches(id) ON DELETE CASCADE,
+    program_id UUID NOT NULL REFERENCES public.programs(id) ON DELETE CASCADE,
+    matched_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    notified_at TIMESTAMPTZ,
+    PRIMARY KEY (saved_search_id, program_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_saved_search_matches_pending
+ON public.saved_search_matches(saved_search_id)
+WHERE notified_at IS NULL;
+
+-- Progress markers for incremental background jobs (e.g. the last
+-- programs.updated_at already matched against saved searches)
+CREATE TABLE IF NOT EXISTS public.job_watermarks (
+    name TEXT PRIMARY KEY,
+    watermark TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TRIGGER update_job_watermarks_updated_at
+BEFORE UPDATE ON public.job_watermarks
+FOR EACH ROW
+EXECUTE FUNCTION public.update_updated_at_column();
+
+-- Programs changed since a watermark
+CREATE INDEX IF NOT EXISTS idx_programs_updated_at
+ON public.programs(updated_at)
+WHERE deleted_at IS NULL;
+
+-- Internal tables: no end-user access
+ALTER TABLE public.saved_search_matches ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.job_watermarks ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Admins can manage saved search matches"
+ON public.saved_search_matches
+FOR ALL
+TO authenticated
+USING (
+    EXISTS (
+        SELECT 1 FROM public.user_profiles
+        WHERE id = auth.uid() AND role = 'internal_admin'
+    )
+);
+
+CREATE POLICY "Admins can manage job watermarks"
+ON public.job_watermarks
+FOR ALL
+TO authenticated
+USING (
+    EXISTS (
+        SELECT 1 FROM public.user_profiles
+        WHERE id = auth.uid() AND role = 'internal_admin'
+    )
+);
+
+COMMENT ON TABLE public.saved_search_matches IS 'Programs matched to saved searches with notifications enabled; notified_at is set once emailed';
+COMMENT ON TABLE public.job_watermarks IS 'Last processed position of incremental background jobs';
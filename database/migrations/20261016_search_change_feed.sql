@@ -0,0 +1,22 @@
+-- Migration: Search change feed
+-- Created: 2026-10-16
+-- Purpose: Publish institution and program changes over Supabase Realtime so
+--          the API's search indexer (SEARCH_CDC_ENABLED) can push them to
+--          Meilisearch without a manual sync
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_publication_tables
+        WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'institutions'
+    ) THEN
+        ALTER PUBLICATION supabase_realtime ADD TABLE public.institutions;
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_publication_tables
+        WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'programs'
+    ) THEN
+        ALTER PUBLICATION supabase_realtime ADD TABLE public.programs;
+    END IF;
+END $$;
@@ -0,0 +1,48 @@
+-- Migration: user_role access token claim
+-- Created: 2026-10-16
+-- Purpose: Put user_profiles.role into Supabase access tokens so admin
+--          endpoints can authorise from the verified token instead of
+--          querying user_profiles on every request
+--
+-- After applying, enable it under Authentication > Hooks > Customize Access
+-- Token (JWT) Claims, selecting public.custom_access_token_hook.
+-- A role change reaches the claim on the next token refresh; RLS policies
+-- keep checking user_profiles directly.
+
+CREATE OR REPLACE FUNCTION public.custom_access_token_hook(event JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    claims JSONB;
+    profile_role TEXT;
+BEGIN
+    SELECT role INTO profile_role
+    FROM public.user_profiles
+    WHERE id = (event->>'user_id')::UUID;
+
+    claims := event->'claims';
+    IF profile_role IS NOT NULL THEN
+        claims := jsonb_set(claims, '{user_role}', to_jsonb(profile_role));
+    ELSE
+        claims := claims - 'user_role';
+    END IF;
+
+    RETURN jsonb_set(event, '{claims}', claims);
+END;
+$$;
+
+-- Only Supabase Auth may run the hook
+GRANT USAGE ON SCHEMA public TO supabase_auth_admin;
+GRANT EXECUTE ON FUNCTION public.custom_access_token_hook TO supabase_auth_admin;
+REVOKE EXECUTE ON FUNCTION public.custom_access_token_hook FROM authenticated, anon, public;
+
+GRANT SELECT ON TABLE public.user_profiles TO supabase_auth_admin;
+
+CREATE POLICY "Auth admin can read user roles"
+ON public.user_profiles
+AS PERMISSIVE
+FOR SELECT
+TO supabase_auth_admin
+USING (true);
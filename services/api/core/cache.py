@@ -0,0 +1,548 @@
+"""
+Response Cache
+Two-tier cache for public catalog responses: per-worker LRU (L1) + Redis (L2)
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from enum import Enum
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+from core.config import settings
+from core.etag import canonical_json, make_etag, set_current_etag
+from core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Cache namespaces (one per cached endpoint)
+INSTITUTIONS_LIST = "institutions:list"
+INSTITUTION_DETAIL = "institutions:detail"
+INSTITUTION_PROGRAMS = "institutions:programs"
+PROGRAMS_LIST = "programs:list"
+PROGRAM_DETAIL = "programs:detail"
+DEADLINES = "deadlines"
+# Per-entity snapshots (bookmark listings)
+PROGRAM_SNAPSHOTS = "programs:snapshot"
+INSTITUTION_SNAPSHOTS = "institutions:snapshot"
+
+# Institution and program responses embed each other (program counts,
+# institution names), so a full catalog invalidation clears all of these
+CATALOG_NAMESPACES = (
+    INSTITUTIONS_LIST,
+    INSTITUTION_DETAIL,
+    INSTITUTION_PROGRAMS,
+    PROGRAMS_LIST,
+    PROGRAM_DETAIL,
+    PROGRAM_SNAPSHOTS,
+    INSTITUTION_SNAPSHOTS,
+)
+
+
+def namespace_tag(namespace: str) -> str:
+    """Tag carried by every entry of a namespace"""
+    return f"ns:{namespace}"
+
+
+def institution_tag(institution_id: str) -> str:
+    """Tag for entries that include an institution"""
+    return f"institution:{institution_id}"
+
+
+def program_tag(program_id: str) -> str:
+    """Tag for entries that include a program"""
+    return f"program:{program_id}"
+
+
+def _normalize(value: Any) -> Any:
+    """
+    Normalize filter parameters so equivalent requests share a key
+
+    Drops None/empty values, strips strings, and sorts/deduplicates lists
+    (list filters are `IN (...)` sets, so order doesn't matter).
+    """
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        normalized = {k: _normalize(v) for k, v in value.items()}
+        return {k: v for k, v in normalized.items() if v not in (None, "", [])}
+    if isinstance(value, (list, tuple, set)):
+        return sorted({json.dumps(_normalize(v), sort_keys=True, default=str) for v in value})
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+class LRUCache:
+    """
+    Size-bounded in-process LRU with per-entry expiry and a tag index
+
+    Not thread-safe; only used from the event loop.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live entry (and mark it recently used) or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]) -> None:
+        """Store an entry, evicting the least recently used ones if full"""
+        if self.max_entries <= 0:
+            return
+        self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of the tags, returns the count dropped"""
+        keys = set()
+        for tag in tags:
+            keys |= self._tags.get(tag, set())
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class ResponseCache:
+    """
+    Two-tier cache-aside helper for read-heavy endpoints
+
+    L1 is a per-worker LRU holding decoded responses, so hot entries are
+    served without a network hop. L2 is Redis, shared by all workers and
+    storing JSON under `{prefix}:{namespace}:{hash(params)}`.
+
+    Every entry is tagged with its namespace plus the institutions and
+    programs it contains. Invalidating a tag deletes the matching Redis
+    keys (via a per-tag key set, no keyspace scan) and publishes the tags
+    on a pub/sub channel so every worker drops them from its L1 too.
+    L1 entries also expire after `l1_ttl`, which bounds staleness if a
+    worker misses a message while disconnected.
+
+    Concurrent misses for the same key inside a worker share one loader
+    call (single-flight), so an expired hot key triggers one database
+    query per worker instead of one per request.
+
+    Redis is optional: if it is unreachable L2 is bypassed for
+    `retry_after` seconds and misses go straight to the database.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "admitly:cache",
+        default_ttl: int = 300,
+        enabled: bool = True,
+        retry_after: float = 30.0,
+        l1_max_entries: int = 1024,
+        l1_ttl: float = 30.0,
+    ):
+        self.url = url
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.enabled = enabled
+        self.retry_after = retry_after
+        self.l1_ttl = l1_ttl
+        self.channel = f"{prefix}:invalidate"
+
+        self.l1 = LRUCache(l1_max_entries)
+        self._redis: Optional[redis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._unavailable_until = 0.0
+        self._flights = SingleFlight()
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        """Whether Redis should be tried for this request"""
+        return self.enabled and time.monotonic() >= self._unavailable_until
+
+    def _client(self) -> redis.Redis:
+        """Redis client bound to the running event loop (created on first use)"""
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._loop is not loop:
+            self._redis = redis.Redis.from_url(
+                self.url,
+                decode_responses=True,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5,
+            )
+            self._loop = loop
+        return self._redis
+
+    async def start(self) -> None:
+        """Start listening for invalidations published by other workers"""
+        if self.enabled and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        """Stop the invalidation listener and close pooled Redis connections"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+        if self._redis is not None:
+            try:
+                await self._redis.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing Redis client: {e}")
+        self._redis = None
+        self._loop = None
+
+    def _mark_unavailable(self, error: Exception) -> None:
+        logger.warning(f"Redis cache unavailable, bypassing for {self.retry_after}s: {str(error)}")
+        self._unavailable_until = time.monotonic() + self.retry_after
+
+    def make_key(self, namespace: str, params: Any) -> str:
+        """Build the cache key for a namespace and its (normalized) parameters"""
+        payload = json.dumps(_normalize(params), sort_keys=True, default=str, separators=(",", ":"))
+        digest = hashlib.sha1(payload.encode()).hexdigest()
+        return f"{self.prefix}:{namespace}:{digest}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        params: Any,
+        loader: Callable[[], Awaitable[T]],
+        ttl: Optional[int] = None,
+        model: Optional[Type[BaseModel]] = None,
+        tags: Optional[Callable[[Any], Iterable[str]]] = None,
+    ) -> T:
+        """
+        Return the cached value or load, store and return it
+
+        Args:
+            namespace: Cache namespace (e.g. INSTITUTIONS_LIST)
+            params: Request parameters identifying the response
+            loader: Zero-argument coroutine function producing the value
+            ttl: Redis expiry in seconds (defaults to `default_ttl`)
+            model: Pydantic model to rebuild cached values into
+            tags: Returns the tags for a loaded value (JSON form), e.g.
+                the institution/program ids it contains
+
+        Returns:
+            Cached or freshly loaded value. Exceptions from `loader`
+            (e.g. 404 HTTPException) propagate and are never cached.
+            The value's ETag (content hash, computed once on load) is
+            made available to `core.etag.conditional_response`.
+        """
+        if not self.enabled:
+            set_current_etag(None)
+            return await loader()
+
+        key = self.make_key(namespace, params)
+        ttl = ttl or self.default_ttl
+
+        hit = self.l1.get(key)
+        if hit is not None:
+            value, etag = hit
+            set_current_etag(etag)
+            return value
+
+        cached = await self._get(key)
+        if cached is not None:
+            entry = json.loads(cached)
+            value = model.model_validate(entry["v"]) if model else entry["v"]
+            etag = entry.get("e") or make_etag(canonical_json(entry["v"]))
+            self.l1.set(key, (value, etag), min(ttl, self.l1_ttl), entry["t"])
+            set_current_etag(etag)
+            return value
+
+        async def load() -> Tuple[T, str]:
+            value = await loader()
+            data = value.model_dump(mode="json") if isinstance(value, BaseModel) else value
+            etag = make_etag(canonical_json(data))
+            entry_tags = [namespace_tag(namespace), *(tags(data) if tags else ())]
+            self.l1.set(key, (value, etag), min(ttl, self.l1_ttl), entry_tags)
+            await self._set(
+                key, json.dumps({"v": data, "t": entry_tags, "e": etag}, default=str), ttl, entry_tags
+            )
+            return value, etag
+
+        value, etag = await self._flights.do(key, load)
+        set_current_etag(etag)
+        return value
+
+    async def get_many_or_load(
+        self,
+        namespace: str,
+        ids: Iterable[str],
+        loader: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+        ttl: Optional[int] = None,
+        tags: Optional[Callable[[Any], Iterable[str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Batched cache-aside for per-entity values (JSON-serializable dicts)
+
+        Looks every id up in L1, then the rest in Redis with one MGET, and
+        loads only the remaining ids with a single loader call.
+
+        Args:
+            namespace: Cache namespace (e.g. PROGRAM_SNAPSHOTS)
+            ids: Entity ids
+            loader: Coroutine function taking the missing ids and returning
+                {id: value}; ids it omits (not found) are not cached
+            ttl: Redis expiry in seconds (defaults to `default_ttl`)
+            tags: Returns the tags for one value
+
+        Returns:
+            {id: value} for every id that was cached or loaded
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return {}
+        if not self.enabled:
+            return await loader(ids)
+
+        ttl = ttl or self.default_ttl
+        keys = {entity_id: self.make_key(namespace, {"id": entity_id}) for entity_id in ids}
+        found: Dict[str, Any] = {}
+
+        for entity_id, key in keys.items():
+            hit = self.l1.get(key)
+            if hit is not None:
+                found[entity_id] = hit[0]
+
+        missing = [entity_id for entity_id in ids if entity_id not in found]
+        cached = await self._get_many([keys[entity_id] for entity_id in missing])
+        for entity_id, raw in zip(missing, cached):
+            if raw is not None:
+                entry = json.loads(raw)
+                found[entity_id] = entry["v"]
+                self.l1.set(keys[entity_id], (entry["v"], entry.get("e")), min(ttl, self.l1_ttl), entry["t"])
+
+        missing = [entity_id for entity_id in ids if entity_id not in found]
+        if missing:
+            loaded = await loader(missing)
+            entries = []
+            for entity_id, value in loaded.items():
+                etag = make_etag(canonical_json(value))
+                entry_tags = [namespace_tag(namespace), *(tags(value) if tags else ())]
+                self.l1.set(keys[entity_id], (value, etag), min(ttl, self.l1_ttl), entry_tags)
+                payload = json.dumps({"v": value, "t": entry_tags, "e": etag}, default=str)
+                entries.append((keys[entity_id], payload, entry_tags))
+            await self._set_many(entries, ttl)
+            found.update(loaded)
+
+        return found
+
+    async def invalidate(self, *namespaces: str) -> None:
+        """
+        Drop every cached entry in the given namespaces (all workers)
+
+        Args:
+            namespaces: Namespaces to clear
+        """
+        await self.invalidate_tags(*(namespace_tag(ns) for ns in namespaces))
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """
+        Drop every cached entry carrying any of the tags (all workers)
+
+        Args:
+            tags: Tags to invalidate (see namespace_tag/institution_tag/program_tag)
+        """
+        self.l1.invalidate_tags(tags)
+
+        if not tags or not self.available:
+            return
+
+        try:
+            client = self._client()
+            tag_keys = [self._tag_key(tag) for tag in tags]
+            async with client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+
+            keys = set().union(*members)
+            await client.delete(*tag_keys, *keys)
+            await client.publish(
+                self.channel, json.dumps({"origin": self._origin, "tags": list(tags)})
+            )
+        except Exception as e:
+            self._mark_unavailable(e)
+
+    async def _get(self, key: str) -> Optional[str]:
+        if not self.available:
+            return None
+        try:
+            return await self._client().get(key)
+        except Exception as e:
+            self._mark_unavailable(e)
+            return None
+
+    async def _get_many(self, keys: List[str]) -> List[Optional[str]]:
+        if not keys or not self.available:
+            return [None] * len(keys)
+        try:
+            return await self._client().mget(keys)
+        except Exception as e:
+            self._mark_unavailable(e)
+            return [None] * len(keys)
+
+    async def _set(self, key: str, payload: str, ttl: int, tags: List[str]) -> None:
+        await self._set_many([(key, payload, tags)], ttl)
+
+    async def _set_many(self, entries: List[Tuple[str, str, List[str]]], ttl: int) -> None:
+        """Store (key, payload, tags) entries in one pipeline"""
+        if not entries or not self.available:
+            return
+        try:
+            async with self._client().pipeline(transaction=False) as pipe:
+                for key, payload, tags in entries:
+                    pipe.set(key, payload, ex=ttl)
+                    for tag in tags:
+                        tag_key = self._tag_key(tag)
+                        pipe.sadd(tag_key, key)
+                        # Keep the tag's key set alive at least as long as its entries
+                        pipe.expire(tag_key, max(ttl, self.default_ttl))
+                await pipe.execute()
+        except Exception as e:
+            self._mark_unavailable(e)
+
+    async def _listen(self) -> None:
+        """Apply invalidations published by other workers to this worker's L1"""
+        while True:
+            # Dedicated connection without a read timeout (pub/sub idles)
+            client = redis.Redis.from_url(
+                self.url, decode_responses=True, socket_connect_timeout=0.5
+            )
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    logger.info(f"Listening for cache invalidations on {self.channel}")
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        payload = json.loads(message["data"])
+                        if payload.get("origin") != self._origin:
+                            self.l1.invalidate_tags(payload.get("tags", []))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener disconnected: {str(e)}")
+                # Messages may have been missed while disconnected
+                self.l1.clear()
+                await asyncio.sleep(self.retry_after)
+            finally:
+                await client.aclose()
+
+
+# Singleton instance
+response_cache = ResponseCache(
+    settings.REDIS_URL,
+    default_ttl=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+    l1_max_entries=settings.CACHE_L1_MAX_ENTRIES,
+    l1_ttl=settings.CACHE_L1_TTL_SECONDS,
+)
+
+
+def catalog_tags(data: Any) -> List[str]:
+    """
+    Institution/program tags for a catalog response (JSON form)
+
+    Understands single rows and `{"data": [...]}` pages of institution or
+    program rows (programs carry `institution_id`).
+    """
+    tags = set()
+    for row in _rows(data):
+        if "institution_id" in row:
+            tags.update(_program_row_tags(row))
+        else:
+            tags.add(institution_tag(row["id"]))
+    return sorted(tags)
+
+
+def program_tags(data: Any) -> List[str]:
+    """
+    Program/institution tags for a response of program rows (JSON form)
+
+    Unlike `catalog_tags` this doesn't infer the entity type, so sparse
+    fieldsets are tagged correctly.
+    """
+    tags = set()
+    for row in _rows(data):
+        tags.update(_program_row_tags(row))
+    return sorted(tags)
+
+
+def _rows(data: Any) -> List[Dict[str, Any]]:
+    """Rows with an id in a single-row or `{"data": [...]}` response"""
+    rows = data.get("data") if isinstance(data, dict) and isinstance(data.get("data"), list) else [data]
+    return [row for row in rows if isinstance(row, dict) and row.get("id")]
+
+
+def _program_row_tags(row: Dict[str, Any]) -> List[str]:
+    tags = [program_tag(row["id"])]
+    if row.get("institution_id"):
+        tags.append(institution_tag(row["institution_id"]))
+    return tags
+
+
+async def invalidate_catalog() -> None:
+    """Invalidate every cached institution/program response"""
+    await response_cache.invalidate(*CATALOG_NAMESPACES)
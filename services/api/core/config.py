@@ -22,13 +22,50 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str
     SUPABASE_SERVICE_KEY: str
 
+    # Supabase HTTP connection pool (shared per worker process)
+    SUPABASE_POOL_MAX_CONNECTIONS: int = 100
+    SUPABASE_POOL_MAX_KEEPALIVE: int = 20
+    SUPABASE_POOL_KEEPALIVE_EXPIRY: float = 30.0
+    SUPABASE_HTTP_TIMEOUT: float = 10.0
+    SUPABASE_HTTP2: bool = True
+    SUPABASE_QUERY_WORKERS: int = 32
+
     # Meilisearch
     MEILISEARCH_HOST: str = "http://localhost:7700"
     MEILISEARCH_API_KEY: str
+    MEILISEARCH_TIMEOUT: float = 5.0
+    MEILISEARCH_CONNECT_TIMEOUT: float = 2.0
+    MEILISEARCH_MAX_CONNECTIONS: int = 50
+    MEILISEARCH_MAX_KEEPALIVE: int = 20
+
+    # In-memory autocomplete index (falls back to Meilisearch when empty)
+    AUTOCOMPLETE_IN_MEMORY: bool = True
+    AUTOCOMPLETE_REFRESH_SECONDS: float = 60.0
+
+    # In-memory saved-search index used to match changed programs
+    SAVED_SEARCH_MATCHER_REFRESH_SECONDS: float = 300.0
+
+    # Push institution/program changes to Meilisearch from Supabase Realtime.
+    # Enable on one process only; every subscriber re-indexes every change.
+    SEARCH_CDC_ENABLED: bool = False
+    SEARCH_CDC_WINDOW_SECONDS: float = 1.0  # Coalesce changes per document for this long
+    SEARCH_CDC_MAX_BATCH: int = 500  # Flush early once this many documents are pending
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
 
+    # Response cache for public catalog endpoints (bypassed if Redis is down)
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 600
+    CACHE_DEADLINES_TTL_SECONDS: int = 60
+    # Per-worker in-process tier in front of Redis
+    CACHE_L1_MAX_ENTRIES: int = 1024
+    CACHE_L1_TTL_SECONDS: float = 30.0
+
+    # Send catalog responses without re-validating them against
+    # response_model (orjson for plain JSON)
+    FAST_JSON_RESPONSES: bool = False
+
     # AI Services
     GEMINI_API_KEY: str = ""
     CLAUDE_API_KEY: str = ""
@@ -42,6 +79,19 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # Supabase access-token verification (local, without calling Supabase Auth)
+    SUPABASE_JWT_SECRET: str = ""  # HS256 secret; empty: HS256 tokens are checked remotely
+    SUPABASE_JWKS_URL: str = ""  # Default: {SUPABASE_URL}/auth/v1/.well-known/jwks.json
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    AUTH_TOKEN_CACHE_SECONDS: float = 60.0  # Trust a verified token this long (capped at exp)
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_REVOCATION_SAMPLE_RATE: float = 0.0  # Fraction of requests re-checked with Supabase Auth
+
+    # Admin role resolution
+    AUTH_ROLE_FROM_JWT: bool = True  # Trust the `user_role` claim added by the access token hook
+    ROLE_CACHE_SECONDS: float = 60.0  # Reuse a user_profiles.role lookup this long
+    ROLE_CACHE_SIZE: int = 10000
+
     # CORS
     CORS_ORIGINS: Union[str, List[str]] = [
         "http://localhost:5173",
@@ -67,6 +117,19 @@ class Settings(BaseSettings):
     RESEND_API_KEY: str = ""
     FROM_EMAIL: str = "Admitly <hello@admitly.com.ng>"
     SUPPORT_EMAIL: str = "support@admitly.com.ng"
+    NOTIFICATION_CONCURRENCY: int = 10  # Saved searches checked in parallel
+
+    # Outbound email queue
+    EMAIL_BACKEND: str = "resend"  # resend, file (writes JSON to EMAIL_FILE_DIR) or smtp
+    EMAIL_FILE_DIR: str = "outbox"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 1025
+    EMAIL_QUEUE_WORKERS: int = 4
+    EMAIL_RATE_PER_SECOND: float = 2.0  # Resend's default API rate limit
+    EMAIL_RATE_BURST: int = 2
+    EMAIL_MAX_RETRIES: int = 3
+    EMAIL_RETRY_BASE_SECONDS: float = 1.0
+    EMAIL_BATCH_SIZE: int = 100  # Emails per provider API call (Resend batch limit)
 
     class Config:
         env_file = ".env"
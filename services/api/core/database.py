@@ -1,38 +1,430 @@
 """
 Database Connection (Supabase)
 """
-from supabase import create_client, Client
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import httpx
+from postgrest import SyncPostgrestClient
+from supabase import create_client, Client, ClientOptions
 from core.config import settings
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of Supabase HTTP connection pool metrics"""
+
+    in_use: int = 0
+    idle: int = 0
+    open_connections: int = 0
+    max_connections: int = 0
+    total_requests: int = 0
+    wait_time_ms_avg: float = 0.0
+    wait_time_ms_max: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ExecutorStats:
+    """Snapshot of database query offload metrics"""
+
+    workers: int = 0
+    running: int = 0
+    queued: int = 0
+    total_queries: int = 0
+    wait_time_ms_avg: float = 0.0
+    wait_time_ms_max: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _InstrumentedTransport(httpx.HTTPTransport):
+    """
+    HTTP transport that records pool usage
+
+    Tracks in-flight requests and how long each request waited before
+    its headers could be sent (connection checkout + connect/TLS if the
+    pool had no idle keep-alive connection available).
+    """
+
+    def __init__(self, pool: "SupabaseClientPool", **kwargs):
+        super().__init__(**kwargs)
+        self._owner = pool
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        recorded = False
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal recorded
+            if not recorded and event_name.endswith("send_request_headers.started"):
+                recorded = True
+                self._owner._record_wait((time.perf_counter() - started) * 1000)
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        self._owner._enter()
+        try:
+            return super().handle_request(request)
+        finally:
+            self._owner._exit()
+
+    def connection_counts(self) -> Dict[str, int]:
+        """Return open and idle connection counts from the underlying pool"""
+        connections = list(self._pool.connections)
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {"open": len(connections), "idle": idle}
+
+
+class SupabaseClientPool:
+    """
+    Process-wide Supabase client backed by one keep-alive HTTP/2 pool
+
+    Every PostgREST and Auth request in the worker shares the same httpx
+    connection pool, so TLS handshakes happen once per connection instead
+    of once per request. Per-request RLS scoping is done by creating a
+    lightweight PostgREST client (just a header set) that reuses the
+    shared pool - see `scoped()`.
+
+    Started/stopped from the FastAPI lifespan hook; lazily started on first
+    use so scripts and tests that never run the lifespan still work.
+    """
+
+    def __init__(
+        self,
+        supabase_url: str,
+        supabase_key: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        http2: bool = True,
+    ):
+        self.supabase_url = supabase_url
+        self.supabase_key = supabase_key
+        self.rest_url = f"{supabase_url}/rest/v1"
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.http2 = http2
+
+        self._lock = threading.Lock()
+        self._http: Optional[httpx.Client] = None
+        self._transport: Optional[_InstrumentedTransport] = None
+        self._client: Optional[Client] = None
+
+        self._in_use = 0
+        self._total_requests = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+
+    @property
+    def started(self) -> bool:
+        return self._client is not None
+
+    def start(self) -> None:
+        """Open the shared HTTP pool and base Supabase client"""
+        with self._lock:
+            if self._client is not None:
+                return
+
+            self._transport = _InstrumentedTransport(
+                self,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self._http = httpx.Client(
+                transport=self._transport,
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
+            self._client = create_client(
+                self.supabase_url,
+                self.supabase_key,
+                options=ClientOptions(
+                    httpx_client=self._http,
+                    auto_refresh_token=False,
+                    persist_session=False,
+                ),
+            )
+            logger.info(
+                f"Supabase pool started (http2={self.http2}, "
+                f"max_connections={self.max_connections}, "
+                f"max_keepalive={self.max_keepalive_connections})"
+            )
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+            self._http = None
+            self._transport = None
+            self._client = None
+
+    def client(self) -> Client:
+        """Get the shared anon-key Supabase client"""
+        if self._client is None:
+            self.start()
+        return self._client
+
+    def scoped(self, access_token: Optional[str] = None) -> "ScopedSupabaseClient":
+        """
+        Get a per-request client that reuses the shared pool
+
+        Args:
+            access_token: User JWT for RLS. Defaults to the anon key.
+        """
+        base = self.client()
+        return ScopedSupabaseClient(base, self._http, self.rest_url, access_token)
+
+    def stats(self) -> PoolStats:
+        """Current pool metrics"""
+        counts = {"open": 0, "idle": 0}
+        if self._transport is not None:
+            try:
+                counts = self._transport.connection_counts()
+            except Exception as e:
+                logger.debug(f"Could not read Supabase pool connections: {e}")
+
+        total = self._total_requests
+        return PoolStats(
+            in_use=self._in_use,
+            idle=counts["idle"],
+            open_connections=counts["open"],
+            max_connections=self.max_connections,
+            total_requests=total,
+            wait_time_ms_avg=round(self._wait_total_ms / total, 3) if total else 0.0,
+            wait_time_ms_max=round(self._wait_max_ms, 3),
+        )
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._in_use += 1
+            self._total_requests += 1
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._in_use -= 1
+
+    def _record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self._wait_total_ms += wait_ms
+            if wait_ms > self._wait_max_ms:
+                self._wait_max_ms = wait_ms
+
+
+class ScopedSupabaseClient:
+    """
+    Lightweight Supabase client bound to one request
+
+    Exposes the subset of `supabase.Client` the services use (`table`,
+    `from_`, `rpc`, `schema`, `postgrest`, `auth`). PostgREST calls carry
+    this request's Authorization header only, so calling
+    `postgrest.auth(token)` never leaks a user's token into the shared
+    client. `auth` is the shared GoTrue client; only stateless calls
+    such as `auth.get_user(jwt)` should be made through it.
+    """
+
+    def __init__(
+        self,
+        base: Client,
+        http_client: httpx.Client,
+        rest_url: str,
+        access_token: Optional[str] = None,
+    ):
+        self._base = base
+        self.auth = base.auth
+        self.postgrest = SyncPostgrestClient(
+            rest_url,
+            headers={
+                "apiKey": base.supabase_key,
+                "Authorization": f"Bearer {access_token or base.supabase_key}",
+            },
+            http_client=http_client,
+        )
+
+    def table(self, table_name: str):
+        return self.postgrest.from_(table_name)
+
+    def from_(self, table_name: str):
+        return self.postgrest.from_(table_name)
+
+    def schema(self, schema: str):
+        return self.postgrest.schema(schema)
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        return self.postgrest.rpc(fn, params or {}, **kwargs)
+
+
+class QueryExecutor:
+    """
+    Bounded thread pool for blocking supabase-py calls
+
+    supabase-py's PostgREST and Auth clients are synchronous, so calling
+    `.execute()` inside an `async def` stalls the event loop and a worker
+    serves one query at a time. Services `await execute(query)` instead:
+    the call runs on this pool while the loop keeps serving requests.
+
+    The pool is separate from asyncio's default executor (email delivery,
+    index refreshes) so background work can't starve request queries, and
+    it is sized below the HTTP pool so excess queries queue here rather
+    than holding a thread while they wait for a connection.
+    """
+
+    def __init__(self, max_workers: int = 32):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self._in_flight = 0
+        self._running = 0
+        self._total_queries = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+
+    def start(self) -> None:
+        """Create the worker pool (threads are spawned on demand)"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="supabase-query",
+                )
+
+    def close(self) -> None:
+        """Finish running queries and stop the workers"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking call on the pool and await its result
+
+        Context variables are copied into the worker, as with
+        `asyncio.to_thread`.
+        """
+        if self._executor is None:
+            self.start()
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+            self._total_queries += 1
+        future = self._executor.submit(context.run, self._call, submitted, fn, *args)
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    async def execute(self, query: Any) -> Any:
+        """Await a PostgREST request builder's `.execute()`"""
+        return await self.run(query.execute)
+
+    def stats(self) -> ExecutorStats:
+        """Current offload metrics"""
+        total = self._total_queries
+        return ExecutorStats(
+            workers=self.max_workers,
+            running=self._running,
+            queued=self._in_flight - self._running,
+            total_queries=total,
+            wait_time_ms_avg=round(self._wait_total_ms / total, 3) if total else 0.0,
+            wait_time_ms_max=round(self._wait_max_ms, 3),
+        )
+
+    def _call(self, submitted: float, fn: Callable[..., T], *args: Any) -> T:
+        wait_ms = (time.perf_counter() - submitted) * 1000
+        with self._lock:
+            self._running += 1
+            self._wait_total_ms += wait_ms
+            if wait_ms > self._wait_max_ms:
+                self._wait_max_ms = wait_ms
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _done(self, future: Future) -> None:
+        # Also runs for queries cancelled before a worker picked them up
+        with self._lock:
+            self._in_flight -= 1
+
+
+# Singleton instance
+supabase_pool = SupabaseClientPool(
+    settings.SUPABASE_URL,
+    settings.SUPABASE_KEY,
+    max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.SUPABASE_POOL_MAX_KEEPALIVE,
+    keepalive_expiry=settings.SUPABASE_POOL_KEEPALIVE_EXPIRY,
+    timeout=settings.SUPABASE_HTTP_TIMEOUT,
+    http2=settings.SUPABASE_HTTP2,
+)
+
+# Singleton instance
+query_executor = QueryExecutor(settings.SUPABASE_QUERY_WORKERS)
+
+
+async def execute(query: Any) -> Any:
+    """
+    Execute a PostgREST query without blocking the event loop
+
+    Args:
+        query: Request builder (e.g. `supabase.table(...).select(...)`)
+
+    Returns:
+        The builder's APIResponse (or None for an empty `maybe_single`)
+    """
+    return await query_executor.execute(query)
+
 
 def get_supabase() -> Client:
-    """Get Supabase client"""
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    """Get Supabase client (shares the process-wide connection pool)"""
+    return supabase_pool.scoped()
 
 
 def get_supabase_with_token(access_token: str) -> Client:
     """
     Get Supabase client with user's JWT token (enforces RLS)
-    
+
     This replaces the old get_supabase_admin() which used service_role key.
     Now all admin operations go through RLS policies that check for 'internal_admin' role.
-    
+
     Security Benefits:
     - RLS policies enforce role-based access control
     - User actions are auditable via auth.uid()
     - No single point of failure (service_role key)
     - Defense in depth: application + database security layers
-    
+
     Args:
         access_token: User's JWT token from Authorization header
-        
+
     Returns:
-        Supabase client configured with user's session
-        
+        Supabase client configured with user's session. The client is scoped
+        to this request but reuses the pooled keep-alive connections.
+
     Raises:
         Exception: If token is invalid or expired
     """
-    client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    # Set user session - this makes auth.uid() work in RLS policies
-    client.postgrest.auth(access_token)
-    return client
+    # Scoped client - this makes auth.uid() work in RLS policies
+    return supabase_pool.scoped(access_token)
@@ -5,21 +5,55 @@ import logging
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from supabase import Client
-import meilisearch
-from core.database import get_supabase
-from core.config import settings
+from core.database import get_supabase, get_supabase_with_token, query_executor
+from core.search_client import AsyncMeilisearchClient, meilisearch_client
+from core.jwt_verifier import InvalidTokenError, token_verifier
+from core.roles import ADMIN_ROLE, role_resolver, user_id_of
 
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
 
-def get_meilisearch_client() -> meilisearch.Client:
-    """Get Meilisearch client instance"""
-    return meilisearch.Client(
-        settings.MEILISEARCH_HOST,
-        settings.MEILISEARCH_API_KEY
-    )
+def get_meilisearch_client() -> AsyncMeilisearchClient:
+    """Get the shared (app-scoped) Meilisearch client"""
+    return meilisearch_client
+
+
+async def verify_access_token(token: str, supabase: Client):
+    """
+    Authenticate a Supabase access token
+
+    Verified locally (signature, expiry, audience) and cached briefly;
+    Supabase Auth is only called when the token can't be checked locally
+    and for sampled revocation checks.
+
+    Args:
+        token: Bearer token
+        supabase: Client whose auth.get_user is the remote check
+
+    Returns:
+        User response with `.user.id` / `.user.email`
+
+    Raises:
+        HTTPException: 401 if the token is not valid
+    """
+    async def remote(token: str):
+        return await query_executor.run(supabase.auth.get_user, token)
+
+    try:
+        return await token_verifier.verify(token, remote)
+    except InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    except Exception as e:
+        logger.error(f"Error verifying access token: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
 
 
 async def get_current_user(
@@ -27,75 +61,55 @@ async def get_current_user(
     supabase: Client = Depends(get_supabase),
 ):
     """Get current authenticated user from JWT token"""
-    token = credentials.credentials
+    return await verify_access_token(credentials.credentials, supabase)
 
-    try:
-        # Verify token with Supabase Auth
-        user = supabase.auth.get_user(token)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-            )
-        return user
-    except Exception as e:
+
+async def require_admin(current_user, supabase: Client) -> None:
+    """
+    Require the internal_admin role
+
+    Args:
+        current_user: Result of token verification
+        supabase: Client scoped to the user's token
+
+    Raises:
+        HTTPException: 401 if the user id is missing, 403 if not an admin
+    """
+    if not user_id_of(current_user):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+            detail="Could not extract user ID from token"
+        )
+
+    user_role = await role_resolver.get_role(current_user, supabase)
+
+    if user_role is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access denied: User profile not found"
+        )
+
+    if user_role != ADMIN_ROLE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access denied: Insufficient permissions"
         )
 
 
 async def get_current_admin_user(
     credentials: HTTPAuthorizationCredentials = Depends(security), # Need token
     current_user = Depends(get_current_user),
-    supabase: Client = Depends(get_supabase),
 ):
     """
     Require admin role
 
-    Checks user_profiles table for role = 'internal_admin'
-    Raises 403 Forbidden if user is not admin
+    Checks the user's role (JWT claim or cached user_profiles.role) is
+    'internal_admin'. Raises 403 Forbidden if user is not admin
     """
     try:
-        # Authenticate the client so RLS works
-        token = credentials.credentials
-        supabase.postgrest.auth(token)
-        
-        # Extract user ID from Supabase auth response
-        if hasattr(current_user, 'user') and current_user.user:
-            user_id = current_user.user.id
-        elif hasattr(current_user, 'id'):
-            user_id = current_user.id
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not extract user ID from token"
-            )
-        
-        # Query user_profiles table for role
-        response = supabase.table('user_profiles').select('role').eq('id', user_id).maybe_single().execute()
-        
-        # Handle response
-        profile_data = response.data if hasattr(response, 'data') else response
-
-        if not profile_data:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin access denied: User profile not found"
-            )
-
-        # Get role from profile data
-        if isinstance(profile_data, dict):
-            user_role = profile_data.get('role')
-        else:
-            user_role = None
-
-        if user_role != 'internal_admin':
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin access denied: Insufficient permissions"
-            )
-
+        # Request-scoped client authenticated with the user's token so RLS works
+        supabase = get_supabase_with_token(credentials.credentials)
+        await require_admin(current_user, supabase)
         return current_user
 
     except HTTPException:
@@ -120,52 +134,13 @@ async def get_admin_context(
     try:
         token = credentials.credentials
         
-        # Create authenticated client
-        supabase = get_supabase()
-        supabase.postgrest.auth(token)
+        # Create authenticated client (request-scoped, shares the pooled connections)
+        supabase = get_supabase_with_token(token)
         
         # Validate token and get user (doing what get_current_user does)
-        try:
-            current_user = supabase.auth.get_user(token)
-            if not current_user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid authentication credentials",
-                )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-            )
-        
-        # Extract user ID
-        if hasattr(current_user, 'user') and current_user.user:
-            user_id = current_user.user.id
-        elif hasattr(current_user, 'id'):
-            user_id = current_user.id
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not extract user ID from token"
-            )
-        
-        # Check admin role
-        response = supabase.table('user_profiles').select('role').eq('id', user_id).maybe_single().execute()
-        profile_data = response.data if hasattr(response, 'data') else response
-
-        if not profile_data:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin access denied: User profile not found"
-            )
-
-        user_role = profile_data.get('role') if isinstance(profile_data, dict) else None
+        current_user = await verify_access_token(token, supabase)
 
-        if user_role != 'internal_admin':
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin access denied: Insufficient permissions"
-            )
+        await require_admin(current_user, supabase)
 
         return (current_user, supabase)
 
@@ -196,7 +171,7 @@ def get_program_service(
 
 
 def get_search_service(
-    meilisearch_client: meilisearch.Client = Depends(get_meilisearch_client),
+    meilisearch_client: AsyncMeilisearchClient = Depends(get_meilisearch_client),
 ):
     """Get search service instance"""
     from services.search_service import SearchService
@@ -0,0 +1,77 @@
+"""
+HTTP Conditional Requests
+Strong ETags and If-None-Match handling for cacheable GET endpoints
+"""
+import hashlib
+import json
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from core.serialization import model_response
+
+# ETag of the last cached value returned to this request (set by core.cache)
+_current_etag: ContextVar[Optional[str]] = ContextVar("current_etag", default=None)
+
+
+def make_etag(payload: bytes) -> str:
+    """Strong ETag (quoted content hash) for a serialized representation"""
+    return f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+def canonical_json(data: Any) -> bytes:
+    """Stable JSON encoding used for hashing"""
+    return json.dumps(data, sort_keys=True, default=str, separators=(",", ":")).encode()
+
+
+def set_current_etag(etag: Optional[str]) -> None:
+    """Record the ETag of a value about to be returned to the route"""
+    _current_etag.set(etag)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag
+
+    Uses the weak comparison RFC 9110 requires for If-None-Match, so
+    `W/"x"` matches `"x"`.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def conditional_response(request: Request, response: Response, value: Any) -> Any:
+    """
+    Attach an ETag and answer 304 when the client's copy is current
+
+    The ETag comes from the response cache (computed once when the entry
+    was stored), so a 304 costs no serialization. Values that didn't come
+    from the cache are hashed here instead.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        response: Route's Response, used to set the ETag on 200s
+        value: Value the route would return
+
+    Returns:
+        A bodiless 304 Response, or `value` (sent directly as JSON when
+        FAST_JSON_RESPONSES is on, see `core.serialization.model_response`)
+    """
+    etag = _current_etag.get()
+    _current_etag.set(None)
+    if etag is None:
+        data = value.model_dump(mode="json") if isinstance(value, BaseModel) else jsonable_encoder(value)
+        etag = make_etag(canonical_json(data))
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return model_response(value, response)
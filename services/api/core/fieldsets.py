@@ -0,0 +1,93 @@
+"""
+Sparse Fieldsets
+`fields=` column selection for catalog list endpoints
+
+A request asks for a named preset (`fields=card`) or a comma-separated
+list of fields (`fields=id,name,state`). Services select only those
+columns from PostgREST and build the matching (slimmer) response model, so
+card views don't pay for full rows in the database, the serializer or the
+payload.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+
+CARD = "card"
+DETAIL = "detail"
+
+# Keyset pagination orders on (name, id), so every fieldset keeps them
+ALWAYS_INCLUDED: Tuple[str, ...] = ("id", "name")
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """Resolved field selection"""
+    fields: Tuple[str, ...]
+    preset: Optional[str] = None  # None for an explicit field list
+
+    @property
+    def key(self) -> str:
+        """Canonical form, so equivalent requests share a cache entry"""
+        return self.preset or ",".join(sorted(self.fields))
+
+    def columns(self, exclude: Sequence[str] = ()) -> str:
+        """PostgREST select list for the stored columns (minus computed fields)"""
+        return ",".join(field for field in self.fields if field not in exclude)
+
+
+class Fieldsets:
+    """The presets and selectable fields of one list endpoint"""
+
+    def __init__(
+        self,
+        presets: Dict[str, Sequence[str]],
+        default: Optional[str] = DETAIL,
+        always: Sequence[str] = ALWAYS_INCLUDED,
+    ):
+        """
+        Args:
+            presets: Preset name -> fields, in response order
+            default: Preset used without `fields=` (None: the endpoint's
+                full rows, resolved as None)
+            always: Fields every fieldset includes
+        """
+        self.always = tuple(always)
+        self.presets = {
+            name: tuple(dict.fromkeys([*self.always, *fields])) for name, fields in presets.items()
+        }
+        self.default = default
+        self.allowed = tuple(dict.fromkeys(field for fields in self.presets.values() for field in fields))
+
+    def resolve(self, fields: Optional[str]) -> Optional[Fieldset]:
+        """
+        Resolve a `fields=` value
+
+        Args:
+            fields: Preset name, comma-separated field names, or None
+
+        Returns:
+            Fieldset (None when there is no default preset and no `fields=`)
+
+        Raises:
+            HTTPException: 400 for unknown presets or fields
+        """
+        fields = (fields or "").strip()
+        if not fields:
+            return Fieldset(self.presets[self.default], self.default) if self.default else None
+        if fields in self.presets:
+            return Fieldset(self.presets[fields], fields)
+
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in self.allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Unknown fields: {', '.join(unknown)}. Use a preset "
+                    f"({', '.join(self.presets)}) or a comma-separated subset of: {', '.join(self.allowed)}"
+                )
+            )
+        # Keep the endpoint's field order regardless of request order
+        selected = {*self.always, *requested}
+        return Fieldset(tuple(field for field in self.allowed if field in selected))
@@ -0,0 +1,281 @@
+"""
+Supabase JWT Verification
+Verifies Supabase access tokens locally (signature, expiry, audience)
+instead of calling Supabase Auth on every authenticated request
+
+Legacy projects sign tokens with the HS256 JWT secret; projects on signing
+keys use ES256/RS256, whose public keys are read from the JWKS endpoint and
+cached. An unknown `kid` triggers a (rate-limited) JWKS refresh, so key
+rotation needs no restart. Verified tokens are cached briefly, and a
+sample of requests is still confirmed with Supabase Auth so revoked
+sessions are noticed without paying the round trip every time.
+"""
+import hashlib
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+from jose import JWTError, jwt
+from supabase_auth.errors import AuthRetryableError
+
+from core.cache import LRUCache
+from core.config import settings
+from core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("ES256", "RS256")
+JWKS_TTL_SECONDS = 600
+JWKS_MIN_REFRESH_SECONDS = 30  # Unknown kids can't force a fetch more often than this
+LEEWAY_SECONDS = 30
+
+
+class InvalidTokenError(Exception):
+    """Token is malformed, expired, wrongly signed or revoked"""
+
+
+class LocalVerificationUnavailableError(Exception):
+    """Token can't be checked locally (no secret configured, JWKS unreachable)"""
+
+
+@dataclass(frozen=True)
+class TokenUser:
+    """The user fields routes read from the Supabase Auth user"""
+    id: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    role: Optional[str] = None
+    aud: Optional[str] = None
+    app_metadata: Dict[str, Any] = field(default_factory=dict)
+    user_metadata: Dict[str, Any] = field(default_factory=dict)
+    is_anonymous: bool = False
+
+
+@dataclass(frozen=True)
+class VerifiedToken:
+    """
+    Locally verified access token
+
+    Shaped like supabase_auth's UserResponse (`.user.id`, `.user.email`) so
+    dependencies and routes work with either.
+    """
+    user: TokenUser
+    claims: Dict[str, Any]
+
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "VerifiedToken":
+        return cls(
+            user=TokenUser(
+                id=claims["sub"],
+                email=claims.get("email"),
+                phone=claims.get("phone"),
+                role=claims.get("role"),
+                aud=claims.get("aud"),
+                app_metadata=claims.get("app_metadata") or {},
+                user_metadata=claims.get("user_metadata") or {},
+                is_anonymous=claims.get("is_anonymous", False),
+            ),
+            claims=claims,
+        )
+
+
+class JWKSCache:
+    """Public signing keys by `kid`, refetched on expiry or an unknown kid"""
+
+    def __init__(self, url: str, fetch: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None):
+        """
+        Args:
+            url: JWKS endpoint
+            fetch: Optional coroutine returning the JWKS document (tests)
+        """
+        self.url = url
+        self._fetch = fetch or self._fetch_http
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._singleflight = SingleFlight()
+
+    async def _fetch_http(self) -> Dict[str, Any]:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+            return response.json()
+
+    async def _refresh(self) -> None:
+        document = await self._fetch()
+        self._keys = {key["kid"]: key for key in document.get("keys", []) if "kid" in key}
+        self._fetched_at = time.monotonic()
+        logger.info(f"Loaded {len(self._keys)} JWT signing keys")
+
+    async def get(self, kid: str) -> Dict[str, Any]:
+        """
+        Key for a kid
+
+        Raises:
+            InvalidTokenError: If the kid is unknown even after a refresh
+            LocalVerificationUnavailableError: If the JWKS can't be fetched
+        """
+        age = time.monotonic() - self._fetched_at
+        stale = age > JWKS_TTL_SECONDS
+        if stale or (kid not in self._keys and age > JWKS_MIN_REFRESH_SECONDS):
+            try:
+                await self._singleflight.do("jwks", self._refresh)
+            except Exception as e:
+                if not self._keys:
+                    raise LocalVerificationUnavailableError(f"JWKS unavailable: {str(e)}")
+                logger.warning(f"JWKS refresh failed, using cached keys: {str(e)}")
+        if kid not in self._keys:
+            raise InvalidTokenError("Unknown signing key")
+        return self._keys[kid]
+
+
+class SupabaseTokenVerifier:
+    """Local Supabase access-token verification with a verified-token cache"""
+
+    def __init__(
+        self,
+        jwt_secret: str = "",
+        jwks: Optional[JWKSCache] = None,
+        audience: str = "authenticated",
+        cache_seconds: float = 60.0,
+        cache_size: int = 10_000,
+        revocation_sample_rate: float = 0.0,
+    ):
+        """
+        Args:
+            jwt_secret: HS256 secret (empty: HS256 tokens are checked remotely)
+            jwks: Signing-key cache for ES256/RS256 tokens
+            audience: Required `aud` claim
+            cache_seconds: How long a verified token is trusted without
+                re-verifying (never beyond its `exp`)
+            cache_size: Maximum cached tokens
+            revocation_sample_rate: Fraction of requests also confirmed with
+                Supabase Auth (0 disables)
+        """
+        self.jwt_secret = jwt_secret
+        self.jwks = jwks
+        self.audience = audience
+        self.cache_seconds = cache_seconds
+        self.revocation_sample_rate = revocation_sample_rate
+        self.cache = LRUCache(cache_size)
+
+    @staticmethod
+    def cache_key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    async def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify signature, expiry and audience; return the claims
+
+        Raises:
+            InvalidTokenError: If the token is not valid
+            LocalVerificationUnavailableError: If it can't be checked locally
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError:
+            raise InvalidTokenError("Malformed token")
+
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            if not self.jwt_secret:
+                raise LocalVerificationUnavailableError("SUPABASE_JWT_SECRET not configured")
+            key: Any = self.jwt_secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS and self.jwks is not None:
+            key = await self.jwks.get(header.get("kid", ""))
+        else:
+            raise InvalidTokenError(f"Unsupported token algorithm: {algorithm}")
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                options={"leeway": LEEWAY_SECONDS},
+            )
+        except JWTError as e:
+            raise InvalidTokenError(str(e))
+        if not claims.get("sub") or "exp" not in claims:
+            raise InvalidTokenError("Token has no subject or expiry")
+        return claims
+
+    async def verify(
+        self,
+        token: str,
+        remote: Callable[[str], Awaitable[Any]]
+    ) -> Any:
+        """
+        Authenticate a bearer token
+
+        Args:
+            token: Access token
+            remote: Coroutine checking the token with Supabase Auth
+                (auth.get_user); used when local verification is
+                unavailable and for sampled revocation checks
+
+        Returns:
+            VerifiedToken, or the remote UserResponse when checked remotely
+
+        Raises:
+            InvalidTokenError: If the token is not valid or was revoked
+        """
+        key = self.cache_key(token)
+        user = self.cache.get(key)
+        if user is None:
+            try:
+                claims = await self.decode(token)
+            except LocalVerificationUnavailableError:
+                user = await self._verify_remotely(token, remote)
+                ttl = self.cache_seconds
+            else:
+                user = VerifiedToken.from_claims(claims)
+                ttl = min(self.cache_seconds, claims["exp"] - time.time())
+            if ttl > 0:
+                self.cache.set(key, user, ttl, [f"user:{user.user.id}"])
+            return user
+
+        if self.revocation_sample_rate and random.random() < self.revocation_sample_rate:
+            await self._check_revocation(token, user, remote)
+        return user
+
+    async def _verify_remotely(self, token: str, remote: Callable[[str], Awaitable[Any]]) -> Any:
+        try:
+            response = await remote(token)
+        except Exception as e:
+            raise InvalidTokenError(str(e))
+        if not response or not getattr(response, "user", None):
+            raise InvalidTokenError("Invalid authentication credentials")
+        return response
+
+    async def _check_revocation(self, token: str, user: Any, remote: Callable[[str], Awaitable[Any]]) -> None:
+        """Confirm a cached token with Supabase Auth; forget the user's tokens if revoked"""
+        try:
+            response = await remote(token)
+        except (AuthRetryableError, httpx.HTTPError) as e:
+            # Supabase Auth unreachable: keep trusting the signature
+            logger.warning(f"Token revocation check skipped: {str(e)}")
+            return
+        except Exception as e:
+            self.revoke(user.user.id)
+            raise InvalidTokenError(str(e))
+        if not response or not getattr(response, "user", None):
+            self.revoke(user.user.id)
+            raise InvalidTokenError("Token revoked")
+
+    def revoke(self, user_id: str) -> int:
+        """Drop every cached token of a user (e.g. after sign-out)"""
+        return self.cache.invalidate_tags([f"user:{user_id}"])
+
+
+# Singleton instance
+token_verifier = SupabaseTokenVerifier(
+    jwt_secret=settings.SUPABASE_JWT_SECRET,
+    jwks=JWKSCache(settings.SUPABASE_JWKS_URL or f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"),
+    audience=settings.SUPABASE_JWT_AUDIENCE,
+    cache_seconds=settings.AUTH_TOKEN_CACHE_SECONDS,
+    cache_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    revocation_sample_rate=settings.AUTH_REVOCATION_SAMPLE_RATE,
+)
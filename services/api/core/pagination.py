@@ -0,0 +1,221 @@
+"""
+Pagination Helpers
+Offset and keyset (cursor) pagination for list endpoints
+"""
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+
+from core.database import execute
+
+# A sort key is (column, descending). The last key must be unique (`id`)
+# so every row has a distinct position; keyset columns must be NOT NULL.
+SortKey = Tuple[str, bool]
+
+NAME_ORDER: Tuple[SortKey, ...] = (("name", False), ("id", False))
+RECENT_ORDER: Tuple[SortKey, ...] = (("updated_at", True), ("id", True))
+
+OFFSET = "offset"
+CURSOR = "cursor"
+
+
+def sort_keys(column: str, descending: bool) -> Tuple[SortKey, ...]:
+    """Keyset order for a user-selected sort column (with `id` as tie-breaker)"""
+    return ((column, descending), ("id", descending))
+
+
+def use_cursor(paginate: Optional[str], cursor: Optional[str]) -> bool:
+    """Whether a request opted into cursor mode (explicitly or by sending a cursor)"""
+    return paginate == CURSOR or bool(cursor)
+
+
+def encode_cursor(row: Dict[str, Any], keys: Sequence[SortKey]) -> str:
+    """
+    Opaque cursor pointing just after `row`
+
+    Args:
+        row: Last row of the current page
+        keys: Sort keys the page was ordered by
+
+    Returns:
+        URL-safe base64 token
+    """
+    payload = {"k": [column for column, _ in keys], "v": [row[column] for column, _ in keys]}
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey]) -> List[Any]:
+    """
+    Decode a cursor into the sort-key values of the row it points after
+
+    Args:
+        cursor: Token from a previous page's `next_cursor`
+        keys: Sort keys of the current request
+
+    Returns:
+        Values, one per sort key
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for a
+            different sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        columns, values = payload["k"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+    if columns != [column for column, _ in keys] or len(values) != len(keys):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pagination cursor does not match the requested sort order"
+        )
+    return values
+
+
+def _quote(value: Any) -> str:
+    """Quote a value for a PostgREST logic tree (commas, dots and parens are reserved)"""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def keyset_filter(keys: Sequence[SortKey], values: Sequence[Any]) -> str:
+    """
+    PostgREST `or` expression selecting rows after a position
+
+    For keys (a asc, b asc) and values (x, y) this is
+    `a.gt.x,and(a.eq.x,b.gt.y)`: the row-value comparison
+    `(a, b) > (x, y)` spelled out so mixed directions work too.
+    """
+    branches = []
+    for i, (column, descending) in enumerate(keys):
+        op = "lt" if descending else "gt"
+        conditions = [f"{c}.eq.{_quote(v)}" for (c, _), v in zip(keys[:i], values[:i])]
+        conditions.append(f"{column}.{op}.{_quote(values[i])}")
+        branches.append(conditions[0] if len(conditions) == 1 else f"and({','.join(conditions)})")
+    return ",".join(branches)
+
+
+def apply_cursor(query, keys: Sequence[SortKey], cursor: Optional[str], page_size: int):
+    """
+    Order, seek and limit a query for one cursor page
+
+    Fetches one extra row so the next page's existence is known without
+    relying on the (estimated) total.
+
+    Args:
+        query: PostgREST select query with filters applied
+        keys: Sort keys
+        cursor: Cursor from the previous page, or None/"" for the first page
+        page_size: Rows per page
+
+    Returns:
+        The query, ready to execute
+    """
+    if cursor:
+        query = query.or_(keyset_filter(keys, decode_cursor(cursor, keys)))
+    for column, descending in keys:
+        query = query.order(column, desc=descending)
+    return query.limit(page_size + 1)
+
+
+def count_method(cursor_mode: bool) -> str:
+    """
+    PostgREST count to request alongside the page
+
+    Offset mode needs exact totals for page numbers. Cursor mode asks for
+    `estimated`: PostgREST counts exactly while the result is small and
+    switches to the planner's row estimate above its max-rows threshold,
+    so deep listings never pay for a full count scan.
+    """
+    return "estimated" if cursor_mode else "exact"
+
+
+async def fetch_page(
+    query,
+    keys: Sequence[SortKey],
+    page: int = 1,
+    page_size: int = 20,
+    cursor_mode: bool = False,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Execute a list query once and return the page with its metadata
+
+    The count comes back in the same response as the rows (PostgREST's
+    Content-Range header), so a page costs a single round trip. Select the
+    query with `count=count_method(cursor_mode)`.
+
+    Args:
+        query: PostgREST select query with filters applied (not ordered)
+        keys: Sort keys; the trailing `id` also makes offset pages stable
+        page: Page number (offset mode)
+        page_size: Rows per page
+        cursor_mode: Use keyset pagination
+        cursor: Cursor from the previous page (cursor mode)
+
+    Returns:
+        (rows, pagination metadata)
+    """
+    if cursor_mode:
+        response = await execute(apply_cursor(query, keys, cursor, page_size))
+        return cursor_pagination(response.data, keys, page_size, response.count or 0, cursor)
+
+    for column, descending in keys:
+        query = query.order(column, desc=descending)
+    offset = (page - 1) * page_size
+    response = await execute(query.range(offset, offset + page_size - 1))
+    return response.data, offset_pagination(page, page_size, response.count or 0)
+
+
+def offset_pagination(page: int, page_size: int, total: int) -> Dict[str, Any]:
+    """Pagination metadata for offset mode"""
+    total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "total_pages": total_pages,
+        "has_prev": page > 1,
+        "has_next": page < total_pages,
+    }
+
+
+def cursor_pagination(
+    rows: List[Dict[str, Any]],
+    keys: Sequence[SortKey],
+    page_size: int,
+    total: int,
+    cursor: Optional[str]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Trim a cursor page and build its metadata
+
+    Args:
+        rows: Rows fetched by `apply_cursor` (up to page_size + 1)
+        keys: Sort keys
+        page_size: Rows per page
+        total: Count reported by the database (planner estimate for large sets)
+        cursor: Cursor the page was requested with
+
+    Returns:
+        (page rows, pagination metadata with `next_cursor`)
+    """
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    pagination = {
+        **offset_pagination(1, page_size, total),
+        "has_prev": bool(cursor),
+        "has_next": has_next,
+        "next_cursor": encode_cursor(rows[-1], keys) if has_next else None,
+        "estimated": True,
+    }
+    return rows, pagination
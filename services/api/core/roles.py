@@ -0,0 +1,99 @@
+"""
+Role Resolution
+Per-user role lookup for admin endpoints, without a user_profiles query on
+every request
+
+The role comes from the signed `user_role` claim when the Supabase custom
+access token hook is enabled (see
+database/migrations/20261016_user_role_claim.sql), otherwise from
+user_profiles through a short-lived per-user cache. Concurrent lookups for
+the same user share one query.
+"""
+import logging
+from typing import Any, Optional
+
+from core.cache import LRUCache
+from core.config import settings
+from core.database import execute
+from core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+ADMIN_ROLE = "internal_admin"
+ROLE_CLAIM = "user_role"
+
+
+def user_id_of(current_user: Any) -> Optional[str]:
+    """User id from an Auth UserResponse, a VerifiedToken or a bare user"""
+    if getattr(current_user, "user", None):
+        return current_user.user.id
+    return getattr(current_user, "id", None)
+
+
+class RoleResolver:
+    """Resolve and cache user roles"""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 10_000, trust_claim: bool = True):
+        """
+        Args:
+            ttl_seconds: How long a role read from user_profiles is reused
+            max_entries: Maximum cached users
+            trust_claim: Use the `user_role` JWT claim when present
+        """
+        self.ttl_seconds = ttl_seconds
+        self.trust_claim = trust_claim
+        self.cache = LRUCache(max_entries)
+        self._singleflight = SingleFlight()
+
+    def role_from_claims(self, current_user: Any) -> Optional[str]:
+        """Role carried by a locally verified token, if any"""
+        if not self.trust_claim:
+            return None
+        claims = getattr(current_user, "claims", None) or {}
+        return claims.get(ROLE_CLAIM)
+
+    async def get_role(self, current_user: Any, supabase) -> Optional[str]:
+        """
+        Role of the authenticated user
+
+        Args:
+            current_user: Result of token verification
+            supabase: Client scoped to the user's token (RLS lets users read
+                their own profile)
+
+        Returns:
+            Role, or None if the user has no profile
+        """
+        role = self.role_from_claims(current_user)
+        if role:
+            return role
+
+        user_id = user_id_of(current_user)
+        cached = self.cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        role = await self._singleflight.do(user_id, lambda: self._load(user_id, supabase))
+        if role is not None:
+            self.cache.set(user_id, role, self.ttl_seconds, [f"user:{user_id}"])
+        return role
+
+    async def _load(self, user_id: str, supabase) -> Optional[str]:
+        response = await execute(supabase.table("user_profiles").select("role").eq("id", user_id).maybe_single())
+        profile = response.data if response is not None and hasattr(response, "data") else response
+        return profile.get("role") if isinstance(profile, dict) else None
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Forget a user's cached role (or every role)"""
+        if user_id is None:
+            self.cache.clear()
+        else:
+            self.cache.invalidate_tags([f"user:{user_id}"])
+
+
+# Singleton instance
+role_resolver = RoleResolver(
+    ttl_seconds=settings.ROLE_CACHE_SECONDS,
+    max_entries=settings.ROLE_CACHE_SIZE,
+    trust_claim=settings.AUTH_ROLE_FROM_JWT,
+)
@@ -0,0 +1,170 @@
+"""
+Async Meilisearch Client
+App-scoped, httpx-based Meilisearch client with connection reuse
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+from meilisearch.errors import MeilisearchApiError, MeilisearchCommunicationError
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncIndex:
+    """Handle for a single Meilisearch index"""
+
+    def __init__(self, client: "AsyncMeilisearchClient", uid: str):
+        self.client = client
+        self.uid = uid
+
+    async def search(
+        self,
+        query: str,
+        opt_params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Search the index (same parameters as meilisearch.Index.search)"""
+        body = {"q": query, **(opt_params or {})}
+        return await self.client.request("POST", f"/indexes/{self.uid}/search", json=body)
+
+    async def add_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        primary_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Add or replace documents, returns the enqueued task"""
+        params = {"primaryKey": primary_key} if primary_key else None
+        return await self.client.request(
+            "POST", f"/indexes/{self.uid}/documents", json=documents, params=params
+        )
+
+    async def update_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        primary_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Add or partially update documents, returns the enqueued task"""
+        params = {"primaryKey": primary_key} if primary_key else None
+        return await self.client.request(
+            "PUT", f"/indexes/{self.uid}/documents", json=documents, params=params
+        )
+
+    async def delete_documents(self, ids: List[str]) -> Dict[str, Any]:
+        """Delete documents by id, returns the enqueued task"""
+        return await self.client.request(
+            "POST", f"/indexes/{self.uid}/documents/delete-batch", json=ids
+        )
+
+
+class AsyncMeilisearchClient:
+    """
+    Shared async Meilisearch client
+
+    One instance per worker process, opened and closed from the FastAPI
+    lifespan hook. All requests go through a single bounded httpx
+    connection pool, and index handles are created once and reused.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        api_key: Optional[str] = None,
+        timeout: float = 5.0,
+        connect_timeout: float = 2.0,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+    ):
+        self.host = host.rstrip("/")
+        self.api_key = api_key
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._http: Optional[httpx.AsyncClient] = None
+        self._indexes: Dict[str, AsyncIndex] = {}
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Underlying httpx client (created on first use)"""
+        if self._http is None or self._http.is_closed:
+            headers = {"Content-Type": "application/json"}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            self._http = httpx.AsyncClient(
+                base_url=self.host,
+                headers=headers,
+                timeout=self.timeout,
+                limits=self.limits,
+            )
+        return self._http
+
+    async def start(self) -> None:
+        """Open the connection pool"""
+        _ = self.http
+        logger.info(f"Meilisearch client started ({self.host})")
+
+    async def close(self) -> None:
+        """Close all pooled connections"""
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+
+    def index(self, uid: str) -> AsyncIndex:
+        """Get a (cached) index handle"""
+        if uid not in self._indexes:
+            self._indexes[uid] = AsyncIndex(self, uid)
+        return self._indexes[uid]
+
+    async def multi_search(self, queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run several searches in one round trip
+
+        Args:
+            queries: Search bodies, each with an `indexUid` key
+
+        Returns:
+            Dict with a `results` list in the same order as `queries`
+        """
+        return await self.request("POST", "/multi-search", json={"queries": queries})
+
+    async def health(self) -> Dict[str, Any]:
+        """Check Meilisearch health"""
+        return await self.request("GET", "/health")
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a request to Meilisearch
+
+        Raises:
+            MeilisearchApiError: On non-2xx responses
+            MeilisearchCommunicationError: On connection errors/timeouts
+        """
+        try:
+            response = await self.http.request(method, path, json=json, params=params)
+        except httpx.HTTPError as e:
+            raise MeilisearchCommunicationError(str(e)) from e
+
+        if response.status_code >= 400:
+            raise MeilisearchApiError(str(response.status_code), response)
+
+        return response.json() if response.content else {}
+
+
+# Singleton instance
+meilisearch_client = AsyncMeilisearchClient(
+    settings.MEILISEARCH_HOST,
+    settings.MEILISEARCH_API_KEY,
+    timeout=settings.MEILISEARCH_TIMEOUT,
+    connect_timeout=settings.MEILISEARCH_CONNECT_TIMEOUT,
+    max_connections=settings.MEILISEARCH_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.MEILISEARCH_MAX_KEEPALIVE,
+)
@@ -0,0 +1,55 @@
+"""
+Response Serialization
+Opt-in fast path (FAST_JSON_RESPONSES) for encoding API responses
+
+By default a route's returned model is dumped, validated again against
+the route's `response_model` and encoded with the standard library json
+module. Catalog services already build their responses by validating the
+database rows once (a whole page in one pydantic-core call), so with the
+fast path on:
+
+- `model_response` sends a returned model straight out as JSON bytes
+  (pydantic-core's serializer), skipping FastAPI's re-validation
+- everything else is encoded with orjson (the app's default response class)
+"""
+from typing import Any, Optional, Type
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+from core.config import settings
+
+_SKIPPED_HEADERS = (b"content-length", b"content-type")
+
+
+def default_response_class() -> Type[JSONResponse]:
+    """Response class for the app: orjson-backed when the fast path is on"""
+    return ORJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
+
+
+def model_response(value: Any, response: Optional[Response] = None) -> Any:
+    """
+    Serialize a returned model directly, bypassing `response_model` validation
+
+    Only models are sent this way - they were validated when built and are
+    shaped by their own fields. Plain dicts and lists are returned
+    unchanged so `response_model` still filters them.
+
+    Args:
+        value: Value the route would return
+        response: Route's Response, whose headers (ETag, ...) are kept
+
+    Returns:
+        A JSON Response when the fast path is on and `value` is a model,
+        otherwise `value` unchanged
+    """
+    if not settings.FAST_JSON_RESPONSES or not isinstance(value, BaseModel):
+        return value
+
+    fast = Response(content=value.model_dump_json(by_alias=True), media_type="application/json")
+    if response is not None:
+        fast.raw_headers.extend(
+            (name, header) for name, header in response.raw_headers if name not in _SKIPPED_HEADERS
+        )
+    return fast
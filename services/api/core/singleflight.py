@@ -0,0 +1,51 @@
+"""
+Request Coalescing (single-flight)
+Share one in-flight backend call between identical concurrent requests
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls by key
+
+    The first caller for a key starts the work; callers arriving while it
+    is still running await the same task instead of starting their own.
+    The key is released as soon as the task finishes, so results are never
+    cached beyond the lifetime of the call.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def inflight(self) -> int:
+        """Number of keys currently being computed"""
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn` once per key among concurrent callers
+
+        Args:
+            key: Hashable key identifying identical calls
+            fn: Zero-argument coroutine function producing the result
+
+        Returns:
+            Result of the (possibly shared) call
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+
+        # Shield so one caller disconnecting doesn't cancel the shared call
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: Any) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
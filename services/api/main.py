@@ -6,8 +6,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 
+import meilisearch
+
 from core.config import settings
+from core.cache import response_cache
+from core.database import query_executor, supabase_pool
+from core.search_client import meilisearch_client
+from core.serialization import default_response_class
 from core.logging import setup_logging
+from services.autocomplete_index import autocomplete_index
+from services.email_queue import email_queue
+from services.saved_search_matcher import saved_search_matcher
+from services.search_indexer import RealtimeChangeSource, search_indexer
 
 # Setup logging
 setup_logging()
@@ -19,8 +29,39 @@ async def lifespan(app: FastAPI):
     """Lifespan events for startup and shutdown"""
     logger.info("Starting Admitly API...")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
+    supabase_pool.start()
+    query_executor.start()
+    await meilisearch_client.start()
+    await response_cache.start()
+    await email_queue.start()
+    if settings.AUTOCOMPLETE_IN_MEMORY:
+        await autocomplete_index.start(
+            # Service role: unpublished and soft-deleted rows must be visible to be removed
+            lambda: supabase_pool.scoped(settings.SUPABASE_SERVICE_KEY),
+            settings.AUTOCOMPLETE_REFRESH_SECONDS,
+        )
+    await saved_search_matcher.start(
+        # Service role: saved searches are owner-only under RLS
+        lambda: supabase_pool.scoped(settings.SUPABASE_SERVICE_KEY),
+        settings.SAVED_SEARCH_MATCHER_REFRESH_SECONDS,
+    )
+    if settings.SEARCH_CDC_ENABLED:
+        await search_indexer.start(
+            RealtimeChangeSource(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY),
+            # Service role: unpublished rows must be visible to be removed
+            lambda: supabase_pool.scoped(settings.SUPABASE_SERVICE_KEY),
+            lambda: meilisearch.Client(settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY),
+        )
     yield
     logger.info("Shutting down Admitly API...")
+    await search_indexer.stop()
+    await saved_search_matcher.stop()
+    await autocomplete_index.stop()
+    await email_queue.stop()
+    await response_cache.close()
+    await meilisearch_client.close()
+    query_executor.close()
+    supabase_pool.close()
 
 
 # Create FastAPI app
@@ -32,6 +73,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=default_response_class(),
 )
 
 # Configure CORS
@@ -53,6 +95,10 @@ async def health_check():
         "status": "healthy",
         "environment": settings.ENVIRONMENT,
         "version": "1.0.0",
+        "pools": {
+            "supabase": supabase_pool.stats().to_dict(),
+            "supabase_queries": query_executor.stats().to_dict(),
+        },
     }
 
 
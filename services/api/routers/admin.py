@@ -4,7 +4,7 @@ API endpoints for admin management
 """
 from fastapi import APIRouter, Depends, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Dict, Optional
+from typing import Dict, Literal, Optional
 from supabase import Client
 
 from core.dependencies import get_admin_context, get_current_admin_user, get_supabase
@@ -272,6 +272,8 @@ async def list_programs(
     degree_type: Optional[str] = Query(None, description="Filter by degree type"),
     status_filter: Optional[str] = Query(None, description="Filter by status (draft, published, archived)"),
     search: Optional[str] = Query(None, description="Search in program name"),
+    paginate: Literal["offset", "cursor"] = Query("offset", description="Pagination mode (offset or cursor)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
     current_user=Depends(get_current_admin_user),
     service: AdminProgramService = Depends(get_admin_program_service),
 ):
@@ -287,6 +289,8 @@ async def list_programs(
     - degree_type: Filter by degree type (undergraduate, nd, hnd, etc.)
     - status_filter: Filter by status (draft, published, archived)
     - search: Search in program name
+    - paginate: offset (default) or cursor (keyset on updated_at, id)
+    - cursor: next_cursor from the previous page
 
     **Returns:** List of programs with institution details and pagination metadata
 
@@ -298,7 +302,9 @@ async def list_programs(
         institution_id=institution_id,
         degree_type=degree_type,
         status_filter=status_filter,
-        search=search
+        search=search,
+        paginate=paginate,
+        cursor=cursor
     )
 
 
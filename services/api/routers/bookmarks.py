@@ -18,6 +18,7 @@ from schemas.bookmarks import (
 )
 from services.bookmark_service import BookmarkService
 from core.dependencies import get_bookmark_service
+from core.serialization import model_response
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,8 @@ List all bookmarks for the authenticated user with optional filtering and pagina
 - **page_size**: Items per page (default: 20, max: 100)
 - **sort**: Sort field (created_at, name)
 - **order**: Sort order (asc, desc)
+- **paginate**: `offset` (default) or `cursor` (keyset pages via `next_cursor`)
+- **cursor**: `next_cursor` from the previous page
 
 **Response:**
 Returns a paginated list of bookmarks with embedded entity details (program or institution info).
@@ -73,6 +76,14 @@ async def list_bookmarks(
         description="Sort order",
         regex="^(asc|desc)$"
     ),
+    paginate: Literal["offset", "cursor"] = Query(
+        "offset",
+        description="Pagination mode: offset (page numbers) or cursor (keyset)"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from the previous page's next_cursor (implies cursor mode)"
+    ),
     service: BookmarkService = Depends(get_bookmark_service)
 ):
     """
@@ -81,13 +92,15 @@ async def list_bookmarks(
     Returns bookmarks with full entity details (program/institution information).
     Only returns non-deleted bookmarks belonging to the authenticated user.
     """
-    return await service.list_bookmarks(
+    return model_response(await service.list_bookmarks(
         entity_type=entity_type,
         page=page,
         page_size=page_size,
         sort=sort,
-        order=order
-    )
+        order=order,
+        paginate=paginate,
+        cursor=cursor
+    ))
 
 
 @router.post(
@@ -3,6 +3,9 @@ from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
+from core.database import execute
+from core.cache import response_cache, DEADLINES
+from core.config import settings
 from core.dependencies import get_supabase, get_admin_context
 from schemas.deadlines import (
     DeadlineCreate, 
@@ -29,20 +32,31 @@ async def list_deadlines(
     """
     List deadlines with optional filtering.
     """
-    query = supabase.table("deadlines").select("*")
-    
-    if type:
-        query = query.eq("type", type.value)
-    if priority:
-        query = query.eq("priority", priority.value)
-    if from_date:
-        query = query.gte("end_date", from_date.isoformat())
-        
-    # Default sort by end_date ascending (closest deadline first)
-    query = query.order("end_date", desc=False).range(offset, offset + limit - 1)
-    
-    result = query.execute()
-    return result.data
+    async def load():
+        query = supabase.table("deadlines").select("*")
+
+        if type:
+            query = query.eq("type", type.value)
+        if priority:
+            query = query.eq("priority", priority.value)
+        if from_date:
+            query = query.gte("end_date", from_date.isoformat())
+
+        # Default sort by end_date ascending (closest deadline first)
+        query = query.order("end_date", desc=False).range(offset, offset + limit - 1)
+
+        return (await execute(query)).data
+
+    params = {
+        "type": type,
+        "priority": priority,
+        "from_date": from_date.isoformat() if from_date else None,
+        "limit": limit,
+        "offset": offset,
+    }
+    return await response_cache.get_or_load(
+        DEADLINES, params, load, ttl=settings.CACHE_DEADLINES_TTL_SECONDS
+    )
 
 @router.get("/upcoming", response_model=List[DeadlineResponse])
 async def get_upcoming_deadlines(
@@ -51,16 +65,27 @@ async def get_upcoming_deadlines(
 ):
     """
     Get top N upcoming deadlines (closing soon).
+
+    Cached for CACHE_DEADLINES_TTL_SECONDS, so a deadline may show for up
+    to that long after it closes.
     """
-    now = datetime.now().isoformat()
-    result = supabase.table("deadlines")\
-        .select("*")\
-        .gt("end_date", now)\
-        .order("end_date", desc=False)\
-        .limit(limit)\
-        .execute()
-        
-    return result.data
+    async def load():
+        now = datetime.now().isoformat()
+        result = await execute(
+            supabase.table("deadlines")
+            .select("*")
+            .gt("end_date", now)
+            .order("end_date", desc=False)
+            .limit(limit)
+        )
+        return result.data
+
+    return await response_cache.get_or_load(
+        DEADLINES,
+        {"upcoming": True, "limit": limit},
+        load,
+        ttl=settings.CACHE_DEADLINES_TTL_SECONDS,
+    )
 
 @router.get("/{deadline_id}", response_model=DeadlineResponse)
 async def get_deadline(
@@ -70,12 +95,17 @@ async def get_deadline(
     """
     Get a specific deadline.
     """
-    result = supabase.table("deadlines").select("*").eq("id", str(deadline_id)).execute()
-    
-    if not result.data:
-        raise HTTPException(status_code=404, detail="Deadline not found")
-        
-    return result.data[0]
+    async def load():
+        result = await execute(supabase.table("deadlines").select("*").eq("id", str(deadline_id)))
+
+        if not result.data:
+            raise HTTPException(status_code=404, detail="Deadline not found")
+
+        return result.data[0]
+
+    return await response_cache.get_or_load(
+        DEADLINES, {"id": str(deadline_id)}, load, ttl=settings.CACHE_DEADLINES_TTL_SECONDS
+    )
 
 # --- ADMIN ENDPOINTS ---
 
@@ -104,7 +134,8 @@ async def create_deadline(
         deadline_data["screening_date"] = deadline_data["screening_date"].isoformat()
 
     try:
-        result = supabase.table("deadlines").insert(deadline_data).execute()
+        result = await execute(supabase.table("deadlines").insert(deadline_data))
+        await response_cache.invalidate(DEADLINES)
         return result.data[0]
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -132,11 +163,12 @@ async def update_deadline(
         raise HTTPException(status_code=400, detail="No data provided to update")
         
     try:
-        result = supabase.table("deadlines").update(update_data).eq("id", str(deadline_id)).execute()
+        result = await execute(supabase.table("deadlines").update(update_data).eq("id", str(deadline_id)))
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Deadline not found")
-            
+
+        await response_cache.invalidate(DEADLINES)
         return result.data[0]
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -152,7 +184,8 @@ async def delete_deadline(
     _, supabase = admin_context
     
     try:
-        result = supabase.table("deadlines").delete().eq("id", str(deadline_id)).execute()
+        result = await execute(supabase.table("deadlines").delete().eq("id", str(deadline_id)))
+        await response_cache.invalidate(DEADLINES)
         
         # Supabase delete returns the deleted rows. If empty, it wasn't found (or RLS hidden it).
         if not result.data:
@@ -3,17 +3,19 @@ Institutions Router
 API endpoints for institutions
 """
 import logging
-from fastapi import APIRouter, Depends, Query, Path
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Path, Request, Response
+from typing import List, Literal, Optional, Union
 
 from schemas.institutions import (
     InstitutionResponse,
     InstitutionListResponse,
+    InstitutionCardListResponse,
+    InstitutionSparseListResponse,
     InstitutionFilters,
 )
-from schemas.programs import ProgramListResponse
 from services.institution_service import InstitutionService
 from core.dependencies import get_institution_service
+from core.etag import conditional_response
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,7 @@ router = APIRouter(prefix="/institutions", tags=["institutions"])
 
 @router.get(
     "",
-    response_model=InstitutionListResponse,
+    response_model=Union[InstitutionListResponse, InstitutionCardListResponse, InstitutionSparseListResponse],
     summary="List institutions",
     description="""
 List all published institutions with optional filters.
@@ -34,12 +36,21 @@ List all published institutions with optional filters.
 - **verified**: Filter by verification status
 - **page**: Page number (default: 1)
 - **page_size**: Items per page (default: 20, max: 100)
+- **paginate**: `offset` (default) or `cursor`. Cursor mode pages with
+  `next_cursor` instead of page numbers, stays fast at any depth and
+  reports an estimated `total`
+- **cursor**: `next_cursor` from the previous page
+- **fields**: `detail` (default), `card` (slim card view) or a
+  comma-separated subset of the detail fields. `id` and `name` are always
+  included. Only the selected columns are read and returned
 
 **Response:**
 Returns a paginated list of institutions with metadata.
 """,
 )
 async def list_institutions(
+    request: Request,
+    response: Response,
     search: Optional[str] = Query(
         None,
         description="Search by institution name or short name",
@@ -70,6 +81,19 @@ async def list_institutions(
         le=100,
         description="Items per page"
     ),
+    paginate: Literal["offset", "cursor"] = Query(
+        "offset",
+        description="Pagination mode: offset (page numbers) or cursor (keyset)"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from the previous page's next_cursor (implies cursor mode)"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Fieldset: detail (default), card, or comma-separated fields",
+        example="card"
+    ),
     service: InstitutionService = Depends(get_institution_service)
 ):
     """
@@ -84,10 +108,13 @@ async def list_institutions(
         type=type,
         verified=verified,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        paginate=paginate,
+        cursor=cursor,
+        fields=fields
     )
 
-    return await service.list_institutions(filters)
+    return conditional_response(request, response, await service.list_institutions(filters))
 
 
 @router.get(
@@ -116,6 +143,8 @@ Returns full institution details including:
 """,
 )
 async def get_institution_by_id(
+    request: Request,
+    response: Response,
     institution_id: str = Path(
         ...,
         description="Institution UUID",
@@ -130,7 +159,7 @@ async def get_institution_by_id(
     Returns full institution information including contact details,
     accreditation status, and verification information.
     """
-    return await service.get_by_id(institution_id)
+    return conditional_response(request, response, await service.get_by_id(institution_id))
 
 
 @router.get(
@@ -157,6 +186,8 @@ Returns full institution details including:
 """,
 )
 async def get_institution(
+    request: Request,
+    response: Response,
     slug: str = Path(
         ...,
         description="Institution slug (URL-friendly identifier)",
@@ -170,7 +201,7 @@ async def get_institution(
     Returns full institution information including contact details,
     accreditation status, and verification information.
     """
-    return await service.get_by_slug(slug)
+    return conditional_response(request, response, await service.get_by_slug(slug))
 
 
 @router.get(
@@ -186,17 +217,27 @@ Get all programs offered by a specific institution.
 **Query Parameters:**
 - **page**: Page number (default: 1)
 - **page_size**: Items per page (default: 20, max: 100)
+- **paginate**: `offset` (default) or `cursor`. Cursor mode pages with
+  `next_cursor` instead of page numbers, stays fast at any depth and
+  reports an estimated `total`
+- **cursor**: `next_cursor` from the previous page
+- **fields**: `card`, `detail` or a comma-separated subset of the detail
+  fields (default: full program rows). `id`, `name` and `institution_id`
+  are always included
 
 **Response:**
 Returns a paginated list of programs offered by the institution,
 ordered by program name.
 
 **Errors:**
+- 400: Unknown fields
 - 404: Institution not found or not published
 - 500: Database error
 """,
 )
 async def get_institution_programs(
+    request: Request,
+    response: Response,
     slug: str = Path(
         ...,
         description="Institution slug",
@@ -213,6 +254,19 @@ async def get_institution_programs(
         le=100,
         description="Items per page"
     ),
+    paginate: Literal["offset", "cursor"] = Query(
+        "offset",
+        description="Pagination mode: offset (page numbers) or cursor (keyset)"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from the previous page's next_cursor (implies cursor mode)"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Fieldset: card, detail, or comma-separated fields (default: full rows)",
+        example="card"
+    ),
     service: InstitutionService = Depends(get_institution_service)
 ):
     """
@@ -221,4 +275,7 @@ async def get_institution_programs(
     Returns all published programs offered by the specified institution.
     Results are paginated and ordered by program name.
     """
-    return await service.get_programs(slug, page, page_size)
+    programs = await service.get_programs(
+        slug, page, page_size, paginate=paginate, cursor=cursor, fields=fields
+    )
+    return conditional_response(request, response, programs)
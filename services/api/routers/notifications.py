@@ -4,13 +4,13 @@ API endpoints for email notifications and alerts
 """
 import logging
 from fastapi import APIRouter, Depends, Query
-from supabase import Client
 
 from services.notification_service import NotificationService
 from services.email_service import EmailService
 from services.search_service import SearchService
+from core.config import settings
+from core.database import supabase_pool
 from core.dependencies import (
-    get_supabase,
     get_email_service,
     get_search_service,
     get_current_admin_user
@@ -25,12 +25,19 @@ router = APIRouter(
 
 
 def get_notification_service(
-    supabase: Client = Depends(get_supabase),
     email_service: EmailService = Depends(get_email_service),
     search_service: SearchService = Depends(get_search_service),
 ) -> NotificationService:
-    """Get notification service instance"""
-    return NotificationService(supabase, email_service, search_service)
+    """
+    Get notification service instance
+
+    Uses a service-role client: the jobs read every user's saved searches
+    (owner-only under RLS) and write the admin-only match and watermark
+    tables. Only admin endpoints depend on it.
+    """
+    return NotificationService(
+        supabase_pool.scoped(settings.SUPABASE_SERVICE_KEY), email_service, search_service
+    )
 
 
 @router.post(
@@ -39,14 +46,16 @@ def get_notification_service(
     description="""
 **Admin Only:** Process all active saved searches with notifications enabled.
 
-Checks each saved search for new results and sends email notifications
-to users when new programs match their criteria.
+Matches programs created or updated since the last run against saved
+searches and sends email notifications to users whose searches have new
+matching programs. Saved searches that no change matches cost nothing.
 
 **Authentication Required:** JWT Bearer token with admin role
 
 **Response:**
 Returns counts of:
-- checked: Total saved searches checked
+- matched: New (saved search, program) matches found in this run
+- checked: Saved searches with new matches
 - sent: Notifications successfully sent
 - failed: Notifications that failed
 
@@ -68,6 +77,7 @@ via a cron job or task scheduler.
 ```json
 {
   "message": "Processed 45 saved searches",
+  "matched": 130,
   "checked": 45,
   "sent": 12,
   "failed": 2
@@ -89,6 +99,7 @@ async def process_saved_searches(
 
     return {
         "message": f"Processed {result['checked']} saved searches",
+        "matched": result["matched"],
         "checked": result["checked"],
         "sent": result["sent"],
         "failed": result["failed"],
@@ -118,7 +129,7 @@ to users who have bookmarked those programs.
   - 4-7 days: ⚠️ REMINDER
 
 **Response:**
-Returns counts of alerts sent and failed
+Returns counts of alerts sent, failed and skipped (already sent today)
 
 **Scheduling:**
 Recommended schedule:
@@ -131,7 +142,8 @@ Recommended schedule:
 {
   "message": "Sent 28 deadline alerts",
   "sent": 28,
-  "failed": 1
+  "failed": 1,
+  "skipped": 0
 }
 ```
 """,
@@ -158,6 +170,7 @@ async def send_deadline_alerts(
         "message": f"Sent {result['sent']} deadline alerts",
         "sent": result["sent"],
         "failed": result["failed"],
+        "skipped": result["skipped"],
     }
 
 
@@ -3,16 +3,19 @@ Programs Router
 API endpoints for programs
 """
 import logging
-from fastapi import APIRouter, Depends, Query, Path
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Path, Request, Response
+from typing import List, Literal, Optional, Union
 
 from schemas.programs import (
     ProgramResponse,
     ProgramListResponse,
+    ProgramCardListResponse,
+    ProgramSparseListResponse,
     ProgramFilters,
 )
 from services.program_service import ProgramService
 from core.dependencies import get_program_service
+from core.etag import conditional_response
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +24,7 @@ router = APIRouter(prefix="/programs", tags=["programs"])
 
 @router.get(
     "",
-    response_model=ProgramListResponse,
+    response_model=Union[ProgramListResponse, ProgramCardListResponse, ProgramSparseListResponse],
     summary="List programs",
     description="""
 List all published programs with optional filters.
@@ -38,12 +41,22 @@ List all published programs with optional filters.
 - **max_cutoff**: Maximum cutoff score (optional - not implemented yet)
 - **page**: Page number (default: 1)
 - **page_size**: Items per page (default: 20, max: 100)
+- **paginate**: `offset` (default) or `cursor`. Cursor mode pages with
+  `next_cursor` instead of page numbers, stays fast at any depth and
+  reports an estimated `total`
+- **cursor**: `next_cursor` from the previous page
+- **fields**: `detail` (default), `card` (slim card view) or a
+  comma-separated subset of the detail fields. `id`, `name` and
+  `institution_id` are always included. Only the selected columns are
+  read and returned
 
 **Response:**
 Returns a paginated list of programs with metadata and institution information.
 """,
 )
 async def list_programs(
+    request: Request,
+    response: Response,
     search: Optional[str] = Query(
         None,
         description="Search by program name, field of study, or specialization",
@@ -96,6 +109,19 @@ async def list_programs(
         le=100,
         description="Items per page"
     ),
+    paginate: Literal["offset", "cursor"] = Query(
+        "offset",
+        description="Pagination mode: offset (page numbers) or cursor (keyset)"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from the previous page's next_cursor (implies cursor mode)"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Fieldset: detail (default), card, or comma-separated fields",
+        example="card"
+    ),
     service: ProgramService = Depends(get_program_service)
 ):
     """
@@ -116,10 +142,13 @@ async def list_programs(
         min_cutoff=min_cutoff,
         max_cutoff=max_cutoff,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        paginate=paginate,
+        cursor=cursor,
+        fields=fields
     )
 
-    return await service.list_programs(filters)
+    return conditional_response(request, response, await service.list_programs(filters))
 
 
 @router.get(
@@ -147,6 +176,8 @@ Returns full program details including:
 """,
 )
 async def get_program(
+    request: Request,
+    response: Response,
     id: str = Path(
         ...,
         description="Program UUID",
@@ -160,4 +191,4 @@ async def get_program(
     Returns full program information including institution details,
     accreditation status, and curriculum information.
     """
-    return await service.get_by_id(id)
+    return conditional_response(request, response, await service.get_by_id(id))
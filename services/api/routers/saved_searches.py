@@ -4,6 +4,7 @@ API endpoints for user saved searches
 """
 import logging
 from fastapi import APIRouter, Depends, Query, Path, Body
+from typing import Literal, Optional
 
 from schemas.saved_searches import (
     SavedSearchCreate,
@@ -38,6 +39,8 @@ List all saved searches for the authenticated user with pagination and sorting.
 - **page_size**: Items per page (default: 20, max: 100)
 - **sort**: Sort field (created_at, updated_at, execution_count, name)
 - **order**: Sort order (asc, desc)
+- **paginate**: `offset` (default) or `cursor` (keyset pages via `next_cursor`)
+- **cursor**: `next_cursor` from the previous page
 
 **Response:**
 Returns a paginated list of saved searches with execution metadata.
@@ -65,6 +68,14 @@ async def list_saved_searches(
         description="Sort order",
         regex="^(asc|desc)$"
     ),
+    paginate: Literal["offset", "cursor"] = Query(
+        "offset",
+        description="Pagination mode: offset (page numbers) or cursor (keyset)"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from the previous page's next_cursor (implies cursor mode)"
+    ),
     service: SavedSearchService = Depends(get_saved_search_service)
 ):
     """
@@ -77,7 +88,9 @@ async def list_saved_searches(
         page=page,
         page_size=page_size,
         sort=sort,
-        order=order
+        order=order,
+        paginate=paginate,
+        cursor=cursor
     )
 
 
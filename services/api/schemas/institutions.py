@@ -3,7 +3,7 @@ Institution Schemas
 Pydantic models for institutions endpoints
 """
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -54,6 +54,18 @@ class InstitutionBase(BaseModel):
     }
 
 
+class InstitutionCard(BaseModel):
+    """Slim institution model for card views (`fields=card`)"""
+    id: str = Field(..., description="Institution UUID")
+    slug: str = Field(..., description="URL-friendly identifier")
+    name: str = Field(..., description="Institution name")
+    short_name: Optional[str] = Field(None, description="Short name (e.g., UNILAG)")
+    type: str = Field(..., description="Institution type")
+    state: str = Field(..., description="Nigerian state")
+    logo_url: Optional[str] = Field(None, description="Logo image URL")
+    verified: bool = Field(..., description="Verification status")
+
+
 class InstitutionResponse(InstitutionBase):
     """Detailed institution model"""
     description: Optional[str] = Field(None, description="Institution description")
@@ -102,6 +114,9 @@ class InstitutionFilters(BaseModel):
     verified: Optional[bool] = Field(None, description="Filter by verification status")
     page: int = Field(default=1, ge=1, description="Page number")
     page_size: int = Field(default=20, ge=1, le=100, description="Items per page")
+    paginate: Literal["offset", "cursor"] = Field(default="offset", description="Pagination mode")
+    cursor: Optional[str] = Field(None, description="Cursor from a previous page's next_cursor")
+    fields: Optional[str] = Field(None, description="Fieldset: preset (card, detail) or comma-separated fields")
 
     model_config = {
         "json_schema_extra": {
@@ -127,6 +142,8 @@ class PaginationMetadata(BaseModel):
     total_pages: int = Field(..., description="Total number of pages")
     has_prev: bool = Field(..., description="Has previous page")
     has_next: bool = Field(..., description="Has next page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (cursor mode)")
+    estimated: bool = Field(False, description="Whether total is a planner estimate (cursor mode)")
 
 
 class InstitutionListResponse(BaseModel):
@@ -165,3 +182,15 @@ class InstitutionListResponse(BaseModel):
             ]
         }
     }
+
+
+class InstitutionCardListResponse(BaseModel):
+    """Institution list response for card views (`fields=card`)"""
+    data: List[InstitutionCard] = Field(..., description="List of institutions")
+    pagination: PaginationMetadata = Field(..., description="Pagination metadata")
+
+
+class InstitutionSparseListResponse(BaseModel):
+    """Institution list response with only the requested fields (`fields=id,name,...`)"""
+    data: List[Dict[str, Any]] = Field(..., description="List of institutions (requested fields only)")
+    pagination: PaginationMetadata = Field(..., description="Pagination metadata")
@@ -3,7 +3,7 @@ Program Schemas
 Pydantic models for programs endpoints
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Literal
 from datetime import datetime
 
 
@@ -51,6 +51,20 @@ class ProgramBase(BaseModel):
     }
 
 
+class ProgramCard(BaseModel):
+    """Slim program model for card views (`fields=card`)"""
+
+    id: str = Field(..., description="Program UUID")
+    slug: str = Field(..., description="URL-friendly identifier")
+    name: str = Field(..., description="Program name")
+    institution_id: str = Field(..., description="Institution UUID")
+    institution_name: str = Field(..., description="Institution name")
+    institution_slug: str = Field(..., description="Institution slug")
+    degree_type: str = Field(..., description="Degree type (undergraduate, nd, hnd, etc.)")
+    qualification: Optional[str] = Field(None, description="Qualification (BSc, BA, ND, HND, etc.)")
+    mode: Optional[str] = Field(None, description="Mode (full_time, part_time, online, hybrid)")
+
+
 class ProgramResponse(ProgramBase):
     """Detailed program model with all fields"""
 
@@ -102,6 +116,9 @@ class ProgramFilters(BaseModel):
     max_cutoff: Optional[float] = Field(None, description="Maximum cutoff score")
     page: int = Field(default=1, ge=1, description="Page number")
     page_size: int = Field(default=20, ge=1, le=100, description="Items per page")
+    paginate: Literal["offset", "cursor"] = Field(default="offset", description="Pagination mode")
+    cursor: Optional[str] = Field(None, description="Cursor from a previous page's next_cursor")
+    fields: Optional[str] = Field(None, description="Fieldset: preset (card, detail) or comma-separated fields")
 
     model_config = {
         "json_schema_extra": {
@@ -133,6 +150,8 @@ class PaginationMetadata(BaseModel):
     total_pages: int = Field(..., description="Total number of pages")
     has_prev: bool = Field(..., description="Has previous page")
     has_next: bool = Field(..., description="Has next page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (cursor mode)")
+    estimated: bool = Field(False, description="Whether total is a planner estimate (cursor mode)")
 
 
 class ProgramListResponse(BaseModel):
@@ -176,3 +195,17 @@ class ProgramListResponse(BaseModel):
             ]
         }
     }
+
+
+class ProgramCardListResponse(BaseModel):
+    """Program list response for card views (`fields=card`)"""
+
+    data: List[ProgramCard] = Field(..., description="List of programs")
+    pagination: PaginationMetadata = Field(..., description="Pagination metadata")
+
+
+class ProgramSparseListResponse(BaseModel):
+    """Program list response with only the requested fields (`fields=id,name,...`)"""
+
+    data: List[Dict[str, Any]] = Field(..., description="List of programs (requested fields only)")
+    pagination: PaginationMetadata = Field(..., description="Pagination metadata")
@@ -0,0 +1,122 @@
+"""
+Concurrency Load Test
+Measures request throughput of one API worker when Supabase queries block
+the event loop (inline `.execute()`) versus running on the bounded query
+executor
+
+Drives the real FastAPI app in-process against a simulated PostgREST
+(fixed latency per request), so no database or server is needed:
+
+    python scripts/benchmark_concurrency.py [--latency-ms 20] [--concurrency 32] [--requests 200]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from postgrest import SyncPostgrestClient
+
+from core import database
+from core.cache import response_cache
+from core.database import QueryExecutor, get_supabase
+from main import app
+
+INSTITUTION = {
+    "id": "i1", "slug": "university-of-lagos", "name": "University of Lagos", "short_name": "UNILAG",
+    "type": "federal_university", "state": "Lagos", "city": "Lagos", "verified": True,
+}
+
+
+class SimulatedSupabase:
+    """Supabase-like client whose PostgREST requests sleep for a fixed latency"""
+
+    def __init__(self, latency: float):
+        self.round_trips = 0
+
+        def handler(request):
+            self.round_trips += 1
+            time.sleep(latency)
+            if request.url.path.endswith("/programs"):
+                return httpx.Response(200, json=[{"institution_id": "i1"}] * 5)
+            return httpx.Response(200, json=[INSTITUTION] * 20, headers={"Content-Range": "0-19/150"})
+
+        self.postgrest = SyncPostgrestClient(
+            "http://db.test/rest/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    def table(self, name):
+        return self.postgrest.from_(name)
+
+
+class InlineExecutor(QueryExecutor):
+    """Previous behaviour: run the blocking call on the event loop thread"""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+async def load(concurrency: int, requests: int):
+    """Fire `requests` list requests with `concurrency` in flight; return per-request latencies"""
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    remaining = iter(range(requests))
+
+    async def user(client: httpx.AsyncClient):
+        for page in remaining:
+            started = time.perf_counter()
+            response = await client.get("/api/v1/institutions", params={"page": page % 5 + 1})
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://api.test") as client:
+        await asyncio.gather(*(user(client) for _ in range(concurrency)))
+    return latencies
+
+
+async def measure(name: str, executor: QueryExecutor, args) -> None:
+    database.query_executor = executor
+    started = time.perf_counter()
+    latencies = await load(args.concurrency, args.requests)
+    elapsed = time.perf_counter() - started
+    executor.close()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"  {name:<22} {len(latencies) / elapsed:>8.1f} req/s   "
+        f"p50 {statistics.median(latencies):>7.1f} ms   p95 {p95:>7.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated DB round-trip latency")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--workers", type=int, default=32, help="Query executor threads")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    supabase = SimulatedSupabase(args.latency_ms / 1000)
+    app.dependency_overrides[get_supabase] = lambda: supabase
+    # Measure the database path, not cache hits
+    response_cache.enabled = False
+
+    print(
+        f"GET /api/v1/institutions (2 queries/request), {args.latency_ms:.0f} ms per query, "
+        f"{args.concurrency} concurrent, {args.requests} requests, one worker"
+    )
+    await measure("blocking .execute()", InlineExecutor(), args)
+    await measure(f"executor ({args.workers} threads)", QueryExecutor(args.workers), args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
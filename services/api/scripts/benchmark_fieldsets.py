@@ -0,0 +1,96 @@
+"""
+Sparse Fieldset Benchmark
+Compares one list page (page_size=100) per fieldset: bytes PostgREST
+sends for the selected columns, response payload bytes and CPU time to
+validate and encode the page
+
+- full: `select('*')` rows (previous services), detail list model
+- detail: the detail preset's columns (default `fields=`)
+- card: the card preset's columns and slim card model (`fields=card`)
+
+    python scripts/benchmark_fieldsets.py [--page-size 100] [--requests 300]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.fieldsets import CARD, DETAIL
+from services.institution_service import INSTITUTION_FIELDSETS, INSTITUTION_LIST_MODELS
+from services.program_service import PROGRAM_FIELDSETS, PROGRAM_LIST_MODELS
+
+TIMESTAMP = "2025-01-10T14:30:00.123456+00:00"
+
+
+def institution_row(i: int):
+    return {
+        "id": f"550e8400-e29b-41d4-a716-{i:012d}", "slug": f"university-{i}", "name": f"University {i}",
+        "short_name": f"U{i}", "type": "federal_university", "state": "Lagos", "city": "Lagos",
+        "logo_url": f"https://storage.example.com/logos/{i}.png", "website": f"https://u{i}.edu.ng",
+        "verified": True, "program_count": 120, "description": "A public research university. " * 20,
+        "address": "University Road, Akoka", "phone": "+234 1 000 0000", "email": f"info@u{i}.edu.ng",
+        "accreditation_status": "fully_accredited", "year_established": 1962,
+        "status": "published", "created_at": TIMESTAMP, "updated_at": TIMESTAMP, "deleted_at": None,
+    }
+
+
+def program_row(i: int):
+    return {
+        "id": f"650e8400-e29b-41d4-a716-{i:012d}", "slug": f"program-{i}", "name": f"Computer Engineering {i}",
+        "institution_id": "550e8400-e29b-41d4-a716-446655440000", "institution_name": "University of Lagos",
+        "institution_slug": "university-of-lagos", "institution_state": "Lagos", "degree_type": "undergraduate",
+        "qualification": "BEng", "field_of_study": "Engineering", "specialization": "Computer Engineering",
+        "duration_years": 5.0, "mode": "full_time", "accreditation_status": "fully_accredited", "is_active": True,
+        "description": "Covers hardware and software design. " * 20,
+        "curriculum_summary": "Circuits, signals, embedded systems, networks and software engineering. " * 10,
+        "annual_intake": 120, "tuition_per_year": 150000,
+        "status": "published", "created_at": TIMESTAMP, "updated_at": TIMESTAMP, "deleted_at": None,
+    }
+
+
+SCENARIOS = [
+    ("/api/v1/institutions", INSTITUTION_FIELDSETS, INSTITUTION_LIST_MODELS, institution_row),
+    ("/api/v1/programs", PROGRAM_FIELDSETS, PROGRAM_LIST_MODELS, program_row),
+]
+PAGINATION = {"page": 1, "page_size": 100, "total": 4500, "total_pages": 45, "has_prev": False, "has_next": True}
+
+
+def measure(rows, columns, list_model, requests: int):
+    """(transfer bytes, payload bytes, CPU ms per request) for one fieldset"""
+    selected = [row if columns is None else {k: row[k] for k in columns} for row in rows]
+    transfer = len(json.dumps(selected))
+    payload = len(list_model.model_validate({"data": selected, "pagination": PAGINATION}).model_dump_json())
+
+    started = time.process_time()
+    for _ in range(requests):
+        page = [dict(row) for row in selected]
+        list_model.model_validate({"data": page, "pagination": PAGINATION}).model_dump_json()
+    return transfer, payload, (time.process_time() - started) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100, help="Rows per page")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per scenario")
+    args = parser.parse_args()
+    PAGINATION["page_size"] = args.page_size
+
+    print(f"One page of {args.page_size} rows, CPU ms averaged over {args.requests} requests")
+    print(f"  {'endpoint':<22} {'fields':<8} {'transfer':>10} {'payload':>10} {'cpu ms':>8}")
+    for path, fieldsets, list_models, make_row in SCENARIOS:
+        rows = [make_row(i) for i in range(args.page_size)]
+        for name, columns, model in (
+            ("full", None, list_models[DETAIL]),
+            (DETAIL, fieldsets.presets[DETAIL], list_models[DETAIL]),
+            (CARD, fieldsets.presets[CARD], list_models[CARD]),
+        ):
+            transfer, payload, cpu = measure(rows, columns, model, args.requests)
+            print(f"  {path:<22} {name:<8} {transfer:>10,} {payload:>10,} {cpu:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
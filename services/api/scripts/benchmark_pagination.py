@@ -0,0 +1,99 @@
+"""
+Pagination Benchmark
+Compares DB round trips and latency of list endpoints before and after
+fetching rows and the total count in a single PostgREST request
+
+Runs against a simulated PostgREST (fixed latency per request), so no
+database is needed:
+
+    python scripts/benchmark_pagination.py [--latency-ms 20] [--requests 50]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from postgrest import SyncPostgrestClient
+
+from services.admin_program_service import AdminProgramService
+from services.saved_search_service import SavedSearchService
+
+ROW = {
+    "id": "r1", "institution_id": "i1", "slug": "law", "name": "Law", "query": "law",
+    "degree_type": "undergraduate", "duration_years": 4, "mode": "full_time", "status": "published",
+    "created_at": "2025-01-01T00:00:00+00:00", "updated_at": "2025-01-01T00:00:00+00:00",
+}
+
+
+class SimulatedSupabase:
+    """Supabase-like client whose PostgREST requests sleep for a fixed latency"""
+
+    def __init__(self, latency: float):
+        self.round_trips = 0
+
+        def handler(request):
+            self.round_trips += 1
+            time.sleep(latency)
+            return httpx.Response(200, json=[ROW] * 20, headers={"Content-Range": "20-39/4500"})
+
+        self.postgrest = SyncPostgrestClient(
+            "http://db.test/rest/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    def table(self, name):
+        return self.postgrest.from_(name)
+
+
+def legacy_list(supabase, page: int, page_size: int):
+    """Previous pattern: execute the filtered query for the count, then again for the page"""
+    query = supabase.table("programs").select("*", count="exact").eq("status", "published")
+    total = query.execute().count
+    offset = (page - 1) * page_size
+    rows = query.order("updated_at", desc=True).range(offset, offset + page_size - 1).execute().data
+    return rows, total
+
+
+async def measure(name: str, fn, supabase: SimulatedSupabase, requests: int) -> None:
+    supabase.round_trips = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        await fn()
+    elapsed = (time.perf_counter() - started) / requests * 1000
+    print(f"  {name:<28} {supabase.round_trips / requests:>5.1f} round trips  {elapsed:>7.1f} ms/request")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated DB round-trip latency")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per scenario")
+    args = parser.parse_args()
+
+    supabase = SimulatedSupabase(args.latency_ms / 1000)
+    admin = AdminProgramService(supabase)
+    saved = SavedSearchService(supabase, "user-1")
+
+    async def legacy():
+        return legacy_list(supabase, 2, 20)
+
+    print(f"\nList endpoint round trips (simulated latency {args.latency_ms:.0f}ms, {args.requests} requests)")
+    print("=" * 72)
+    await measure("before (count + page)", legacy, supabase, args.requests)
+    await measure("admin programs", lambda: admin.list_programs(page=2, page_size=20), supabase, args.requests)
+    await measure("saved searches", lambda: saved.list_saved_searches(page=2, page_size=20), supabase, args.requests)
+    await measure(
+        "admin programs (cursor)",
+        lambda: admin.list_programs(page_size=20, paginate="cursor"),
+        supabase,
+        args.requests,
+    )
+    print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
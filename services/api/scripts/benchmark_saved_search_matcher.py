@@ -0,0 +1,106 @@
+"""
+Saved Search Matcher Benchmark
+Times matching changed programs against a large in-memory saved-search index
+versus evaluating every saved search
+
+Uses synthetic saved searches and programs, so no database is needed:
+
+    python scripts/benchmark_saved_search_matcher.py [--searches 100000] [--programs 200]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.saved_search_matcher import (
+    SavedSearchMatcher,
+    document_words,
+    program_document,
+)
+
+STATES = ["Lagos", "Ogun", "Oyo", "Kano", "Rivers", "Enugu", "Kaduna", "Edo", "Anambra", "FCT"]
+DEGREES = ["undergraduate", "nd", "hnd", "pre_degree", "diploma"]
+MODES = ["full_time", "part_time", "online"]
+FIELDS = ["Engineering", "Medicine", "Law", "Sciences", "Arts", "Management", "Education"]
+WORDS = ["computer", "science", "law", "medicine", "nursing", "accounting", "civil", "electrical",
+         "economics", "pharmacy", "architecture", "mass", "communication", "biochemistry"]
+
+
+def saved_searches(count: int, rng: random.Random):
+    for i in range(count):
+        filters = {}
+        if rng.random() < 0.7:
+            filters["state"] = rng.sample(STATES, rng.randint(1, 2))
+        if rng.random() < 0.5:
+            filters["degree_type"] = [rng.choice(DEGREES)]
+        if rng.random() < 0.2:
+            filters["mode"] = [rng.choice(MODES)]
+        if rng.random() < 0.3:
+            filters["field_of_study"] = [rng.choice(FIELDS)]
+        yield {
+            "id": f"s{i}",
+            "query": " ".join(rng.sample(WORDS, rng.randint(1, 2))),
+            "filters": filters,
+            "created_at": "2026-01-01T00:00:00+00:00",
+        }
+
+
+def programs(count: int, rng: random.Random):
+    return [
+        program_document({
+            "id": f"p{i}",
+            "name": " ".join(rng.sample(WORDS, 2)).title(),
+            "degree_type": rng.choice(DEGREES),
+            "mode": rng.choice(MODES),
+            "field_of_study": rng.choice(FIELDS),
+            "status": "published",
+            "is_active": True,
+            "created_at": "2026-02-01T00:00:00+00:00",
+            "institution": {"name": "Federal University", "state": rng.choice(STATES)},
+        })
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--searches", type=int, default=100_000, help="Saved searches to index")
+    parser.add_argument("--programs", type=int, default=200, help="Changed programs to match")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    matcher = SavedSearchMatcher()
+    started = time.perf_counter()
+    matcher.rebuild(saved_searches(args.searches, rng))
+    build_ms = (time.perf_counter() - started) * 1000
+    documents = programs(args.programs, rng)
+
+    started = time.perf_counter()
+    matches = matcher.match(documents)
+    indexed_ms = (time.perf_counter() - started) * 1000
+
+    # Baseline: evaluate every distinct predicate for every program
+    started = time.perf_counter()
+    scanned = 0
+    for document in documents:
+        words = document_words(document)
+        for predicate in matcher._groups:
+            scanned += predicate.matches(document, words)
+    scan_ms = (time.perf_counter() - started) * 1000
+
+    print(f"\nSaved search matching ({len(matcher)} searches, {matcher.group_count} distinct, "
+          f"{len(documents)} changed programs)")
+    print("=" * 72)
+    print(f"  index build                {build_ms:>9.1f} ms")
+    print(f"  inverted index             {indexed_ms:>9.1f} ms  ({indexed_ms / len(documents):.2f} ms/program)")
+    print(f"  scan every predicate       {scan_ms:>9.1f} ms  ({scan_ms / len(documents):.2f} ms/program)")
+    print(f"  matches                    {len(matches):>9}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Serialization Benchmark
+Compares CPU time per request spent turning a list page (page_size=100)
+of database rows into the response body
+
+- per-row: each row validated into its model (previous services), then
+  re-validated against the route's response_model and encoded by
+  FastAPI's JSONResponse
+- batched: the page validated in one `model_validate` call (current
+  services), then FastAPI's default path as above
+- fast: batched, then sent by `core.serialization.model_response`
+  (FAST_JSON_RESPONSES) - no re-validation, pydantic-core encoding
+
+    python scripts/benchmark_serialization.py [--page-size 100] [--requests 300]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from core.config import settings
+from core.serialization import model_response
+from main import app
+from schemas.bookmarks import BookmarkListResponse, BookmarkWithEntity
+from schemas.institutions import InstitutionBase, InstitutionListResponse
+from schemas.programs import ProgramBase, ProgramListResponse
+
+TIMESTAMP = "2025-01-10T14:30:00.123456+00:00"
+
+
+def institution_row(i: int):
+    # select('*') returns columns the list model doesn't expose
+    return {
+        "id": f"550e8400-e29b-41d4-a716-{i:012d}", "slug": f"university-{i}", "name": f"University {i}",
+        "short_name": f"U{i}", "type": "federal_university", "state": "Lagos", "city": "Lagos",
+        "logo_url": f"https://storage.example.com/logos/{i}.png", "website": f"https://u{i}.edu.ng",
+        "verified": True, "program_count": 120, "description": "A public research university. " * 8,
+        "address": "University Road, Akoka", "phone": "+234 1 000 0000", "email": f"info@u{i}.edu.ng",
+        "status": "published", "created_at": TIMESTAMP, "updated_at": TIMESTAMP, "deleted_at": None,
+    }
+
+
+def program_row(i: int):
+    return {
+        "id": f"650e8400-e29b-41d4-a716-{i:012d}", "slug": f"program-{i}", "name": f"Computer Engineering {i}",
+        "institution_id": "550e8400-e29b-41d4-a716-446655440000", "institution_name": "University of Lagos",
+        "institution_slug": "university-of-lagos", "institution_state": "Lagos", "degree_type": "undergraduate",
+        "qualification": "BEng", "field_of_study": "Engineering", "specialization": "Computer Engineering",
+        "duration_years": 5.0, "mode": "full_time", "accreditation_status": "fully_accredited", "is_active": True,
+        "description": "Covers hardware and software design. " * 8, "tuition_per_year": 150000,
+        "status": "published", "created_at": TIMESTAMP, "updated_at": TIMESTAMP, "deleted_at": None,
+    }
+
+
+def bookmark_row(i: int):
+    return {
+        "id": f"750e8400-e29b-41d4-a716-{i:012d}", "entity_type": "program",
+        "entity_id": f"650e8400-e29b-41d4-a716-{i:012d}", "notes": "Check cutoff scores", "created_at": TIMESTAMP,
+        "entity": {
+            "id": f"650e8400-e29b-41d4-a716-{i:012d}", "name": f"Computer Engineering {i}",
+            "slug": f"program-{i}", "degree_type": "undergraduate", "duration_years": 5,
+            "institution": {"name": "University of Lagos", "slug": "university-of-lagos", "state": "Lagos"},
+        },
+    }
+
+
+def pagination(page_size: int):
+    return {"page": 1, "page_size": page_size, "total": 4500, "total_pages": 45, "has_prev": False, "has_next": True}
+
+
+SCENARIOS = [
+    ("/api/v1/institutions", InstitutionListResponse, InstitutionBase, institution_row),
+    ("/api/v1/programs", ProgramListResponse, ProgramBase, program_row),
+    ("/api/v1/users/me/bookmarks", BookmarkListResponse, BookmarkWithEntity, bookmark_row),
+]
+
+
+def response_field(path: str):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+async def fastapi_body(field, value) -> bytes:
+    """What FastAPI does with a returned model: validate against response_model, encode"""
+    content = await serialize_response(field=field, response_content=value)
+    return JSONResponse(content).body
+
+
+async def per_row(field, list_model, item_model, rows, page_size) -> bytes:
+    value = list_model(data=[item_model(**row) for row in rows], pagination=pagination(page_size))
+    return await fastapi_body(field, value)
+
+
+async def batched(field, list_model, item_model, rows, page_size) -> bytes:
+    value = list_model.model_validate({"data": rows, "pagination": pagination(page_size)})
+    return await fastapi_body(field, value)
+
+
+async def fast(field, list_model, item_model, rows, page_size) -> bytes:
+    value = list_model.model_validate({"data": rows, "pagination": pagination(page_size)})
+    return model_response(value).body
+
+
+async def measure(fn, args, scenario) -> float:
+    path, list_model, item_model, make_row = scenario
+    field = response_field(path)
+    rows = [make_row(i) for i in range(args.page_size)]
+    await fn(field, list_model, item_model, rows, args.page_size)  # warm up
+
+    started = time.process_time()
+    for _ in range(args.requests):
+        # Fresh row dicts each request, as PostgREST would return
+        await fn(field, list_model, item_model, [dict(row) for row in rows], args.page_size)
+    return (time.process_time() - started) / args.requests * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100, help="Rows per page")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per scenario")
+    args = parser.parse_args()
+    settings.FAST_JSON_RESPONSES = True
+
+    print(f"CPU ms per request, page_size={args.page_size}, {args.requests} requests")
+    print(f"  {'endpoint':<28} {'per-row':>8} {'batched':>8} {'fast':>8}  speedup")
+    for scenario in SCENARIOS:
+        path, list_model, item_model, make_row = scenario
+        rows = [make_row(i) for i in range(args.page_size)]
+        field = response_field(path)
+        expected = json.loads(await per_row(field, list_model, item_model, rows, args.page_size))
+        assert json.loads(await fast(field, list_model, item_model, rows, args.page_size)) == expected
+
+        timings = [await measure(fn, args, scenario) for fn in (per_row, batched, fast)]
+        print(
+            f"  {path:<28} {timings[0]:>8.2f} {timings[1]:>8.2f} {timings[2]:>8.2f}  "
+            f"{timings[0] / timings[2]:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,13 @@
 """
 Meilisearch Sync Script
 Syncs data from Supabase to Meilisearch indexes
+
+Usage:
+    python scripts/sync_to_meilisearch.py                  # clean full sync
+    python scripts/sync_to_meilisearch.py --incremental    # changed rows only
+    python scripts/sync_to_meilisearch.py --incremental --daemon --interval 60
 """
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -13,6 +19,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import meilisearch
 from supabase import create_client, Client
 from core.config import settings
+from services import search_sync
+from services.search_sync import SEARCH_TARGETS, institution_document, program_document
 
 
 def get_supabase_client() -> Client:
@@ -87,22 +95,7 @@ async def sync_institutions(
         for inst in institutions:
             # Add program_count
             inst['program_count'] = program_counts.get(inst['id'], 0)
-
-            # Convert datetime to string
-            if inst.get('created_at'):
-                inst['created_at'] = str(inst['created_at'])
-            if inst.get('updated_at'):
-                inst['updated_at'] = str(inst['updated_at'])
-
-            # Remove fields not needed for search
-            fields_to_keep = [
-                'id', 'slug', 'name', 'short_name', 'type', 'state', 'city',
-                'logo_url', 'website', 'verified', 'accreditation_status',
-                'program_count', 'description', 'status', 'created_at'
-            ]
-
-            document = {k: v for k, v in inst.items() if k in fields_to_keep}
-            documents.append(document)
+            documents.append(institution_document(inst))
 
         print(f"  ✓ Transformed {len(documents)} documents")
 
@@ -175,44 +168,7 @@ async def sync_programs(
 
         # Transform data for Meilisearch
         print("  → Transforming data for Meilisearch...")
-        documents = []
-        for prog in programs:
-            # Extract institution data
-            institution_data = prog.get('institution', {})
-            institution_name = institution_data.get('name', 'Unknown')
-            institution_slug = institution_data.get('slug', '')
-            institution_state = institution_data.get('state', '')
-
-            # Get cutoff score (aggregate from program_cutoffs table - we'll add a simple fallback)
-            # For now, set to None - can be enhanced later
-            cutoff_score = None
-
-            # Get tuition (aggregate from program_costs table - we'll add a simple fallback)
-            # For now, set to None - can be enhanced later
-            tuition_annual = None
-
-            # Convert datetime to string
-            created_at = str(prog['created_at']) if prog.get('created_at') else None
-
-            # Build document
-            fields_to_keep = [
-                'id', 'institution_id', 'slug', 'name', 'degree_type',
-                'field_of_study', 'specialization', 'qualification',
-                'duration_years', 'duration_text', 'mode', 'description',
-                'status', 'is_active'
-            ]
-
-            document = {k: v for k, v in prog.items() if k in fields_to_keep}
-
-            # Add institution fields
-            document['institution_name'] = institution_name
-            document['institution_slug'] = institution_slug
-            document['institution_state'] = institution_state
-            document['created_at'] = created_at
-            document['tuition_annual'] = tuition_annual
-            document['cutoff_score'] = cutoff_score
-
-            documents.append(document)
+        documents = [program_document(prog) for prog in programs]
 
         print(f"  ✓ Transformed {len(documents)} documents")
 
@@ -246,6 +202,25 @@ async def main():
     """
     Main function to sync data to Meilisearch
     """
+    parser = argparse.ArgumentParser(description='Sync data to Meilisearch')
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only sync rows changed since the last run (first run syncs everything)'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='With --incremental: keep running, syncing every --interval seconds'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=60,
+        help='Seconds between incremental passes in daemon mode (default: 60)'
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Meilisearch Data Sync - Admitly Platform")
     print("=" * 60)
@@ -263,8 +238,21 @@ async def main():
         print(f"✓ Connected to Meilisearch (Status: {health.get('status', 'unknown')})")
 
         # Sync data
-        await sync_institutions(supabase, meilisearch_client)
-        await sync_programs(supabase, meilisearch_client)
+        if args.incremental:
+            syncer = search_sync.IncrementalSync(
+                supabase, meilisearch_client, search_sync.TableWatermarks(supabase)
+            )
+            if args.daemon:
+                print(f"\nSyncing changes every {args.interval:g}s (Ctrl+C to stop)...")
+                await syncer.run_forever(SEARCH_TARGETS, args.interval)
+            else:
+                results = syncer.sync_once(SEARCH_TARGETS)
+                for index_name, counts in results.items():
+                    print(f"  ✓ {index_name}: {counts['changed']} changed, "
+                          f"{counts['upserted']} upserted, {counts['deleted']} deleted")
+        else:
+            await sync_institutions(supabase, meilisearch_client)
+            await sync_programs(supabase, meilisearch_client)
 
         # Show final status
         print("\n" + "=" * 60)
@@ -4,11 +4,20 @@ Business logic for admin institution management (CRUD operations)
 """
 import logging
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from fastapi import HTTPException, status
 from supabase import Client
 from datetime import datetime
 
+from core.database import execute
+from core.cache import (
+    response_cache,
+    institution_tag,
+    namespace_tag,
+    INSTITUTIONS_LIST,
+    PROGRAMS_LIST,
+)
+
 from schemas.admin import (
     InstitutionCreateRequest,
     InstitutionUpdateRequest,
@@ -17,6 +26,10 @@ from schemas.admin import (
 
 logger = logging.getLogger(__name__)
 
+# Fields that decide which public list pages an institution appears on
+# (filters, search and sort order)
+LIST_FIELDS = {"name", "short_name", "type", "state", "verified", "status"}
+
 
 class AdminInstitutionService:
     """Service for admin institution management"""
@@ -24,6 +37,31 @@ class AdminInstitutionService:
     def __init__(self, supabase: Client):
         self.supabase = supabase
 
+    async def _invalidate_cache(
+        self,
+        institution_id: str,
+        changed_fields: Optional[Set[str]] = None
+    ) -> None:
+        """
+        Drop cached public responses affected by a write to one institution
+
+        Entries that contain the institution (detail, its program pages,
+        list pages it is on, programs embedding its name) are dropped by
+        tag on every worker. List pages are only cleared wholesale when a
+        field deciding list membership or order changed.
+
+        Args:
+            institution_id: Institution UUID
+            changed_fields: Updated columns (None = treat as all changed)
+        """
+        tags = [institution_tag(institution_id)]
+        if changed_fields is None or changed_fields & LIST_FIELDS:
+            tags.append(namespace_tag(INSTITUTIONS_LIST))
+        if changed_fields is None or "state" in changed_fields:
+            # Programs are filtered by their institution's state
+            tags.append(namespace_tag(PROGRAMS_LIST))
+        await response_cache.invalidate_tags(*tags)
+
     def _generate_slug(self, name: str) -> str:
         """
         Generate URL-friendly slug from institution name
@@ -95,9 +133,10 @@ class AdminInstitutionService:
                     }
 
                     # Insert institution (database will enforce uniqueness)
-                    response = self.supabase.table('institutions')\
-                        .insert(institution_data)\
-                        .execute()
+                    response = await execute(
+                        self.supabase.table('institutions')
+                        .insert(institution_data)
+                    )
 
                     if not response.data or len(response.data) == 0:
                         raise HTTPException(
@@ -107,6 +146,7 @@ class AdminInstitutionService:
 
                     # Success! Get created institution with program count
                     institution_id = response.data[0]['id']
+                    await self._invalidate_cache(institution_id)
                     return await self.get_institution(institution_id)
 
                 except Exception as insert_error:
@@ -153,11 +193,12 @@ class AdminInstitutionService:
         """
         try:
             # Get institution
-            response = self.supabase.table('institutions')\
-                .select('*')\
-                .eq('id', institution_id)\
-                .maybe_single()\
-                .execute()
+            response = await execute(
+                self.supabase.table('institutions')
+                .select('*')
+                .eq('id', institution_id)
+                .maybe_single()
+            )
 
             if not response.data:
                 raise HTTPException(
@@ -168,11 +209,12 @@ class AdminInstitutionService:
             institution = response.data
 
             # Get program count
-            program_count_response = self.supabase.table('programs')\
-                .select('id', count='exact')\
-                .eq('institution_id', institution_id)\
-                .is_('deleted_at', 'null')\
-                .execute()
+            program_count_response = await execute(
+                self.supabase.table('programs')
+                .select('id', count='exact')
+                .eq('institution_id', institution_id)
+                .is_('deleted_at', 'null')
+            )
 
             program_count = program_count_response.count or 0
 
@@ -236,7 +278,7 @@ class AdminInstitutionService:
             query = query.range(offset, offset + page_size - 1)
 
             # Execute query
-            response = query.execute()
+            response = await execute(query)
 
             # Calculate pagination
             total = response.count if response.count is not None else 0
@@ -250,12 +292,11 @@ class AdminInstitutionService:
 
             if institution_ids:
                 # Query all programs for these institutions at once
-                programs_response = (
+                programs_response = await execute(
                     self.supabase.table('programs')
                     .select('institution_id')
                     .in_('institution_id', institution_ids)
                     .is_('deleted_at', 'null')
-                    .execute()
                 )
 
                 # Count programs per institution in Python (O(n) operation, very fast)
@@ -306,11 +347,12 @@ class AdminInstitutionService:
         """
         try:
             # Check institution exists
-            existing = self.supabase.table('institutions')\
-                .select('id')\
-                .eq('id', institution_id)\
-                .maybe_single()\
-                .execute()
+            existing = await execute(
+                self.supabase.table('institutions')
+                .select('id')
+                .eq('id', institution_id)
+                .maybe_single()
+            )
 
             if not existing.data:
                 raise HTTPException(
@@ -360,10 +402,11 @@ class AdminInstitutionService:
             update_data['updated_at'] = datetime.utcnow().isoformat()
 
             # Update institution
-            response = self.supabase.table('institutions')\
-                .update(update_data)\
-                .eq('id', institution_id)\
-                .execute()
+            response = await execute(
+                self.supabase.table('institutions')
+                .update(update_data)
+                .eq('id', institution_id)
+            )
 
             if not response.data or len(response.data) == 0:
                 raise HTTPException(
@@ -371,7 +414,8 @@ class AdminInstitutionService:
                     detail="Failed to update institution"
                 )
 
-            # Return updated institution
+            # Drop cached public responses, then return updated institution
+            await self._invalidate_cache(institution_id, set(update_data) - {'updated_at'})
             return await self.get_institution(institution_id)
 
         except HTTPException:
@@ -398,12 +442,13 @@ class AdminInstitutionService:
         """
         try:
             # Check institution exists
-            existing = self.supabase.table('institutions')\
-                .select('id')\
-                .eq('id', institution_id)\
-                .is_('deleted_at', 'null')\
-                .maybe_single()\
-                .execute()
+            existing = await execute(
+                self.supabase.table('institutions')
+                .select('id')
+                .eq('id', institution_id)
+                .is_('deleted_at', 'null')
+                .maybe_single()
+            )
 
             if not existing.data:
                 raise HTTPException(
@@ -412,10 +457,11 @@ class AdminInstitutionService:
                 )
 
             # Soft delete by setting deleted_at
-            response = self.supabase.table('institutions')\
-                .update({"deleted_at": datetime.utcnow().isoformat()})\
-                .eq('id', institution_id)\
-                .execute()
+            response = await execute(
+                self.supabase.table('institutions')
+                .update({"deleted_at": datetime.utcnow().isoformat()})
+                .eq('id', institution_id)
+            )
 
             if not response.data:
                 raise HTTPException(
@@ -423,6 +469,7 @@ class AdminInstitutionService:
                     detail="Failed to delete institution"
                 )
 
+            await self._invalidate_cache(institution_id)
             return {"message": f"Institution {institution_id} deleted successfully"}
 
         except HTTPException:
@@ -450,11 +497,12 @@ class AdminInstitutionService:
         """
         try:
             # Check institution exists
-            existing = self.supabase.table('institutions')\
-                .select('id')\
-                .eq('id', institution_id)\
-                .maybe_single()\
-                .execute()
+            existing = await execute(
+                self.supabase.table('institutions')
+                .select('id')
+                .eq('id', institution_id)
+                .maybe_single()
+            )
 
             if not existing.data:
                 raise HTTPException(
@@ -463,13 +511,14 @@ class AdminInstitutionService:
                 )
 
             # Update status
-            response = self.supabase.table('institutions')\
+            response = await execute(
+                self.supabase.table('institutions')
                 .update({
                     "status": new_status,
                     "updated_at": datetime.utcnow().isoformat()
-                })\
-                .eq('id', institution_id)\
-                .execute()
+                })
+                .eq('id', institution_id)
+            )
 
             if not response.data:
                 raise HTTPException(
@@ -477,7 +526,8 @@ class AdminInstitutionService:
                     detail="Failed to update status"
                 )
 
-            # Return updated institution
+            # Drop cached public responses, then return updated institution
+            await self._invalidate_cache(institution_id, {'status'})
             return await self.get_institution(institution_id)
 
         except HTTPException:
@@ -4,9 +4,20 @@ Business logic for program CRUD operations (admin only)
 """
 import logging
 import re
-from typing import Optional, List
+from typing import Iterable, Optional, List, Set
 from supabase import Client
 from fastapi import HTTPException, status
+
+from core.database import execute
+from core.cache import (
+    response_cache,
+    institution_tag,
+    program_tag,
+    namespace_tag,
+    PROGRAMS_LIST,
+    INSTITUTION_PROGRAMS,
+)
+from core.pagination import RECENT_ORDER, count_method, fetch_page, use_cursor
 from schemas.admin import (
     ProgramCreateRequest,
     ProgramUpdateRequest,
@@ -15,6 +26,13 @@ from schemas.admin import (
 
 logger = logging.getLogger(__name__)
 
+# Fields that decide which public list pages a program appears on
+# (filters, search and sort order)
+LIST_FIELDS = {
+    "name", "field_of_study", "specialization", "degree_type", "mode",
+    "status", "is_active", "institution_id",
+}
+
 
 class AdminProgramService:
     """Service for managing programs via admin portal"""
@@ -22,6 +40,33 @@ class AdminProgramService:
     def __init__(self, supabase: Client):
         self.supabase = supabase
 
+    async def _invalidate_cache(
+        self,
+        program_id: str,
+        institution_ids: Iterable[Optional[str]],
+        changed_fields: Optional[Set[str]] = None
+    ) -> None:
+        """
+        Drop cached public responses affected by a write to one program
+
+        Entries that contain the program or its institution (program
+        detail, list pages it is on, the institution's detail and program
+        count) are dropped by tag on every worker. Program list pages are
+        only cleared wholesale when a field deciding list membership or
+        order changed.
+
+        Args:
+            program_id: Program UUID
+            institution_ids: Institution(s) the program belongs/belonged to
+            changed_fields: Updated columns (None = treat as all changed)
+        """
+        tags = [program_tag(program_id)]
+        tags.extend(institution_tag(i) for i in set(institution_ids) if i)
+        if changed_fields is None or changed_fields & LIST_FIELDS:
+            tags.append(namespace_tag(PROGRAMS_LIST))
+            tags.append(namespace_tag(INSTITUTION_PROGRAMS))
+        await response_cache.invalidate_tags(*tags)
+
     def _generate_slug(self, name: str) -> str:
         """Generate URL-friendly slug from program name"""
         # Convert to lowercase
@@ -51,7 +96,7 @@ class AdminProgramService:
         base_slug = data.slug or self._generate_slug(data.name)
 
         # Check if institution exists
-        institution_response = self.supabase.table('institutions').select('id').eq('id', data.institution_id).maybe_single().execute()
+        institution_response = await execute(self.supabase.table('institutions').select('id').eq('id', data.institution_id).maybe_single())
         if not institution_response.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -68,7 +113,7 @@ class AdminProgramService:
                 program_data['slug'] = slug
 
                 # Insert program (database will enforce uniqueness per institution)
-                response = self.supabase.table('programs').insert(program_data).execute()
+                response = await execute(self.supabase.table('programs').insert(program_data))
 
                 if not response.data:
                     raise HTTPException(
@@ -78,6 +123,7 @@ class AdminProgramService:
 
                 # Success! Fetch with institution details
                 program_id = response.data[0]['id']
+                await self._invalidate_cache(program_id, [data.institution_id])
                 return await self.get_program(program_id)
 
             except Exception as insert_error:
@@ -113,9 +159,9 @@ class AdminProgramService:
         Raises:
             HTTPException: 404 if program not found
         """
-        response = self.supabase.table('programs').select(
+        response = await execute(self.supabase.table('programs').select(
             '*, institution:institutions(id, name, short_name)'
-        ).eq('id', program_id).maybe_single().execute()
+        ).eq('id', program_id).maybe_single())
 
         if not response.data:
             raise HTTPException(
@@ -132,26 +178,32 @@ class AdminProgramService:
         institution_id: Optional[str] = None,
         degree_type: Optional[str] = None,
         status_filter: Optional[str] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        paginate: str = "offset",
+        cursor: Optional[str] = None
     ) -> dict:
         """
         List programs with filtering and pagination
 
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed, offset mode)
             page_size: Items per page
             institution_id: Filter by institution
             degree_type: Filter by degree type
             status_filter: Filter by status (draft/published/archived)
             search: Search by program name
+            paginate: "offset" or "cursor" (keyset on updated_at, id)
+            cursor: Cursor from a previous page (implies cursor mode)
 
         Returns:
             Dict with data and pagination info
         """
+        cursor_mode = use_cursor(paginate, cursor)
+
         # Build query
         query = self.supabase.table('programs').select(
             '*, institution:institutions(id, name, short_name)',
-            count='exact'
+            count=count_method(cursor_mode)
         )
 
         # Apply filters
@@ -170,32 +222,14 @@ class AdminProgramService:
         if search:
             query = query.ilike('name', f'%{search}%')
 
-        # Get total count
-        count_response = query.execute()
-        total = count_response.count if count_response.count is not None else 0
+        # Order by updated_at desc and fetch one page (rows and count in one request)
+        rows, pagination = await fetch_page(query, RECENT_ORDER, page, page_size, cursor_mode, cursor)
 
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.range(offset, offset + page_size - 1)
-
-        # Order by updated_at desc
-        query = query.order('updated_at', desc=True)
-
-        # Execute query
-        response = query.execute()
-
-        programs = [ProgramAdminResponse(**item) for item in response.data]
+        programs = [ProgramAdminResponse(**item) for item in rows]
 
         return {
             "data": programs,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total": total,
-                "total_pages": (total + page_size - 1) // page_size,
-                "has_prev": page > 1,
-                "has_next": page * page_size < total
-            }
+            "pagination": pagination
         }
 
     async def update_program(
@@ -217,7 +251,7 @@ class AdminProgramService:
             HTTPException: 404 if program not found, 409 if slug conflict
         """
         # Check program exists
-        existing = self.supabase.table('programs').select('id, slug, institution_id').eq('id', program_id).maybe_single().execute()
+        existing = await execute(self.supabase.table('programs').select('id, slug, institution_id').eq('id', program_id).maybe_single())
         if not existing.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -229,7 +263,7 @@ class AdminProgramService:
 
         # If slug is being updated, check uniqueness
         if 'slug' in update_data and update_data['slug'] != existing.data['slug']:
-            slug_check = self.supabase.table('programs').select('id').eq('slug', update_data['slug']).eq('institution_id', existing.data['institution_id']).maybe_single().execute()
+            slug_check = await execute(self.supabase.table('programs').select('id').eq('slug', update_data['slug']).eq('institution_id', existing.data['institution_id']).maybe_single())
             if slug_check.data and slug_check.data['id'] != program_id:
                 raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
@@ -237,7 +271,7 @@ class AdminProgramService:
                 )
 
         # Update program
-        response = self.supabase.table('programs').update(update_data).eq('id', program_id).execute()
+        response = await execute(self.supabase.table('programs').update(update_data).eq('id', program_id))
 
         if not response.data:
             raise HTTPException(
@@ -245,7 +279,12 @@ class AdminProgramService:
                 detail="Failed to update program"
             )
 
-        # Return updated program with institution details
+        # Drop cached public responses, then return updated program
+        await self._invalidate_cache(
+            program_id,
+            [existing.data['institution_id'], update_data.get('institution_id')],
+            set(update_data)
+        )
         return await self.get_program(program_id)
 
     async def delete_program(self, program_id: str) -> dict:
@@ -262,7 +301,7 @@ class AdminProgramService:
             HTTPException: 404 if program not found
         """
         # Check program exists
-        existing = self.supabase.table('programs').select('id').eq('id', program_id).maybe_single().execute()
+        existing = await execute(self.supabase.table('programs').select('id, institution_id').eq('id', program_id).maybe_single())
         if not existing.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -271,9 +310,9 @@ class AdminProgramService:
 
         # Soft delete (set deleted_at)
         from datetime import datetime, timezone
-        response = self.supabase.table('programs').update({
+        response = await execute(self.supabase.table('programs').update({
             'deleted_at': datetime.now(timezone.utc).isoformat()
-        }).eq('id', program_id).execute()
+        }).eq('id', program_id))
 
         if not response.data:
             raise HTTPException(
@@ -281,6 +320,7 @@ class AdminProgramService:
                 detail="Failed to delete program"
             )
 
+        await self._invalidate_cache(program_id, [existing.data.get('institution_id')])
         return {"message": "Program deleted successfully"}
 
     async def update_program_status(
@@ -302,7 +342,7 @@ class AdminProgramService:
             HTTPException: 404 if program not found
         """
         # Check program exists
-        existing = self.supabase.table('programs').select('id').eq('id', program_id).maybe_single().execute()
+        existing = await execute(self.supabase.table('programs').select('id, institution_id').eq('id', program_id).maybe_single())
         if not existing.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -310,9 +350,9 @@ class AdminProgramService:
             )
 
         # Update status
-        response = self.supabase.table('programs').update({
+        response = await execute(self.supabase.table('programs').update({
             'status': new_status
-        }).eq('id', program_id).execute()
+        }).eq('id', program_id))
 
         if not response.data:
             raise HTTPException(
@@ -320,5 +360,6 @@ class AdminProgramService:
                 detail="Failed to update program status"
             )
 
-        # Return updated program
+        # Drop cached public responses, then return updated program
+        await self._invalidate_cache(program_id, [existing.data.get('institution_id')], {'status'})
         return await self.get_program(program_id)
@@ -7,7 +7,7 @@ from fastapi import HTTPException, status
 from supabase import AuthApiError
 import logging
 
-from core.database import get_supabase
+from core.database import execute, get_supabase, query_executor
 from core.security import get_token_expiration_seconds
 from schemas.auth import UserRegister, UserLogin, TokenResponse, UserProfile
 
@@ -26,8 +26,10 @@ class AuthService:
     - Session management
     """
 
-    def __init__(self):
-        self.supabase = get_supabase()
+    @property
+    def supabase(self):
+        """Supabase client on the shared connection pool (resolved per call)"""
+        return get_supabase()
 
     async def register(self, user_data: UserRegister) -> TokenResponse:
         """
@@ -49,7 +51,7 @@ class AuthService:
         """
         try:
             # Create user in Supabase Auth
-            auth_response = self.supabase.auth.sign_up({
+            auth_response = await query_executor.run(self.supabase.auth.sign_up, {
                 "email": user_data.email,
                 "password": user_data.password,
                 "options": {
@@ -77,7 +79,7 @@ class AuthService:
             }
 
             try:
-                self.supabase.table('user_profiles').insert(profile_data).execute()
+                await execute(self.supabase.table('user_profiles').insert(profile_data))
                 logger.info(f"User profile created for user {auth_response.user.id}")
             except Exception as profile_error:
                 # Log but don't fail - the profile might be created by database trigger
@@ -132,7 +134,7 @@ class AuthService:
             HTTPException: If credentials are invalid (401)
         """
         try:
-            auth_response = self.supabase.auth.sign_in_with_password({
+            auth_response = await query_executor.run(self.supabase.auth.sign_in_with_password, {
                 "email": credentials.email,
                 "password": credentials.password
             })
@@ -182,7 +184,7 @@ class AuthService:
             HTTPException: If refresh token is invalid or expired (401)
         """
         try:
-            auth_response = self.supabase.auth.refresh_session(refresh_token)
+            auth_response = await query_executor.run(self.supabase.auth.refresh_session, refresh_token)
 
             if not auth_response.session:
                 logger.warning("Token refresh failed: No session returned")
@@ -230,7 +232,7 @@ class AuthService:
         """
         try:
             # Verify token and get user from Supabase Auth
-            user_response = self.supabase.auth.get_user(access_token)
+            user_response = await query_executor.run(self.supabase.auth.get_user, access_token)
 
             if not user_response.user:
                 logger.warning("Get current user failed: No user returned")
@@ -240,11 +242,12 @@ class AuthService:
                 )
 
             # Fetch user profile from database
-            profile_response = self.supabase.table('user_profiles') \
-                .select('*') \
-                .eq('id', user_response.user.id) \
-                .single() \
-                .execute()
+            profile_response = await execute(
+                self.supabase.table('user_profiles')
+                .select('*')
+                .eq('id', user_response.user.id)
+                .single()
+            )
 
             if not profile_response.data:
                 logger.error(f"User profile not found for user {user_response.user.id}")
@@ -288,7 +291,7 @@ class AuthService:
         """
         try:
             # Sign out from Supabase
-            self.supabase.auth.sign_out()
+            await query_executor.run(self.supabase.auth.sign_out)
             logger.info("User logged out successfully")
 
             return {"message": "Logged out successfully"}
@@ -0,0 +1,335 @@
+"""
+Autocomplete Index
+In-memory prefix index over institutions and programs for search-as-you-type
+"""
+import asyncio
+import bisect
+import heapq
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from schemas.search import AutocompleteSuggestion
+
+logger = logging.getLogger(__name__)
+
+INSTITUTION_COLUMNS = "id, name, short_name, slug, type, state, status, deleted_at, updated_at"
+PROGRAM_COLUMNS = (
+    "id, name, slug, degree_type, field_of_study, annual_intake, institution_id, "
+    "status, is_active, deleted_at, updated_at, "
+    "institution:institutions(name, slug, state)"
+)
+
+# PostgREST caps responses at 1000 rows by default
+PAGE_SIZE = 1000
+
+# Max cached prefix results per snapshot (short, broad prefixes repeat a lot)
+CACHE_SIZE = 4096
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase and collapse whitespace (same normalization as autocomplete)"""
+    return " ".join(str(text).lower().split()) if text else ""
+
+
+def _word_suffixes(text: Optional[str]) -> List[str]:
+    """
+    Index keys for a field: the full value plus every word-suffix of it
+
+    "University of Lagos" -> ["university of lagos", "of lagos", "lagos"],
+    so typing any word of a name (not just the first) finds it.
+    """
+    words = normalize(text).split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+@dataclass
+class _Snapshot:
+    """Immutable lookup structure, swapped atomically on every change"""
+
+    keys: List[str] = field(default_factory=list)
+    ids: List[str] = field(default_factory=list)
+    suggestions: Dict[str, AutocompleteSuggestion] = field(default_factory=dict)
+    types: Dict[str, str] = field(default_factory=dict)
+    names: Dict[str, str] = field(default_factory=dict)
+    # Position in popularity order (0 = most popular)
+    order: Dict[str, int] = field(default_factory=dict)
+    # Results for recent prefixes; dies with the snapshot on every update
+    cache: Dict[Tuple[str, int], List[AutocompleteSuggestion]] = field(default_factory=dict)
+
+
+class AutocompleteIndex:
+    """
+    Sorted-array prefix index for autocomplete suggestions
+
+    Every indexed term (name, short_name, field_of_study, institution_name
+    and their word-suffixes) is stored once in a sorted list, so a prefix
+    lookup is a binary search plus a scan over the matching range.
+    Suggestions are ranked by whether the name itself starts with the
+    query, then by a popularity weight (published program count for
+    institutions, annual intake for programs).
+
+    Lookups read an immutable snapshot; `apply()` updates the source rows
+    under a lock and swaps in a freshly built snapshot, so readers never
+    block and never see a half-built index.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._institutions: Dict[str, Dict[str, Any]] = {}
+        self._programs: Dict[str, Dict[str, Any]] = {}
+        self._snapshot = _Snapshot()
+        self._watermark: Optional[str] = None
+        self._loaded = False
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the initial load has completed"""
+        return self._loaded
+
+    @property
+    def size(self) -> int:
+        """Number of indexed suggestions"""
+        return len(self._snapshot.suggestions)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 10) -> Optional[List[AutocompleteSuggestion]]:
+        """
+        Prefix lookup
+
+        Args:
+            query: Raw or normalized query
+            limit: Maximum suggestions to return
+
+        Returns:
+            Suggestions (institutions first, limit split between types like
+            the Meilisearch path), or None if the index isn't loaded yet
+        """
+        if not self._loaded:
+            return None
+
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        snapshot = self._snapshot
+        cache_key = (prefix, limit)
+        cached = snapshot.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        start = bisect.bisect_left(snapshot.keys, prefix)
+        end = bisect.bisect_left(snapshot.keys, prefix + "\uffff", lo=start)
+        matched = set(snapshot.ids[start:end])
+
+        per_type_limit = limit // 2 + (limit % 2)
+        by_type: Dict[str, List[str]] = {"institution": [], "program": []}
+        for entry_id in matched:
+            by_type[snapshot.types[entry_id]].append(entry_id)
+
+        def rank(entry_id: str) -> Tuple[bool, int]:
+            # Names starting with the query first, then by popularity order
+            return (not snapshot.names[entry_id].startswith(prefix), snapshot.order[entry_id])
+
+        selected = (
+            heapq.nsmallest(per_type_limit, by_type["institution"], key=rank)
+            + heapq.nsmallest(per_type_limit, by_type["program"], key=rank)
+        )
+        results = [snapshot.suggestions[i] for i in selected][:limit]
+
+        if len(snapshot.cache) >= CACHE_SIZE:
+            snapshot.cache.clear()
+        snapshot.cache[cache_key] = results
+        return results
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def apply(
+        self,
+        institutions: Iterable[Dict[str, Any]] = (),
+        programs: Iterable[Dict[str, Any]] = ()
+    ) -> None:
+        """
+        Upsert or remove rows and rebuild the lookup snapshot
+
+        Rows that are no longer visible (not published, soft-deleted or,
+        for programs, inactive) are removed; everything else is upserted.
+
+        Args:
+            institutions: Rows from the institutions table
+            programs: Rows from the programs table (with `institution` embed)
+        """
+        with self._lock:
+            for row in institutions:
+                if row.get("status") == "published" and not row.get("deleted_at"):
+                    self._institutions[row["id"]] = row
+                else:
+                    self._institutions.pop(row["id"], None)
+
+            for row in programs:
+                visible = (
+                    row.get("status") == "published"
+                    and row.get("is_active", True)
+                    and not row.get("deleted_at")
+                )
+                if visible:
+                    self._programs[row["id"]] = row
+                else:
+                    self._programs.pop(row["id"], None)
+
+            self._snapshot = self._build()
+            self._loaded = True
+
+    def _build(self) -> _Snapshot:
+        """Build a new snapshot from the current rows (caller holds the lock)"""
+        program_counts: Dict[str, int] = {}
+        for row in self._programs.values():
+            inst_id = row.get("institution_id")
+            program_counts[inst_id] = program_counts.get(inst_id, 0) + 1
+
+        terms: List[Tuple[str, str]] = []
+        weights: Dict[str, float] = {}
+        snapshot = _Snapshot()
+
+        for inst_id, row in self._institutions.items():
+            inst_type = row.get("type") or ""
+            snapshot.suggestions[inst_id] = AutocompleteSuggestion(
+                type="institution",
+                id=inst_id,
+                name=row["name"],
+                slug=row["slug"],
+                description=f"{inst_type.replace('_', ' ').title()} - {row.get('state')}",
+                institution_state=row.get("state"),
+            )
+            snapshot.types[inst_id] = "institution"
+            snapshot.names[inst_id] = normalize(row["name"])
+            weights[inst_id] = float(program_counts.get(inst_id, 0))
+            for value in (row["name"], row.get("short_name")):
+                terms.extend((key, inst_id) for key in _word_suffixes(value))
+
+        for prog_id, row in self._programs.items():
+            # Prefer the live institution row so renames propagate to programs
+            institution = self._institutions.get(row.get("institution_id")) or row.get("institution") or {}
+            institution_name = institution.get("name")
+
+            description_parts = [p for p in (row.get("field_of_study"), institution_name) if p]
+            snapshot.suggestions[prog_id] = AutocompleteSuggestion(
+                type="program",
+                id=prog_id,
+                name=row["name"],
+                slug=row.get("slug") or "",
+                description=" - ".join(description_parts) if description_parts else None,
+                institution_name=institution_name,
+                degree_type=row.get("degree_type"),
+            )
+            snapshot.types[prog_id] = "program"
+            snapshot.names[prog_id] = normalize(row["name"])
+            weights[prog_id] = float(row.get("annual_intake") or 0)
+            for value in (row["name"], row.get("field_of_study"), institution_name):
+                terms.extend((key, prog_id) for key in _word_suffixes(value))
+
+        ranked = sorted(weights, key=lambda i: (-weights[i], len(snapshot.names[i]), snapshot.names[i]))
+        snapshot.order = {entry_id: position for position, entry_id in enumerate(ranked)}
+
+        terms = sorted(set(terms))
+        snapshot.keys = [key for key, _ in terms]
+        snapshot.ids = [entry_id for _, entry_id in terms]
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Loading from Supabase
+    # ------------------------------------------------------------------
+
+    def refresh(self, supabase) -> int:
+        """
+        Pull rows changed since the last refresh (everything on first call)
+
+        Uses the `updated_at` column as a watermark; unpublishing and soft
+        deletes bump `updated_at` too, so they are picked up and removed.
+        That needs a client that can see those rows (service role): under
+        the catalog RLS policy the anon key only returns published rows.
+
+        Args:
+            supabase: Supabase client (service role)
+
+        Returns:
+            Number of changed rows applied
+        """
+        since = self._watermark
+        institutions = self._fetch(supabase, "institutions", INSTITUTION_COLUMNS, since)
+        programs = self._fetch(supabase, "programs", PROGRAM_COLUMNS, since)
+
+        if institutions or programs or not self._loaded:
+            self.apply(institutions, programs)
+
+        stamps = [row["updated_at"] for row in institutions + programs if row.get("updated_at")]
+        if stamps:
+            self._watermark = max(stamps + ([since] if since else []))
+
+        return len(institutions) + len(programs)
+
+    @staticmethod
+    def _fetch(supabase, table: str, columns: str, since: Optional[str]) -> List[Dict[str, Any]]:
+        """Fetch all rows of a table (optionally changed since a timestamp) page by page"""
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            query = supabase.table(table).select(columns)
+            if since:
+                # gte (not gt) so rows sharing the watermark timestamp aren't missed
+                query = query.gte("updated_at", since)
+            response = query.order("id").range(offset, offset + PAGE_SIZE - 1).execute()
+            page = response.data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            offset += PAGE_SIZE
+
+    async def start(self, supabase_factory: Callable[[], Any], interval: float) -> None:
+        """
+        Load the index in the background and keep it fresh
+
+        Autocomplete keeps using Meilisearch until the first load finishes.
+
+        Args:
+            supabase_factory: Returns a Supabase client
+            interval: Seconds between incremental refreshes
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop(supabase_factory, interval))
+
+    async def stop(self) -> None:
+        """Stop the background refresh"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        self._refresh_task = None
+
+    async def _refresh_loop(self, supabase_factory: Callable[[], Any], interval: float) -> None:
+        while True:
+            started = time.perf_counter()
+            try:
+                changed = await asyncio.to_thread(self.refresh, supabase_factory())
+                if changed:
+                    logger.info(
+                        f"Autocomplete index refreshed: {changed} changed rows, "
+                        f"{self.size} suggestions in {(time.perf_counter() - started) * 1000:.0f}ms"
+                    )
+            except Exception as e:
+                logger.error(f"Failed to refresh autocomplete index: {str(e)}")
+            await asyncio.sleep(interval)
+
+
+# Singleton instance
+autocomplete_index = AutocompleteIndex()
@@ -3,7 +3,7 @@ Bookmark Service
 Business logic for user bookmarks
 """
 import logging
-from typing import List, Dict, Any, Optional, Literal
+from typing import List, Dict, Any, Optional, Literal, Tuple
 from supabase import Client
 from fastapi import HTTPException, status
 
@@ -11,17 +11,38 @@ from schemas.bookmarks import (
     BookmarkCreate,
     BookmarkUpdate,
     BookmarkResponse,
-    BookmarkWithEntity,
     BookmarkListResponse,
     BookmarkDeleteResponse,
     BookmarkBulkDeleteResponse,
     BookmarkCheckStatus,
     BookmarkCheckResponse,
 )
+from core.database import execute
+from core.cache import (
+    response_cache,
+    institution_tag,
+    program_tag,
+    PROGRAM_SNAPSHOTS,
+    INSTITUTION_SNAPSHOTS,
+)
+from core.pagination import count_method, fetch_page, sort_keys, use_cursor
 
 logger = logging.getLogger(__name__)
 
 
+def _program_snapshot_tags(program: Dict[str, Any]) -> List[str]:
+    """A program snapshot embeds its institution"""
+    institution = program.get("institution") or {}
+    tags = [program_tag(program["id"])]
+    if institution.get("id"):
+        tags.append(institution_tag(institution["id"]))
+    return tags
+
+
+def _institution_snapshot_tags(institution: Dict[str, Any]) -> List[str]:
+    return [institution_tag(institution["id"])]
+
+
 class BookmarkService:
     """Service for managing user bookmarks"""
 
@@ -36,15 +57,19 @@ class BookmarkService:
         page_size: int = 20,
         sort: str = "created_at",
         order: str = "desc",
+        paginate: str = "offset",
+        cursor: Optional[str] = None,
     ) -> BookmarkListResponse:
         """List user's bookmarks with pagination and filtering"""
         try:
+            cursor_mode = use_cursor(paginate, cursor)
+
             # Build query
             query = (
                 self.supabase.table("user_bookmarks")
                 .select(
                     "id, entity_type, entity_id, notes, created_at",
-                    count="exact"
+                    count=count_method(cursor_mode)
                 )
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
@@ -54,55 +79,35 @@ class BookmarkService:
             if entity_type and entity_type != "all":
                 query = query.eq("entity_type", entity_type)
 
-            # Get total count for pagination
-            count_result = query.execute()
-            total = count_result.count if count_result.count is not None else 0
-
-            # Apply sorting
-            query = query.order(sort, desc=(order == "desc"))
-
-            # Apply pagination
-            offset = (page - 1) * page_size
-            query = query.range(offset, offset + page_size - 1)
+            # Sort on (sort column, id) and fetch one page (rows and count in one request)
+            rows, pagination = await fetch_page(
+                query, sort_keys(sort, order == "desc"), page, page_size, cursor_mode, cursor
+            )
 
-            # Execute query
-            response = query.execute()
+            # Fetch entity details for the whole page (one query per entity type)
+            entities = await self._get_entities_details(rows)
 
-            # Fetch entity details for each bookmark
             bookmarks_with_entities = []
-            for bookmark in response.data:
-                entity_details = await self._get_entity_details(
-                    bookmark["entity_type"],
-                    bookmark["entity_id"]
-                )
-
-                bookmarks_with_entities.append(
-                    BookmarkWithEntity(
-                        id=bookmark["id"],
-                        entity_type=bookmark["entity_type"],
-                        entity_id=bookmark["entity_id"],
-                        notes=bookmark.get("notes"),
-                        created_at=bookmark["created_at"],
-                        entity=entity_details,
-                    )
-                )
-
-            # Build pagination metadata
-            total_pages = (total + page_size - 1) // page_size
-            pagination = {
-                "page": page,
-                "page_size": page_size,
-                "total": total,
-                "total_pages": total_pages,
-                "has_prev": page > 1,
-                "has_next": page < total_pages,
-            }
+            for bookmark in rows:
+                entity_details = entities.get((bookmark["entity_type"], bookmark["entity_id"]))
+
+                bookmarks_with_entities.append({
+                    "id": bookmark["id"],
+                    "entity_type": bookmark["entity_type"],
+                    "entity_id": bookmark["entity_id"],
+                    "notes": bookmark.get("notes"),
+                    "created_at": bookmark["created_at"],
+                    "entity": entity_details,
+                })
 
-            return BookmarkListResponse(
-                data=bookmarks_with_entities,
-                pagination=pagination
-            )
+            # Validate the whole page in one call (pydantic-core), not per row
+            return BookmarkListResponse.model_validate({
+                "data": bookmarks_with_entities,
+                "pagination": pagination
+            })
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error listing bookmarks: {e}")
             raise HTTPException(
@@ -128,14 +133,13 @@ class BookmarkService:
                 )
 
             # Check if bookmark already exists
-            existing = (
+            existing = await execute(
                 self.supabase.table("user_bookmarks")
                 .select("id")
                 .eq("user_id", self.user_id)
                 .eq("entity_type", bookmark_data.entity_type)
                 .eq("entity_id", bookmark_data.entity_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             if existing.data:
@@ -145,7 +149,7 @@ class BookmarkService:
                 )
 
             # Create bookmark
-            response = (
+            response = await execute(
                 self.supabase.table("user_bookmarks")
                 .insert({
                     "user_id": self.user_id,
@@ -153,7 +157,6 @@ class BookmarkService:
                     "entity_id": bookmark_data.entity_id,
                     "notes": bookmark_data.notes,
                 })
-                .execute()
             )
 
             if not response.data:
@@ -186,13 +189,12 @@ class BookmarkService:
         """Update bookmark notes"""
         try:
             # Verify bookmark exists and belongs to user
-            existing = (
+            existing = await execute(
                 self.supabase.table("user_bookmarks")
                 .select("*")
                 .eq("id", bookmark_id)
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             if not existing.data:
@@ -202,12 +204,11 @@ class BookmarkService:
                 )
 
             # Update bookmark
-            response = (
+            response = await execute(
                 self.supabase.table("user_bookmarks")
                 .update({"notes": update_data.notes})
                 .eq("id", bookmark_id)
                 .eq("user_id", self.user_id)
-                .execute()
             )
 
             if not response.data:
@@ -238,13 +239,12 @@ class BookmarkService:
         """Delete a single bookmark (soft delete)"""
         try:
             # Verify bookmark exists and belongs to user
-            existing = (
+            existing = await execute(
                 self.supabase.table("user_bookmarks")
                 .select("id")
                 .eq("id", bookmark_id)
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             if not existing.data:
@@ -255,12 +255,11 @@ class BookmarkService:
 
             # Soft delete bookmark
             from datetime import datetime, timezone
-            response = (
+            response = await execute(
                 self.supabase.table("user_bookmarks")
                 .update({"deleted_at": datetime.now(timezone.utc).isoformat()})
                 .eq("id", bookmark_id)
                 .eq("user_id", self.user_id)
-                .execute()
             )
 
             if not response.data:
@@ -289,13 +288,12 @@ class BookmarkService:
         """Delete multiple bookmarks at once"""
         try:
             # Verify all bookmarks belong to user
-            existing = (
+            existing = await execute(
                 self.supabase.table("user_bookmarks")
                 .select("id")
                 .eq("user_id", self.user_id)
                 .in_("id", bookmark_ids)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             found_ids = [item["id"] for item in existing.data]
@@ -308,12 +306,11 @@ class BookmarkService:
 
             # Soft delete bookmarks
             from datetime import datetime, timezone
-            response = (
+            response = await execute(
                 self.supabase.table("user_bookmarks")
                 .update({"deleted_at": datetime.now(timezone.utc).isoformat()})
                 .eq("user_id", self.user_id)
                 .in_("id", found_ids)
-                .execute()
             )
 
             return BookmarkBulkDeleteResponse(
@@ -337,14 +334,13 @@ class BookmarkService:
         """Check which entities are bookmarked"""
         try:
             # Query bookmarks for these entities
-            response = (
+            response = await execute(
                 self.supabase.table("user_bookmarks")
                 .select("id, entity_id")
                 .eq("user_id", self.user_id)
                 .eq("entity_type", entity_type)
                 .in_("entity_id", entity_ids)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             # Build bookmark status map
@@ -381,13 +377,12 @@ class BookmarkService:
         try:
             table = "programs" if entity_type == "program" else "institutions"
 
-            response = (
+            response = await execute(
                 self.supabase.table(table)
                 .select("id")
                 .eq("id", entity_id)
                 .eq("status", "published")
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             return len(response.data) > 0
@@ -396,58 +391,90 @@ class BookmarkService:
             logger.error(f"Error verifying entity exists: {e}")
             return False
 
-    async def _get_entity_details(
-        self, entity_type: str, entity_id: str
-    ) -> Optional[Dict[str, Any]]:
-        """Get details of a bookmarked entity"""
+    async def _get_entities_details(
+        self, bookmarks: List[Dict[str, Any]]
+    ) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+        """
+        Get details of every bookmarked entity on a page
+
+        Groups bookmarks by entity type and loads each type with one
+        `in_()` query, reusing per-entity snapshots from the response
+        cache (shared across users, invalidated by admin edits).
+
+        Args:
+            bookmarks: Bookmark rows with entity_type and entity_id
+
+        Returns:
+            {(entity_type, entity_id): details or None if not visible}
+        """
+        ids: Dict[str, List[str]] = {"program": [], "institution": []}
+        for bookmark in bookmarks:
+            ids[bookmark["entity_type"]].append(bookmark["entity_id"])
+
+        programs = await response_cache.get_many_or_load(
+            PROGRAM_SNAPSHOTS, ids["program"], self._load_programs, tags=_program_snapshot_tags
+        )
+        institutions = await response_cache.get_many_or_load(
+            INSTITUTION_SNAPSHOTS, ids["institution"], self._load_institutions, tags=_institution_snapshot_tags
+        )
+
+        details = {("program", entity_id): programs.get(entity_id) for entity_id in ids["program"]}
+        details.update(
+            {("institution", entity_id): institutions.get(entity_id) for entity_id in ids["institution"]}
+        )
+        return details
+
+    async def _load_programs(self, program_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load bookmark details for published programs (one query)"""
         try:
-            if entity_type == "program":
-                response = (
-                    self.supabase.table("programs")
-                    .select(
-                        "id, name, slug, degree_type, duration_years, "
-                        "tuition_min, tuition_max, "
-                        "institution:institution_id(id, name, slug, state)"
-                    )
-                    .eq("id", entity_id)
-                    .eq("status", "published")
-                    .is_("deleted_at", "null")
-                    .execute()
+            response = await execute(
+                self.supabase.table("programs")
+                .select(
+                    "id, name, slug, degree_type, duration_years, "
+                    "tuition_min, tuition_max, "
+                    "institution:institution_id(id, name, slug, state)"
                 )
+                .in_("id", program_ids)
+                .eq("status", "published")
+                .is_("deleted_at", "null")
+            )
 
-                if response.data:
-                    program = response.data[0]
-                    return {
-                        "id": program["id"],
-                        "name": program["name"],
-                        "slug": program["slug"],
-                        "degree_type": program.get("degree_type"),
-                        "duration_years": program.get("duration_years"),
-                        "tuition_range": {
-                            "min": program.get("tuition_min"),
-                            "max": program.get("tuition_max")
-                        },
-                        "institution": program.get("institution")
-                    }
-
-            else:  # institution
-                response = (
-                    self.supabase.table("institutions")
-                    .select(
-                        "id, name, slug, short_name, type, state, "
-                        "logo_url, program_count"
-                    )
-                    .eq("id", entity_id)
-                    .eq("status", "published")
-                    .is_("deleted_at", "null")
-                    .execute()
-                )
+            return {
+                program["id"]: {
+                    "id": program["id"],
+                    "name": program["name"],
+                    "slug": program["slug"],
+                    "degree_type": program.get("degree_type"),
+                    "duration_years": program.get("duration_years"),
+                    "tuition_range": {
+                        "min": program.get("tuition_min"),
+                        "max": program.get("tuition_max")
+                    },
+                    "institution": program.get("institution")
+                }
+                for program in response.data
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting program details: {e}")
+            return {}
 
-                if response.data:
-                    return response.data[0]
+    async def _load_institutions(self, institution_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load bookmark details for published institutions (one query)"""
+        try:
+            response = await execute(
+                self.supabase.table("institutions")
+                .select(
+                    "id, name, slug, short_name, type, state, "
+                    "logo_url, program_count"
+                )
+                .in_("id", institution_ids)
+                .eq("status", "published")
+                .is_("deleted_at", "null")
+            )
 
-            return None
+            return {institution["id"]: institution for institution in response.data}
 
         except Exception as e:
-            logger.error(f"Error getting entity details: {e}")
-            return None
+            logger.error(f"Error getting institution details: {e}")
+            return {}
@@ -0,0 +1,506 @@
+"""
+Email Queue
+Async outbound email queue: worker pool, rate limiting, batching, retries
+and idempotent sends, with pluggable delivery backends
+"""
+import asyncio
+import json
+import logging
+import random
+import smtplib
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+import resend
+from resend import exceptions as resend_errors
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Provider errors that will fail the same way on every attempt
+PERMANENT_ERRORS = (
+    resend_errors.ValidationError,
+    resend_errors.MissingRequiredFieldsError,
+    resend_errors.InvalidApiKeyError,
+    resend_errors.MissingApiKeyError,
+)
+
+
+@dataclass
+class OutboundEmail:
+    """A rendered email ready for delivery"""
+
+    to: str
+    subject: str
+    html: str
+    from_email: str
+    text: Optional[str] = None
+    reply_to: Optional[str] = None
+
+    def to_params(self) -> Dict[str, Any]:
+        """Resend `Emails.send` parameters"""
+        params = {
+            "from": self.from_email,
+            "to": [self.to],
+            "subject": self.subject,
+            "html": self.html,
+        }
+        if self.text:
+            params["text"] = self.text
+        if self.reply_to:
+            params["reply_to"] = self.reply_to
+        return params
+
+
+# ----------------------------------------------------------------------
+# Backends
+# ----------------------------------------------------------------------
+
+class ResendBackend:
+    """Delivers through the Resend API (blocking SDK, run in a thread)"""
+
+    def __init__(self, api_key: str):
+        resend.api_key = api_key
+
+    async def send(self, email: OutboundEmail) -> Dict[str, Any]:
+        return await asyncio.to_thread(resend.Emails.send, email.to_params())
+
+    async def send_batch(self, emails: List[OutboundEmail]) -> List[Dict[str, Any]]:
+        """Send up to 100 emails in one API call (all accepted or all rejected)"""
+        response = await asyncio.to_thread(resend.Batch.send, [email.to_params() for email in emails])
+        return list(response["data"])
+
+
+class FileBackend:
+    """Writes each email as a JSON file (local development and tests)"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    async def send(self, email: OutboundEmail) -> Dict[str, Any]:
+        email_id = f"file_{uuid.uuid4().hex}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{time.strftime('%Y%m%dT%H%M%S')}-{email_id}.json"
+        await asyncio.to_thread(path.write_text, json.dumps({"id": email_id, **asdict(email)}, indent=2))
+        return {"id": email_id}
+
+    async def send_batch(self, emails: List[OutboundEmail]) -> List[Dict[str, Any]]:
+        return [await self.send(email) for email in emails]
+
+
+class SMTPBackend:
+    """Delivers over plain SMTP (e.g. a local Mailpit/MailHog catcher)"""
+
+    def __init__(self, host: str, port: int, timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    async def send(self, email: OutboundEmail) -> Dict[str, Any]:
+        message = EmailMessage()
+        message["From"] = email.from_email
+        message["To"] = email.to
+        message["Subject"] = email.subject
+        message["Message-ID"] = f"<{uuid.uuid4().hex}@admitly.local>"
+        if email.reply_to:
+            message["Reply-To"] = email.reply_to
+        message.set_content(email.text or "")
+        message.add_alternative(email.html, subtype="html")
+
+        def deliver() -> None:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+                smtp.send_message(message)
+
+        await asyncio.to_thread(deliver)
+        return {"id": message["Message-ID"]}
+
+    async def send_batch(self, emails: List[OutboundEmail]) -> List[Dict[str, Any]]:
+        return [await self.send(email) for email in emails]
+
+
+def create_backend(name: str):
+    """Backend for the EMAIL_BACKEND setting (resend, file or smtp)"""
+    if name == "file":
+        return FileBackend(settings.EMAIL_FILE_DIR)
+    if name == "smtp":
+        return SMTPBackend(settings.SMTP_HOST, settings.SMTP_PORT)
+    return ResendBackend(settings.RESEND_API_KEY)
+
+
+# ----------------------------------------------------------------------
+# Idempotency
+# ----------------------------------------------------------------------
+
+class IdempotencyStore:
+    """
+    Idempotency keys shared by every worker and surviving restarts (Redis)
+
+    A key is claimed (`SET NX`) before the first send and holds a short
+    `pending_ttl`, so a worker that dies mid-send doesn't block the email
+    for a whole day. A delivered email stores its result under the key for
+    `ttl`; a failed send deletes the key so a retry can claim it.
+
+    Redis is optional: while it is unreachable claims succeed (the queue's
+    in-process keys still deduplicate within a worker) and the store is
+    bypassed for `retry_after` seconds.
+    """
+
+    PENDING = "pending"
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "admitly:email:sent",
+        ttl: int = 86400,
+        pending_ttl: int = 600,
+        retry_after: float = 30.0,
+    ):
+        self.url = url
+        self.prefix = prefix
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self.retry_after = retry_after
+
+        self._redis: Optional[redis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._unavailable_until = 0.0
+
+    def _client(self) -> Optional[redis.Redis]:
+        """Redis client bound to the running event loop (None while unavailable)"""
+        if time.monotonic() < self._unavailable_until:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._loop is not loop:
+            self._redis = redis.Redis.from_url(
+                self.url,
+                decode_responses=True,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5,
+            )
+            self._loop = loop
+        return self._redis
+
+    def _mark_unavailable(self, error: Exception) -> None:
+        logger.warning(f"Redis unavailable for email idempotency, bypassing for {self.retry_after}s: {str(error)}")
+        self._unavailable_until = time.monotonic() + self.retry_after
+
+    async def claim(self, key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Claim a key before sending
+
+        Returns:
+            (True, None) if this caller should send, otherwise (False, the
+            first send's result, or None while it is still in flight)
+        """
+        client = self._client()
+        if client is None:
+            return True, None
+        try:
+            if await client.set(f"{self.prefix}:{key}", self.PENDING, nx=True, ex=self.pending_ttl):
+                return True, None
+            previous = await client.get(f"{self.prefix}:{key}")
+        except Exception as e:
+            self._mark_unavailable(e)
+            return True, None
+        if previous is None:
+            # Released between SET and GET: claim again
+            return await self.claim(key)
+        return False, None if previous == self.PENDING else json.loads(previous)
+
+    async def complete(self, key: str, result: Dict[str, Any]) -> None:
+        """Record a delivered email's result for `ttl`"""
+        client = self._client()
+        if client is None:
+            return
+        try:
+            await client.set(f"{self.prefix}:{key}", json.dumps(result, default=str), ex=self.ttl)
+        except Exception as e:
+            self._mark_unavailable(e)
+
+    async def release(self, key: str) -> None:
+        """Forget a key whose send failed"""
+        client = self._client()
+        if client is None:
+            return
+        try:
+            await client.delete(f"{self.prefix}:{key}")
+        except Exception as e:
+            self._mark_unavailable(e)
+
+    async def close(self) -> None:
+        """Close pooled Redis connections"""
+        if self._redis is not None:
+            try:
+                await self._redis.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing Redis client: {e}")
+        self._redis = None
+        self._loop = None
+
+
+# ----------------------------------------------------------------------
+# Queue
+# ----------------------------------------------------------------------
+
+class TokenBucket:
+    """
+    Async token bucket
+
+    Allows bursts of up to `capacity` sends, refilled at `rate` per second.
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class _Job:
+    email: OutboundEmail
+    future: asyncio.Future
+    key: Optional[str] = None
+    attempt: int = 0
+    solo: bool = False  # Send on its own (after its batch was rejected)
+
+
+class EmailQueue:
+    """
+    Outbound email queue with a worker pool
+
+    `send()` enqueues an email and waits for its delivery result. A fixed
+    pool of workers drains the queue, each taking whatever is waiting (up to
+    `batch_size` emails) and delivering it with one provider call. Every
+    call first takes a token from a shared bucket sized to the provider's
+    rate limit, so bursts of alerts are spread out instead of being
+    rejected. Transient failures are retried with exponential backoff and
+    jitter (re-enqueued after the delay, so a retrying email never blocks a
+    worker). A batch rejected outright (the provider validates batches as a
+    whole) is split up, so one bad address cannot fail its neighbours.
+
+    An idempotency key makes repeated sends of the same logical email
+    (e.g. a re-run of a nightly alert job) resolve to the first delivery
+    instead of emailing the user twice. Keys are remembered in-process for
+    `idempotency_ttl` seconds (concurrent sends in one worker share a
+    delivery) and, with a `store`, claimed in Redis so repeats on other
+    workers or after a restart are skipped too. Failed sends release their
+    key.
+
+    Workers start lazily on first use (or from the lifespan hook) and are
+    bound to the running event loop.
+    """
+
+    def __init__(
+        self,
+        backend,
+        workers: int = 4,
+        rate_per_second: float = 2.0,
+        burst: int = 2,
+        max_retries: int = 3,
+        retry_base_seconds: float = 1.0,
+        idempotency_ttl: float = 86400.0,
+        max_idempotency_keys: int = 100_000,
+        batch_size: int = 100,
+        store: Optional[IdempotencyStore] = None,
+    ):
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.idempotency_ttl = idempotency_ttl
+        self.max_idempotency_keys = max_idempotency_keys
+        self.batch_size = max(1, batch_size)
+        self.store = store
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._bucket: Optional[TokenBucket] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: set = set()
+        self._sent: "OrderedDict[str, Tuple[float, asyncio.Future]]" = OrderedDict()
+
+    @property
+    def pending(self) -> int:
+        """Emails enqueued or being retried"""
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Start the worker pool on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._bucket = TokenBucket(self.rate_per_second, self.burst)
+        self._pending = set()
+        self._sent.clear()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(
+            f"Email queue started ({self.workers} workers, {self.rate_per_second}/s, "
+            f"backend {type(self.backend).__name__})"
+        )
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Wait (up to `timeout` seconds) for queued emails, then stop the workers"""
+        if self._pending:
+            await asyncio.wait(list(self._pending), timeout=timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        if self.store is not None:
+            await self.store.close()
+
+    async def send(self, email: OutboundEmail, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Enqueue an email and wait until it is delivered
+
+        Args:
+            email: Rendered email
+            idempotency_key: Identifies the logical email; repeats within
+                the TTL (on any worker, with a store) return the first
+                send's result with `duplicate: True`
+
+        Returns:
+            Backend response (contains the provider's email `id`)
+
+        Raises:
+            Exception: The last delivery error once retries are exhausted
+        """
+        if self._loop is not asyncio.get_running_loop():
+            await self.start()
+
+        if idempotency_key:
+            existing = self._lookup(idempotency_key)
+            if existing is not None:
+                logger.info(f"Skipping duplicate email {idempotency_key}")
+                return {**(await asyncio.shield(existing)), "duplicate": True}
+
+        future = asyncio.get_running_loop().create_future()
+        job = _Job(email=email, future=future, key=idempotency_key)
+        if idempotency_key:
+            self._remember(idempotency_key, future)
+            if self.store is not None:
+                claimed, previous = await self.store.claim(idempotency_key)
+                if not claimed:
+                    logger.info(f"Skipping email {idempotency_key} already sent by another worker")
+                    future.set_result({**(previous or {}), "duplicate": True})
+                    return future.result()
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        self._queue.put_nowait(job)
+        return await asyncio.shield(future)
+
+    def _lookup(self, key: str) -> Optional[asyncio.Future]:
+        entry = self._sent.get(key)
+        if entry is None:
+            return None
+        expires, future = entry
+        if expires <= time.monotonic() or (future.done() and future.exception() is not None):
+            del self._sent[key]
+            return None
+        return future
+
+    def _remember(self, key: str, future: asyncio.Future) -> None:
+        self._sent[key] = (time.monotonic() + self.idempotency_ttl, future)
+        while len(self._sent) > self.max_idempotency_keys:
+            self._sent.popitem(last=False)
+
+    async def _worker(self) -> None:
+        while True:
+            jobs = [await self._queue.get()]
+            while len(jobs) < self.batch_size and not self._queue.empty():
+                jobs.append(self._queue.get_nowait())
+            try:
+                batch = [job for job in jobs if not job.solo]
+                solo = [job for job in jobs if job.solo]
+                if batch:
+                    await self._deliver(batch)
+                for job in solo:
+                    await self._deliver([job])
+            finally:
+                for _ in jobs:
+                    self._queue.task_done()
+
+    async def _deliver(self, jobs: List[_Job]) -> None:
+        """Deliver jobs with one provider call and settle their futures"""
+        try:
+            await self._bucket.acquire()
+            if len(jobs) == 1:
+                results = [await self.backend.send(jobs[0].email)]
+            else:
+                results = await self.backend.send_batch([job.email for job in jobs])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if len(jobs) > 1 and isinstance(e, PERMANENT_ERRORS):
+                logger.warning(f"Batch of {len(jobs)} emails rejected ({e}), sending individually")
+                for job in jobs:
+                    job.solo = True
+                    self._queue.put_nowait(job)
+                return
+            for job in jobs:
+                await self._retry_or_fail(job, e)
+            return
+
+        for job, result in zip(jobs, results):
+            if not job.future.done():
+                job.future.set_result(result)
+            if job.key and self.store is not None:
+                await self.store.complete(job.key, result)
+
+    async def _retry_or_fail(self, job: _Job, error: Exception) -> None:
+        if isinstance(error, PERMANENT_ERRORS) or job.attempt >= self.max_retries:
+            logger.error(f"Failed to send email to {job.email.to} after {job.attempt + 1} attempt(s): {error}")
+            if job.key:
+                self._sent.pop(job.key, None)
+                if self.store is not None:
+                    await self.store.release(job.key)
+            if not job.future.done():
+                job.future.set_exception(error)
+            return
+
+        delay = self.retry_base_seconds * (2 ** job.attempt) * (1 + random.random())
+        job.attempt += 1
+        logger.warning(f"Email to {job.email.to} failed ({error}), retry {job.attempt} in {delay:.1f}s")
+        self._loop.call_later(delay, self._queue.put_nowait, job)
+
+
+# Singleton instance
+email_queue = EmailQueue(
+    create_backend(settings.EMAIL_BACKEND),
+    workers=settings.EMAIL_QUEUE_WORKERS,
+    rate_per_second=settings.EMAIL_RATE_PER_SECOND,
+    burst=settings.EMAIL_RATE_BURST,
+    max_retries=settings.EMAIL_MAX_RETRIES,
+    retry_base_seconds=settings.EMAIL_RETRY_BASE_SECONDS,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    store=IdempotencyStore(settings.REDIS_URL),
+)
@@ -0,0 +1,305 @@
+"""
+Email Templates
+Precompiled email templates: static markup is split out once, rendering
+only substitutes (and HTML-escapes) the per-recipient fields
+"""
+import html
+import re
+from typing import Any, Dict, List
+
+# {{ field }} placeholders
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Markup(str):
+    """Trusted HTML that is inserted without escaping (e.g. pre-rendered fragments)"""
+
+
+class Template:
+    """
+    A string template compiled into literal chunks and field names
+
+    Rendering is a single join over the precomputed chunks, with no
+    parsing or string building beyond the substituted values.
+    """
+
+    def __init__(self, source: str, escape: bool = False):
+        parts = _PLACEHOLDER.split(source)
+        self.source = source
+        self.escape = escape
+        self._literals: List[str] = parts[0::2]
+        self._fields: List[str] = parts[1::2]
+
+    @property
+    def fields(self) -> List[str]:
+        """Placeholder names, in order of appearance"""
+        return list(self._fields)
+
+    def partial(self, **values: Any) -> "Template":
+        """Bake in values that are the same for every recipient"""
+        chunks = [self._literals[0]]
+        for field, literal in zip(self._fields, self._literals[1:]):
+            chunks.append(self._format(values[field]) if field in values else f"{{{{{field}}}}}")
+            chunks.append(literal)
+        return Template("".join(chunks), escape=self.escape)
+
+    def render(self, **values: Any) -> str:
+        """Substitute every placeholder (KeyError if one is missing)"""
+        chunks = [self._literals[0]]
+        for field, literal in zip(self._fields, self._literals[1:]):
+            chunks.append(self._format(values[field]))
+            chunks.append(literal)
+        return "".join(chunks)
+
+    def _format(self, value: Any) -> str:
+        if self.escape and not isinstance(value, Markup):
+            return html.escape(str(value))
+        return str(value)
+
+
+class EmailTemplate:
+    """Subject, HTML and plain-text templates for one kind of email"""
+
+    def __init__(self, subject: str, html_body: str, text: str):
+        self.subject = Template(subject)
+        self.html = Template(html_body, escape=True)
+        self.text = Template(text)
+
+    def partial(self, **values: Any) -> "EmailTemplate":
+        """Bake recipient-independent values into all three parts"""
+        compiled = EmailTemplate.__new__(EmailTemplate)
+        compiled.subject = self.subject.partial(**{k: v for k, v in values.items() if k in self.subject.fields})
+        compiled.html = self.html.partial(**{k: v for k, v in values.items() if k in self.html.fields})
+        compiled.text = self.text.partial(**{k: v for k, v in values.items() if k in self.text.fields})
+        return compiled
+
+    def render(self, **values: Any) -> Dict[str, str]:
+        """Render {"subject", "html", "text"} for one recipient"""
+        return {
+            "subject": self.subject.render(**values),
+            "html": self.html.render(**values),
+            "text": self.text.render(**values),
+        }
+
+
+FOOTER_HTML = """
+            <div style="background: #f9fafb; padding: 20px; text-align: center; border-radius: 0 0 8px 8px; border: 1px solid #e5e7eb; border-top: none;">
+                <p style="font-size: 12px; color: #9ca3af; margin: 5px 0;">
+                    Admitly - Nigeria's Premier Educational Data Platform
+                </p>
+                <p style="font-size: 12px; color: #9ca3af; margin: 5px 0;">
+                    <a href="https://admitly.com.ng" style="color: #3b82f6; text-decoration: none;">admitly.com.ng</a> |
+                    <a href="mailto:{{support_email}}" style="color: #3b82f6; text-decoration: none;">{{support_email}}</a>
+                </p>
+            </div>"""
+
+HEAD_HTML = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        </head>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">"""
+
+SIGNATURE_HTML = """
+                <p style="font-size: 14px; color: #6b7280; margin-top: 20px;">
+                    Best regards,<br>
+                    <strong>The Admitly Team</strong>
+                </p>"""
+
+
+# ----------------------------------------------------------------------
+# Saved search notification
+# ----------------------------------------------------------------------
+
+SAVED_SEARCH_PREVIEW_ITEM = Template("""
+            <div style="margin: 10px 0; padding: 10px; border-left: 3px solid #3b82f6; background: #f9fafb;">
+                <strong style="color: #1f2937;">{{name}}</strong><br>
+                <span style="color: #6b7280;">{{institution}}</span><br>
+                <span style="color: #6b7280; font-size: 14px;">📍 {{state}}</span>
+            </div>
+            """, escape=True)
+
+SAVED_SEARCH_MORE = Template(
+    '<p style="color: #6b7280; font-size: 14px; margin-top: 15px;">...and {{count}} more</p>'
+)
+
+SAVED_SEARCH_NOTIFICATION = EmailTemplate(
+    subject="🎓 {{new_results_count}} new program(s) found for '{{search_name}}'",
+    html_body=HEAD_HTML + """
+            <div style="background: linear-gradient(135deg, #3b82f6 0%, #2563eb 100%); padding: 30px; text-align: center; border-radius: 8px 8px 0 0;">
+                <h1 style="color: white; margin: 0; font-size: 24px;">New Programs Found!</h1>
+            </div>
+
+            <div style="background: white; padding: 30px; border: 1px solid #e5e7eb; border-top: none;">
+                <p style="font-size: 16px; margin-bottom: 20px;">Hi {{user_name}},</p>
+
+                <p style="font-size: 16px; margin-bottom: 20px;">
+                    Great news! We found <strong>{{new_results_count}} new program(s)</strong> matching your saved search
+                    "<strong>{{search_name}}</strong>" (query: "{{search_query}}").
+                </p>
+
+                <h3 style="color: #1f2937; margin-top: 30px; margin-bottom: 15px;">Preview of New Programs:</h3>
+                {{preview_html}}
+
+                {{more_html}}
+
+                <div style="text-align: center; margin-top: 30px;">
+                    <a href="{{search_url}}"
+                       style="background: #3b82f6; color: white; padding: 12px 30px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: bold;">
+                        View All Results
+                    </a>
+                </div>
+
+                <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 30px 0;">
+
+                <p style="font-size: 14px; color: #6b7280; margin-bottom: 10px;">
+                    You're receiving this email because you have notifications enabled for this saved search.
+                    You can manage your notification preferences in your
+                    <a href="https://admitly.com.ng/settings/preferences" style="color: #3b82f6;">account settings</a>.
+                </p>
+""" + SIGNATURE_HTML + """
+            </div>
+""" + FOOTER_HTML + """
+        </body>
+        </html>
+        """,
+    text="""
+Hi {{user_name}},
+
+Great news! We found {{new_results_count}} new program(s) matching your saved search "{{search_name}}" (query: "{{search_query}}").
+
+Preview of New Programs:
+{{preview_text}}{{more_text}}
+
+View all results: {{search_url}}
+
+You can manage your notification preferences at https://admitly.com.ng/settings/preferences
+
+Best regards,
+The Admitly Team""",
+)
+
+
+# ----------------------------------------------------------------------
+# Deadline alert (one compiled variant per urgency level)
+# ----------------------------------------------------------------------
+
+DEADLINE_APPLY_BUTTON = Template(
+    '<div style="text-align: center; margin-top: 30px;"><a href="{{application_url}}" '
+    'style="background: #3b82f6; color: white; padding: 12px 30px; text-decoration: none; '
+    'border-radius: 6px; display: inline-block; font-weight: bold;">Apply Now</a></div>',
+    escape=True,
+)
+
+_DEADLINE_ALERT = EmailTemplate(
+    subject="{{urgency}}: {{program_name}} deadline in {{days_remaining}} day(s)",
+    html_body=HEAD_HTML + """
+            <div style="background: {{header_color}}; padding: 30px; text-align: center; border-radius: 8px 8px 0 0;">
+                <h1 style="color: white; margin: 0; font-size: 24px;">Application Deadline Reminder</h1>
+            </div>
+
+            <div style="background: white; padding: 30px; border: 1px solid #e5e7eb; border-top: none;">
+                <p style="font-size: 16px; margin-bottom: 20px;">Hi {{user_name}},</p>
+
+                <div style="background: {{banner_background}}; padding: 20px; border-radius: 6px; margin: 20px 0;">
+                    <p style="font-size: 18px; font-weight: bold; color: {{banner_color}}; margin: 0;">
+                        ⏰ Only {{days_remaining}} day(s) remaining!
+                    </p>
+                </div>
+
+                <p style="font-size: 16px; margin-bottom: 10px;">
+                    The application deadline for <strong>{{program_name}}</strong> at <strong>{{institution_name}}</strong>
+                    is approaching fast.
+                </p>
+
+                <p style="font-size: 16px; margin-bottom: 20px;">
+                    <strong>Deadline:</strong> {{deadline_formatted}}
+                </p>
+
+                {{apply_button}}
+
+                <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 30px 0;">
+
+                <p style="font-size: 14px; color: #6b7280; margin-bottom: 10px;">
+                    Don't miss this opportunity! Make sure to submit your application before the deadline.
+                </p>
+""" + SIGNATURE_HTML + """
+            </div>
+""" + FOOTER_HTML + """
+        </body>
+        </html>
+        """,
+    text="""
+Hi {{user_name}},
+
+{{urgency}}: The application deadline for {{program_name}} at {{institution_name}} is approaching fast!
+
+Only {{days_remaining}} day(s) remaining until the deadline on {{deadline_formatted}}.
+
+{{apply_line}}
+
+Best regards,
+The Admitly Team
+""",
+)
+
+# Keyed by `urgent` (3 days or less)
+DEADLINE_ALERTS = {
+    True: _DEADLINE_ALERT.partial(
+        urgency="🔴 URGENT", header_color="#dc2626", banner_background="#fee2e2", banner_color="#991b1b"
+    ),
+    False: _DEADLINE_ALERT.partial(
+        urgency="⚠️ REMINDER", header_color="#f59e0b", banner_background="#fef3c7", banner_color="#92400e"
+    ),
+}
+
+
+# ----------------------------------------------------------------------
+# Account verification
+# ----------------------------------------------------------------------
+
+ACCOUNT_VERIFICATION = EmailTemplate(
+    subject="Verify your Admitly account",
+    html_body=HEAD_HTML + """
+            <div style="background: linear-gradient(135deg, #3b82f6 0%, #2563eb 100%); padding: 30px; text-align: center; border-radius: 8px 8px 0 0;">
+                <h1 style="color: white; margin: 0; font-size: 24px;">Welcome to Admitly!</h1>
+            </div>
+
+            <div style="background: white; padding: 30px; border: 1px solid #e5e7eb; border-top: none;">
+                <p style="font-size: 16px; margin-bottom: 20px;">Hi {{user_name}},</p>
+
+                <p style="font-size: 16px; margin-bottom: 20px;">
+                    Thank you for signing up for Admitly! To complete your registration, please verify your email address.
+                </p>
+
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="{{verification_url}}"
+                       style="background: #3b82f6; color: white; padding: 12px 30px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: bold;">
+                        Verify Email Address
+                    </a>
+                </div>
+
+                <p style="font-size: 14px; color: #6b7280; margin-top: 20px;">
+                    If you didn't create an account with Admitly, please ignore this email.
+                </p>
+""" + SIGNATURE_HTML + """
+            </div>
+""" + FOOTER_HTML + """
+        </body>
+        </html>
+        """,
+    text="""
+Hi {{user_name}},
+
+Thank you for signing up for Admitly! To complete your registration, please verify your email address by clicking the link below:
+
+{{verification_url}}
+
+If you didn't create an account with Admitly, please ignore this email.
+
+Best regards,
+The Admitly Team
+""",
+)
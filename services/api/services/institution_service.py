@@ -7,16 +7,51 @@ from typing import Dict, List, Optional
 from fastapi import HTTPException, status
 from supabase import Client
 
+from core.database import execute
+from core.cache import (
+    response_cache,
+    catalog_tags,
+    program_tags,
+    INSTITUTIONS_LIST,
+    INSTITUTION_DETAIL,
+    INSTITUTION_PROGRAMS,
+)
+from core.fieldsets import CARD, DETAIL, Fieldsets
+from core.pagination import NAME_ORDER, count_method, fetch_page, use_cursor
+
 from schemas.institutions import (
     InstitutionBase,
+    InstitutionCard,
+    InstitutionCardListResponse,
     InstitutionResponse,
     InstitutionFilters,
-    PaginationMetadata,
     InstitutionListResponse,
+    InstitutionSparseListResponse,
 )
+from schemas.programs import ProgramBase, ProgramCard
+from services.program_service import INSTITUTION_EMBED_FIELDS, PROGRAM_ALWAYS_INCLUDED
 
 logger = logging.getLogger(__name__)
 
+# `fields=` presets: the list model (default) and the slim card model.
+# program_count is computed by a second query, only when requested.
+INSTITUTION_FIELDSETS = Fieldsets({
+    CARD: tuple(InstitutionCard.model_fields),
+    DETAIL: tuple(InstitutionBase.model_fields),
+})
+INSTITUTION_LIST_MODELS = {CARD: InstitutionCardListResponse, DETAIL: InstitutionListResponse}
+
+# An institution's programs: full rows by default, or the program presets
+# minus the institution fields (the caller already has the institution)
+INSTITUTION_PROGRAM_FIELDSETS = Fieldsets(
+    {
+        CARD: [field for field in ProgramCard.model_fields if field not in INSTITUTION_EMBED_FIELDS],
+        DETAIL: [field for field in ProgramBase.model_fields if field not in INSTITUTION_EMBED_FIELDS],
+    },
+    default=None,
+    always=PROGRAM_ALWAYS_INCLUDED,
+)
+
 
 class InstitutionService:
     """Service for institution operations"""
@@ -33,13 +68,32 @@ class InstitutionService:
 
         Returns:
             InstitutionListResponse with data and pagination metadata
+            (InstitutionCardListResponse for `fields=card`,
+            InstitutionSparseListResponse for an explicit field list)
 
         Raises:
-            HTTPException: On database errors
+            HTTPException: 400 for unknown fields, 500 on database errors
         """
+        fieldset = INSTITUTION_FIELDSETS.resolve(filters.fields)
+        filters = filters.model_copy(update={"fields": fieldset.key})
+        return await response_cache.get_or_load(
+            INSTITUTIONS_LIST,
+            filters,
+            lambda: self._query_list_institutions(filters),
+            model=INSTITUTION_LIST_MODELS.get(fieldset.preset, InstitutionSparseListResponse),
+            tags=catalog_tags,
+        )
+
+    async def _query_list_institutions(self, filters: InstitutionFilters) -> InstitutionListResponse:
+        """Uncached `list_institutions` (database query)"""
         try:
-            # Start query
-            query = self.supabase.table('institutions').select('*', count='exact')
+            # Select only the requested columns (cursor mode settles for the
+            # planner's row estimate)
+            fieldset = INSTITUTION_FIELDSETS.resolve(filters.fields)
+            cursor_mode = use_cursor(filters.paginate, filters.cursor)
+            query = self.supabase.table('institutions').select(
+                fieldset.columns(exclude=('program_count',)), count=count_method(cursor_mode)
+            )
 
             # Apply status filters (only published, non-deleted)
             query = query.eq('status', 'published')
@@ -66,45 +120,28 @@ class InstitutionService:
             if filters.verified is not None:
                 query = query.eq('verified', filters.verified)
 
-            # Order by name
-            query = query.order('name', desc=False)
-
-            # Apply pagination
-            offset = (filters.page - 1) * filters.page_size
-            query = query.range(offset, offset + filters.page_size - 1)
-
-            # Execute query
-            response = query.execute()
-
-            # Calculate pagination metadata
-            total = response.count if response.count is not None else 0
-            total_pages = (total + filters.page_size - 1) // filters.page_size if total > 0 else 0
-
-            pagination = PaginationMetadata(
-                page=filters.page,
-                page_size=filters.page_size,
-                total=total,
-                total_pages=total_pages,
-                has_prev=filters.page > 1,
-                has_next=filters.page < total_pages
+            # Order by name and fetch one page (rows and count in one request)
+            rows, pagination = await fetch_page(
+                query, NAME_ORDER, filters.page, filters.page_size, cursor_mode, filters.cursor
             )
 
             # OPTIMIZATION: Fetch program counts for ALL institutions in single query
             # This prevents N+1 query problem (was: 1 institutions query + N program count queries)
             # Now: 1 institutions query + 1 aggregated program counts query
-            institution_ids = [item['id'] for item in response.data]
+            # (and none when the fieldset leaves program_count out)
+            with_program_count = 'program_count' in fieldset.fields
+            institution_ids = [item['id'] for item in rows] if with_program_count else []
 
             # Get program counts for all institutions at once
             program_counts_dict = {}
             if institution_ids:
                 # Query all programs for these institutions
-                programs_response = (
+                programs_response = await execute(
                     self.supabase.table('programs')
                     .select('institution_id')
                     .in_('institution_id', institution_ids)
                     .eq('status', 'published')
                     .is_('deleted_at', 'null')
-                    .execute()
                 )
 
                 # Count programs per institution in Python (O(n) operation, very fast)
@@ -112,17 +149,17 @@ class InstitutionService:
                     inst_id = program['institution_id']
                     program_counts_dict[inst_id] = program_counts_dict.get(inst_id, 0) + 1
 
-            # Parse data and add program_count from our pre-computed dictionary
-            institutions = []
-            for item in response.data:
-                item['program_count'] = program_counts_dict.get(item['id'], 0)
-                institutions.append(InstitutionBase(**item))
+            # Add program_count from our pre-computed dictionary
+            if with_program_count:
+                for item in rows:
+                    item['program_count'] = program_counts_dict.get(item['id'], 0)
 
-            return InstitutionListResponse(
-                data=institutions,
-                pagination=pagination
-            )
+            # Validate the whole page in one call (pydantic-core), not per row
+            list_model = INSTITUTION_LIST_MODELS.get(fieldset.preset, InstitutionSparseListResponse)
+            return list_model.model_validate({"data": rows, "pagination": pagination})
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error listing institutions: {str(e)}")
             raise HTTPException(
@@ -143,15 +180,24 @@ class InstitutionService:
         Raises:
             HTTPException: 404 if not found, 500 on database errors
         """
+        return await response_cache.get_or_load(
+            INSTITUTION_DETAIL,
+            {"slug": slug},
+            lambda: self._query_get_by_slug(slug),
+            model=InstitutionResponse,
+            tags=catalog_tags,
+        )
+
+    async def _query_get_by_slug(self, slug: str) -> InstitutionResponse:
+        """Uncached `get_by_slug` (database query)"""
         try:
             # Query by slug with status filters
-            response = (
+            response = await execute(
                 self.supabase.table('institutions')
                 .select('*')
                 .eq('slug', slug)
                 .eq('status', 'published')
                 .is_('deleted_at', 'null')
-                .execute()
             )
 
             # response.data will be [] if no match, or [institution_dict] if match
@@ -163,14 +209,13 @@ class InstitutionService:
 
             # Add program_count (optimized: use count='exact' for single query)
             institution_data = response.data[0]  # Get first (and only) item from list
-            program_count_response = (
+            program_count_response = await execute(
                 self.supabase.table('programs')
                 .select('*', count='exact')
                 .eq('institution_id', institution_data['id'])
                 .eq('status', 'published')
                 .is_('deleted_at', 'null')
                 .limit(0)  # We only need the count, not the data
-                .execute()
             )
             institution_data['program_count'] = program_count_response.count or 0
 
@@ -200,15 +245,24 @@ class InstitutionService:
         Raises:
             HTTPException: 404 if not found, 500 on database errors
         """
+        return await response_cache.get_or_load(
+            INSTITUTION_DETAIL,
+            {"id": institution_id},
+            lambda: self._query_get_by_id(institution_id),
+            model=InstitutionResponse,
+            tags=catalog_tags,
+        )
+
+    async def _query_get_by_id(self, institution_id: str) -> InstitutionResponse:
+        """Uncached `get_by_id` (database query)"""
         try:
             # Query by id with status filters
-            response = (
+            response = await execute(
                 self.supabase.table('institutions')
                 .select('*')
                 .eq('id', institution_id)
                 .eq('status', 'published')
                 .is_('deleted_at', 'null')
-                .execute()
             )
 
             # response.data will be [] if no match, or [institution_dict] if match
@@ -220,14 +274,13 @@ class InstitutionService:
 
             # Add program_count (optimized: use count='exact' for single query)
             institution_data = response.data[0]  # Get first (and only) item from list
-            program_count_response = (
+            program_count_response = await execute(
                 self.supabase.table('programs')
                 .select('*', count='exact')
                 .eq('institution_id', institution_data['id'])
                 .eq('status', 'published')
                 .is_('deleted_at', 'null')
                 .limit(0)  # We only need the count, not the data
-                .execute()
             )
             institution_data['program_count'] = program_count_response.count or 0
 
@@ -246,31 +299,60 @@ class InstitutionService:
         self,
         slug: str,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        paginate: str = "offset",
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None
     ) -> Dict:
         """
         Get programs for an institution
 
         Args:
             slug: Institution slug
-            page: Page number
+            page: Page number (offset mode)
             page_size: Items per page
+            paginate: "offset" or "cursor"
+            cursor: Cursor from a previous page (implies cursor mode)
+            fields: Fieldset preset (card, detail) or comma-separated
+                fields (default: full program rows)
 
         Returns:
             Dict with programs data and pagination metadata
 
         Raises:
-            HTTPException: 404 if institution not found, 500 on database errors
+            HTTPException: 400 for unknown fields, 404 if institution not
+                found, 500 on database errors
         """
+        fieldset = INSTITUTION_PROGRAM_FIELDSETS.resolve(fields)
+        fields = fieldset.key if fieldset else None
+        return await response_cache.get_or_load(
+            INSTITUTION_PROGRAMS,
+            {
+                "slug": slug, "page": page, "page_size": page_size,
+                "paginate": paginate, "cursor": cursor, "fields": fields,
+            },
+            lambda: self._query_get_programs(slug, page, page_size, paginate, cursor, fields),
+            tags=program_tags,
+        )
+
+    async def _query_get_programs(
+        self,
+        slug: str,
+        page: int = 1,
+        page_size: int = 20,
+        paginate: str = "offset",
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> Dict:
+        """Uncached `get_programs` (database query)"""
         try:
             # First verify institution exists
-            institution_response = (
+            institution_response = await execute(
                 self.supabase.table('institutions')
                 .select('id')
                 .eq('slug', slug)
                 .eq('status', 'published')
                 .is_('deleted_at', 'null')
-                .execute()
             )
 
             # institution_response.data will be [] if no match, or [institution_dict] if match
@@ -282,35 +364,20 @@ class InstitutionService:
 
             institution_id = institution_response.data[0]['id']  # Get first (and only) item from list
 
-            # Query programs
-            query = self.supabase.table('programs').select('*', count='exact')
+            # Query programs (the requested columns only, if any)
+            fieldset = INSTITUTION_PROGRAM_FIELDSETS.resolve(fields)
+            cursor_mode = use_cursor(paginate, cursor)
+            query = self.supabase.table('programs').select(
+                fieldset.columns() if fieldset else '*', count=count_method(cursor_mode)
+            )
             query = query.eq('institution_id', institution_id)
             query = query.eq('status', 'published')
             query = query.is_('deleted_at', 'null')
-            query = query.order('name', desc=False)
-
-            # Apply pagination
-            offset = (page - 1) * page_size
-            query = query.range(offset, offset + page_size - 1)
-
-            # Execute query
-            response = query.execute()
-
-            # Calculate pagination
-            total = response.count if response.count is not None else 0
-            total_pages = (total + page_size - 1) // page_size if total > 0 else 0
-
-            return {
-                "data": response.data,
-                "pagination": {
-                    "page": page,
-                    "page_size": page_size,
-                    "total": total,
-                    "total_pages": total_pages,
-                    "has_prev": page > 1,
-                    "has_next": page < total_pages
-                }
-            }
+
+            # Order by name and fetch one page
+            rows, pagination = await fetch_page(query, NAME_ORDER, page, page_size, cursor_mode, cursor)
+
+            return {"data": rows, "pagination": pagination}
 
         except HTTPException:
             raise
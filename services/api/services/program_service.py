@@ -7,16 +7,44 @@ from typing import Dict, List, Optional
 from fastapi import HTTPException, status
 from supabase import Client
 
+from core.database import execute
+from core.cache import response_cache, catalog_tags, program_tags, PROGRAMS_LIST, PROGRAM_DETAIL
+from core.fieldsets import ALWAYS_INCLUDED, CARD, DETAIL, Fieldsets
+from core.pagination import NAME_ORDER, count_method, fetch_page, use_cursor
+
 from schemas.programs import (
     ProgramBase,
+    ProgramCard,
+    ProgramCardListResponse,
     ProgramResponse,
     ProgramFilters,
-    PaginationMetadata,
     ProgramListResponse,
+    ProgramSparseListResponse,
 )
 
 logger = logging.getLogger(__name__)
 
+# Program fields read from the embedded institution (field -> institutions column)
+INSTITUTION_EMBED_FIELDS = {
+    'institution_name': 'name',
+    'institution_slug': 'slug',
+    'institution_state': 'state',
+}
+
+# Every program fieldset keeps institution_id, so cached pages are tagged
+# with (and invalidated by) the institutions they show
+PROGRAM_ALWAYS_INCLUDED = (*ALWAYS_INCLUDED, 'institution_id')
+
+# `fields=` presets: the list model (default) and the slim card model
+PROGRAM_FIELDSETS = Fieldsets(
+    {
+        CARD: tuple(ProgramCard.model_fields),
+        DETAIL: tuple(ProgramBase.model_fields),
+    },
+    always=PROGRAM_ALWAYS_INCLUDED,
+)
+PROGRAM_LIST_MODELS = {CARD: ProgramCardListResponse, DETAIL: ProgramListResponse}
+
 
 class ProgramService:
     """Service for program operations"""
@@ -33,26 +61,40 @@ class ProgramService:
 
         Returns:
             ProgramListResponse with data and pagination metadata
+            (ProgramCardListResponse for `fields=card`,
+            ProgramSparseListResponse for an explicit field list)
 
         Raises:
-            HTTPException: On database errors
+            HTTPException: 400 for unknown fields, 500 on database errors
         """
+        fieldset = PROGRAM_FIELDSETS.resolve(filters.fields)
+        filters = filters.model_copy(update={"fields": fieldset.key})
+        return await response_cache.get_or_load(
+            PROGRAMS_LIST,
+            filters,
+            lambda: self._query_list_programs(filters),
+            model=PROGRAM_LIST_MODELS.get(fieldset.preset, ProgramSparseListResponse),
+            tags=program_tags,
+        )
+
+    async def _query_list_programs(self, filters: ProgramFilters) -> ProgramListResponse:
+        """Uncached `list_programs` (database query)"""
         try:
-            # Start query - join with institutions to get institution data
-            query = (
-                self.supabase.table('programs')
-                .select(
-                    '''
-                    *,
-                    institution:institutions (
-                        name,
-                        slug,
-                        state
-                    )
-                    ''',
-                    count='exact'
-                )
-            )
+            fieldset = PROGRAM_FIELDSETS.resolve(filters.fields)
+            embedded = [field for field in fieldset.fields if field in INSTITUTION_EMBED_FIELDS]
+
+            # Select only the requested columns. Join with institutions when
+            # institution fields are requested or filtered on; filtering on
+            # the institution's state needs an inner join so PostgREST drops
+            # non-matching programs (not just the embed).
+            has_state_filter = bool(filters.state)
+            cursor_mode = use_cursor(filters.paginate, filters.cursor)
+            columns = fieldset.columns(exclude=INSTITUTION_EMBED_FIELDS)
+            if embedded or has_state_filter:
+                institution_join = 'institutions!inner' if has_state_filter else 'institutions'
+                institution_columns = [INSTITUTION_EMBED_FIELDS[field] for field in embedded] or ['state']
+                columns += f",institution:{institution_join}({','.join(institution_columns)})"
+            query = self.supabase.table('programs').select(columns, count=count_method(cursor_mode))
 
             # Apply status filters (only published, non-deleted, active programs)
             query = query.eq('status', 'published')
@@ -69,11 +111,10 @@ class ProgramService:
                     f'specialization.ilike.{search_pattern}'
                 )
 
-            # Apply state filter (from institution)
-            if filters.state and len(filters.state) > 0:
-                # Note: This requires institutions table to be joined
-                # For now, we'll filter in Python after fetching
-                pass
+            # Apply state filter on the joined institution (in SQL, so
+            # pagination and the total count are correct)
+            if has_state_filter:
+                query = query.in_('institution.state', filters.state)
 
             # Apply degree_type filter
             if filters.degree_type and len(filters.degree_type) > 0:
@@ -87,57 +128,23 @@ class ProgramService:
             if filters.mode and len(filters.mode) > 0:
                 query = query.in_('mode', filters.mode)
 
-            # Order by name
-            query = query.order('name', desc=False)
-
-            # Apply pagination
-            offset = (filters.page - 1) * filters.page_size
-            query = query.range(offset, offset + filters.page_size - 1)
-
-            # Execute query
-            response = query.execute()
-
-            # Transform data to include institution fields
-            programs_data = []
-            for item in response.data:
-                institution_data = item.get('institution', {})
-                program_dict = {
-                    **item,
-                    'institution_name': institution_data.get('name', ''),
-                    'institution_slug': institution_data.get('slug', ''),
-                    'institution_state': institution_data.get('state', ''),
-                }
-                # Remove nested institution object
-                program_dict.pop('institution', None)
-
-                # Apply state filter in Python (since we couldn't do it in SQL)
-                if filters.state and len(filters.state) > 0:
-                    if program_dict['institution_state'] not in filters.state:
-                        continue
-
-                programs_data.append(program_dict)
-
-            # Calculate pagination metadata
-            total = response.count if response.count is not None else 0
-            total_pages = (total + filters.page_size - 1) // filters.page_size if total > 0 else 0
-
-            pagination = PaginationMetadata(
-                page=filters.page,
-                page_size=filters.page_size,
-                total=total,
-                total_pages=total_pages,
-                has_prev=filters.page > 1,
-                has_next=filters.page < total_pages
+            # Order by name and fetch one page (rows and count in one request)
+            rows, pagination = await fetch_page(
+                query, NAME_ORDER, filters.page, filters.page_size, cursor_mode, filters.cursor
             )
 
-            # Parse data
-            programs = [ProgramBase(**item) for item in programs_data]
+            # Flatten the requested institution fields (and drop the nested object)
+            for item in rows:
+                institution_data = item.pop('institution', None) or {}
+                for field in embedded:
+                    item[field] = institution_data.get(INSTITUTION_EMBED_FIELDS[field], '')
 
-            return ProgramListResponse(
-                data=programs,
-                pagination=pagination
-            )
+            # Validate the whole page in one call (pydantic-core), not per row
+            list_model = PROGRAM_LIST_MODELS.get(fieldset.preset, ProgramSparseListResponse)
+            return list_model.model_validate({"data": rows, "pagination": pagination})
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error listing programs: {str(e)}")
             raise HTTPException(
@@ -158,9 +165,19 @@ class ProgramService:
         Raises:
             HTTPException: 404 if not found, 500 on database errors
         """
+        return await response_cache.get_or_load(
+            PROGRAM_DETAIL,
+            {"id": program_id},
+            lambda: self._query_get_by_id(program_id),
+            model=ProgramResponse,
+            tags=catalog_tags,
+        )
+
+    async def _query_get_by_id(self, program_id: str) -> ProgramResponse:
+        """Uncached `get_by_id` (database query)"""
         try:
             # Query by ID with status filters, join with institution
-            response = (
+            response = await execute(
                 self.supabase.table('programs')
                 .select(
                     '''
@@ -175,7 +192,6 @@ class ProgramService:
                 .eq('id', program_id)
                 .eq('status', 'published')
                 .is_('deleted_at', 'null')
-                .execute()
             )
 
             # response.data will be [] if no match, or [program_dict] if match
@@ -0,0 +1,433 @@
+"""
+Saved Search Matcher
+Reverse matching of changed programs against saved-search predicates
+"""
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import product
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from core.database import query_executor
+from services.search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+# Program attributes a query is matched against (the programs index's searchable attributes)
+SEARCHABLE_FIELDS = ("name", "field_of_study", "specialization", "institution_name", "description")
+
+# (predicate attribute, document field) of the any-of list filters
+FILTER_FIELDS = (
+    ("degree_type", "degree_type"),
+    ("field_of_study", "field_of_study"),
+    ("mode", "mode"),
+    ("state", "institution_state"),
+)
+
+SAVED_SEARCH_COLUMNS = "id, query, filters, notify_on_new_results, created_at, updated_at, last_notified_at, deleted_at"
+
+# PostgREST caps responses at 1000 rows by default
+PAGE_SIZE = 1000
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased words of a query or document field"""
+    return _WORD.findall(text.lower()) if text else []
+
+
+def program_document(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Search document for a programs row
+
+    Mirrors the documents synced to the Meilisearch programs index, so a
+    predicate sees the same attributes as the search it was saved from.
+
+    Args:
+        row: programs row with `institution:institutions(name, state)` embedded
+
+    Returns:
+        Document dict
+    """
+    institution = row.get("institution") or {}
+    return {
+        **row,
+        "institution_name": institution.get("name"),
+        "institution_state": institution.get("state"),
+        "tuition_annual": row.get("tuition_annual"),
+        "cutoff_score": row.get("cutoff_score"),
+    }
+
+
+@dataclass(frozen=True)
+class SavedSearchPredicate:
+    """
+    A saved search compiled for matching single documents
+
+    Mirrors the Meilisearch program search: published and active programs,
+    any-of per list filter, inclusive numeric ranges (a missing value never
+    matches a range), and every query word present in a searchable field
+    (the last word as a prefix, as in search-as-you-type). Typo tolerance
+    is not reproduced, so matching errs on the side of fewer emails.
+
+    Predicates are hashable: saved searches with the same query words and
+    filters compile to equal predicates and are evaluated once.
+    """
+
+    terms: Tuple[str, ...] = ()
+    degree_type: FrozenSet[str] = frozenset()
+    field_of_study: FrozenSet[str] = frozenset()
+    mode: FrozenSet[str] = frozenset()
+    state: FrozenSet[str] = frozenset()
+    min_tuition: Optional[int] = None
+    max_tuition: Optional[int] = None
+    min_cutoff: Optional[int] = None
+    max_cutoff: Optional[int] = None
+
+    @classmethod
+    def from_saved_search(cls, query: str, filters: Optional[Dict[str, Any]]) -> "SavedSearchPredicate":
+        """Compile a `user_saved_searches` query and filters JSON"""
+        parsed = SearchService.filters_from_saved_search(filters)
+        return cls(
+            terms=tuple(tokenize(query)),
+            degree_type=frozenset(parsed.degree_type or ()),
+            field_of_study=frozenset(parsed.field_of_study or ()),
+            mode=frozenset(parsed.mode or ()),
+            state=frozenset(parsed.state or ()),
+            min_tuition=parsed.min_tuition,
+            max_tuition=parsed.max_tuition,
+            min_cutoff=parsed.min_cutoff,
+            max_cutoff=parsed.max_cutoff,
+        )
+
+    def matches(self, document: Dict[str, Any], words: Optional[Set[str]] = None) -> bool:
+        """
+        Whether a program document is a result of this search
+
+        Args:
+            document: Program document (see `program_document`)
+            words: Pre-tokenized searchable words of the document (optional)
+
+        Returns:
+            True if the document matches
+        """
+        if document.get("status") != "published" or document.get("is_active") is False:
+            return False
+        for attribute, field in FILTER_FIELDS:
+            allowed = getattr(self, attribute)
+            if allowed and document.get(field) not in allowed:
+                return False
+        for low, high, field in (
+            (self.min_tuition, self.max_tuition, "tuition_annual"),
+            (self.min_cutoff, self.max_cutoff, "cutoff_score"),
+        ):
+            if low is None and high is None:
+                continue
+            value = document.get(field)
+            if value is None or (low is not None and value < low) or (high is not None and value > high):
+                return False
+        if not self.terms:
+            return True
+
+        if words is None:
+            words = document_words(document)
+        *whole, last = self.terms
+        if any(term not in words for term in whole):
+            return False
+        return last in words or any(word.startswith(last) for word in words)
+
+
+def document_words(document: Dict[str, Any]) -> Set[str]:
+    """Searchable words of a program document"""
+    words: Set[str] = set()
+    for field in SEARCHABLE_FIELDS:
+        words.update(tokenize(document.get(field)))
+    return words
+
+
+class SavedSearchMatcher:
+    """
+    In-memory percolator: an inverted index of saved searches with
+    notifications enabled
+
+    Instead of re-running every saved search against the search engine,
+    changed programs are matched against the saved-search predicates.
+    Searches with identical predicates share one group, and each group is
+    indexed under composite keys: the value it requires for every filter
+    (or "any") plus an anchor, its first query word (a prefix for one-word
+    queries). A program enumerates the keys it satisfies (its own value or
+    "any" per filter, times its words and their prefixes), a few hundred
+    dict lookups in all, and gets back only searches whose filters it
+    already passes. Only those are evaluated in full, so matching a program
+    against 100k saved searches costs about as much as the matches it
+    produces.
+
+    The index is rebuilt at startup, patched by SavedSearchService on
+    create/update/delete and refreshed incrementally in the background
+    (the `updated_at` watermark catches changes made by other workers).
+    The index is only read and written on the event loop: refreshes query
+    Supabase (and build a full rebuild) on the query executor, then apply
+    the result on the loop, one refresh at a time.
+
+    A program only counts as a new result if it was created after the
+    search was saved or last notified (the same window the notification
+    email has always covered).
+    """
+
+    def __init__(self):
+        self._groups: Dict[SavedSearchPredicate, Set[str]] = {}
+        self._since: Dict[str, datetime] = {}
+        self._predicates: Dict[str, SavedSearchPredicate] = {}
+        # filter values -> query anchor -> predicates
+        self._postings: Dict[Tuple[Optional[str], ...], Dict[Any, Set[SavedSearchPredicate]]] = {}
+        self._watermark: Optional[str] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._predicates)
+
+    @property
+    def group_count(self) -> int:
+        """Distinct predicates"""
+        return len(self._groups)
+
+    def rebuild(self, saved_searches: Iterable[Dict[str, Any]]) -> None:
+        """
+        Replace the index
+
+        Args:
+            saved_searches: Rows with id, query, filters, created_at and last_notified_at
+        """
+        self._groups = {}
+        self._since = {}
+        self._predicates = {}
+        self._postings = {}
+        for saved_search in saved_searches:
+            self.add(saved_search)
+        self.loaded = True
+        logger.info(f"Saved search matcher loaded {len(self)} searches in {self.group_count} groups")
+
+    def add(self, saved_search: Dict[str, Any]) -> None:
+        """Index (or re-index) one saved search"""
+        search_id = saved_search["id"]
+        self.remove(search_id)
+        try:
+            predicate = SavedSearchPredicate.from_saved_search(saved_search["query"], saved_search.get("filters"))
+        except Exception as e:
+            logger.warning(f"Skipping saved search {search_id} with invalid filters: {e}")
+            return
+        self._predicates[search_id] = predicate
+        self._since[search_id] = parse_timestamp(
+            saved_search.get("last_notified_at") or saved_search.get("created_at")
+        )
+        if predicate not in self._groups:
+            self._groups[predicate] = set()
+            self._index(predicate)
+        self._groups[predicate].add(search_id)
+
+    def remove(self, search_id: str) -> None:
+        """Drop a saved search from the index"""
+        predicate = self._predicates.pop(search_id, None)
+        self._since.pop(search_id, None)
+        if predicate is None:
+            return
+        group = self._groups.get(predicate)
+        if group is not None:
+            group.discard(search_id)
+            if not group:
+                del self._groups[predicate]
+                self._unindex(predicate)
+
+    def sync(self, saved_search: Dict[str, Any]) -> None:
+        """Apply a saved search row as written (indexed only while notifications are on)"""
+        if saved_search.get("notify_on_new_results") and not saved_search.get("deleted_at"):
+            self.add(saved_search)
+        else:
+            self.remove(saved_search["id"])
+
+    @staticmethod
+    def _keys(predicate: SavedSearchPredicate) -> List[Tuple[Tuple[Optional[str], ...], Optional[Tuple[str, str]]]]:
+        """Composite keys a predicate is indexed under (one per combination of accepted values)"""
+        values = [sorted(getattr(predicate, attribute)) or [None] for attribute, _ in FILTER_FIELDS]
+        if not predicate.terms:
+            anchor = None
+        elif len(predicate.terms) == 1:
+            anchor = ("^", predicate.terms[0])
+        else:
+            anchor = ("=", predicate.terms[0])
+        return [(combination, anchor) for combination in product(*values)]
+
+    def _index(self, predicate: SavedSearchPredicate) -> None:
+        for combination, anchor in self._keys(predicate):
+            self._postings.setdefault(combination, {}).setdefault(anchor, set()).add(predicate)
+
+    def _unindex(self, predicate: SavedSearchPredicate) -> None:
+        for combination, anchor in self._keys(predicate):
+            by_anchor = self._postings.get(combination)
+            bucket = by_anchor.get(anchor) if by_anchor else None
+            if bucket is None:
+                continue
+            bucket.discard(predicate)
+            if not bucket:
+                del by_anchor[anchor]
+                if not by_anchor:
+                    del self._postings[combination]
+
+    def candidates(self, document: Dict[str, Any], words: Set[str]) -> Set[SavedSearchPredicate]:
+        """
+        Predicates that may match a document
+
+        Every candidate accepts the document's filter values and its anchor
+        word; only the remaining query words and ranges are left to check.
+        """
+        anchors: Set[Optional[Tuple[str, str]]] = {None}
+        for word in words:
+            anchors.add(("=", word))
+            anchors.update(("^", word[:end]) for end in range(1, len(word) + 1))
+
+        options = []
+        for _, field in FILTER_FIELDS:
+            value = document.get(field)
+            options.append((value, None) if value is not None else (None,))
+
+        found: Set[SavedSearchPredicate] = set()
+        for combination in product(*options):
+            by_anchor = self._postings.get(combination)
+            if not by_anchor:
+                continue
+            keys = by_anchor if len(by_anchor) < len(anchors) else anchors
+            for anchor in keys:
+                if anchor in anchors and anchor in by_anchor:
+                    found |= by_anchor[anchor]
+        return found
+
+    def match(self, documents: Iterable[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Saved searches each changed program is a new result for
+
+        Args:
+            documents: Program documents (see `program_document`)
+
+        Returns:
+            (saved_search_id, program_id) pairs
+        """
+        matches: List[Tuple[str, str]] = []
+        for document in documents:
+            words = document_words(document)
+            created = parse_timestamp(document.get("created_at"))
+            for predicate in self.candidates(document, words):
+                if not predicate.matches(document, words):
+                    continue
+                for search_id in self._groups[predicate]:
+                    if self._since[search_id] < created:
+                        matches.append((search_id, document["id"]))
+        return matches
+
+    # ------------------------------------------------------------------
+    # Loading from Supabase
+    # ------------------------------------------------------------------
+
+    async def refresh(self, supabase) -> int:
+        """
+        Pull saved searches changed since the last refresh (all on first call)
+
+        Turning notifications off and soft deletes bump `updated_at`, so
+        they are picked up and removed from the index. Refreshes are
+        serialized; the queries and a full rebuild run on the query
+        executor, and the index is swapped or patched on the event loop.
+
+        Args:
+            supabase: Supabase client
+
+        Returns:
+            Number of changed rows applied
+        """
+        async with self._refresh_lock:
+            since = self._watermark if self.loaded else None
+            rows, rebuilt = await query_executor.run(self._load, supabase, since)
+
+            if rebuilt is not None:
+                # One assignment, so the loop never sees a half-built index
+                self._groups, self._since, self._predicates, self._postings = (
+                    rebuilt._groups, rebuilt._since, rebuilt._predicates, rebuilt._postings
+                )
+                self.loaded = True
+            else:
+                for row in rows:
+                    self.sync(row)
+
+            stamps = [row["updated_at"] for row in rows if row.get("updated_at")]
+            if stamps:
+                self._watermark = max(stamps + ([since] if since else []))
+            return len(rows)
+
+    @staticmethod
+    def _load(supabase, since: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional["SavedSearchMatcher"]]:
+        """Fetch changed rows, and build a fresh index for a full load (worker thread)"""
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            query = supabase.table("user_saved_searches").select(SAVED_SEARCH_COLUMNS)
+            if since:
+                # gte (not gt) so rows sharing the watermark timestamp aren't missed
+                query = query.gte("updated_at", since)
+            else:
+                query = query.eq("notify_on_new_results", True).is_("deleted_at", "null")
+            page = query.order("id").range(offset, offset + PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
+
+        if since:
+            return rows, None
+        rebuilt = SavedSearchMatcher()
+        rebuilt.rebuild(rows)
+        return rows, rebuilt
+
+    async def start(self, supabase_factory: Callable[[], Any], interval: float) -> None:
+        """
+        Load the index in the background and keep it fresh
+
+        Args:
+            supabase_factory: Returns a Supabase client
+            interval: Seconds between incremental refreshes
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop(supabase_factory, interval))
+
+    async def stop(self) -> None:
+        """Stop the background refresh"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        self._refresh_task = None
+
+    async def _refresh_loop(self, supabase_factory: Callable[[], Any], interval: float) -> None:
+        while True:
+            try:
+                changed = await self.refresh(supabase_factory())
+                if changed:
+                    logger.info(f"Saved search matcher refreshed: {changed} changed searches")
+            except Exception as e:
+                logger.error(f"Failed to refresh saved search matcher: {str(e)}")
+            await asyncio.sleep(interval)
+
+
+def parse_timestamp(value: Optional[str]) -> datetime:
+    """Parse a PostgREST timestamp (missing values sort first)"""
+    if not value:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+# Singleton instance
+saved_search_matcher = SavedSearchMatcher()
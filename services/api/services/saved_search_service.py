@@ -16,6 +16,9 @@ from schemas.saved_searches import (
     SavedSearchDeleteResponse,
     SavedSearchExecuteResponse,
 )
+from core.database import execute
+from core.pagination import count_method, fetch_page, sort_keys, use_cursor
+from services.saved_search_matcher import saved_search_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -33,30 +36,25 @@ class SavedSearchService:
         page_size: int = 20,
         sort: str = "updated_at",
         order: str = "desc",
+        paginate: str = "offset",
+        cursor: Optional[str] = None,
     ) -> SavedSearchListResponse:
         """List user's saved searches with pagination"""
         try:
+            cursor_mode = use_cursor(paginate, cursor)
+
             # Build query
             query = (
                 self.supabase.table("user_saved_searches")
-                .select("*", count="exact")
+                .select("*", count=count_method(cursor_mode))
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
             )
 
-            # Get total count
-            count_result = query.execute()
-            total = count_result.count if count_result.count is not None else 0
-
-            # Apply sorting
-            query = query.order(sort, desc=(order == "desc"))
-
-            # Apply pagination
-            offset = (page - 1) * page_size
-            query = query.range(offset, offset + page_size - 1)
-
-            # Execute query
-            response = query.execute()
+            # Sort on (sort column, id) and fetch one page (rows and count in one request)
+            rows, pagination = await fetch_page(
+                query, sort_keys(sort, order == "desc"), page, page_size, cursor_mode, cursor
+            )
 
             # Convert to response models
             saved_searches = [
@@ -72,22 +70,13 @@ class SavedSearchService:
                     created_at=item["created_at"],
                     updated_at=item["updated_at"],
                 )
-                for item in response.data
+                for item in rows
             ]
 
-            # Build pagination metadata
-            total_pages = (total + page_size - 1) // page_size
-            pagination = {
-                "page": page,
-                "page_size": page_size,
-                "total": total,
-                "total_pages": total_pages,
-                "has_prev": page > 1,
-                "has_next": page < total_pages,
-            }
-
             return SavedSearchListResponse(data=saved_searches, pagination=pagination)
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error listing saved searches: {e}")
             raise HTTPException(
@@ -110,7 +99,7 @@ class SavedSearchService:
                 }
 
             # Create saved search
-            response = (
+            response = await execute(
                 self.supabase.table("user_saved_searches")
                 .insert({
                     "user_id": self.user_id,
@@ -120,7 +109,6 @@ class SavedSearchService:
                     "notify_on_new_results": search_data.notify_on_new_results or False,
                     "execution_count": 0,
                 })
-                .execute()
             )
 
             if not response.data:
@@ -130,6 +118,7 @@ class SavedSearchService:
                 )
 
             item = response.data[0]
+            saved_search_matcher.sync(item)
             return SavedSearchResponse(
                 id=item["id"],
                 name=item["name"],
@@ -155,13 +144,12 @@ class SavedSearchService:
     async def get_saved_search(self, search_id: str) -> SavedSearchResponse:
         """Get a saved search by ID"""
         try:
-            response = (
+            response = await execute(
                 self.supabase.table("user_saved_searches")
                 .select("*")
                 .eq("id", search_id)
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             if not response.data:
@@ -199,13 +187,12 @@ class SavedSearchService:
         """Update a saved search"""
         try:
             # Verify saved search exists and belongs to user
-            existing = (
+            existing = await execute(
                 self.supabase.table("user_saved_searches")
                 .select("*")
                 .eq("id", search_id)
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             if not existing.data:
@@ -248,12 +235,11 @@ class SavedSearchService:
                 )
 
             # Update saved search
-            response = (
+            response = await execute(
                 self.supabase.table("user_saved_searches")
                 .update(update_fields)
                 .eq("id", search_id)
                 .eq("user_id", self.user_id)
-                .execute()
             )
 
             if not response.data:
@@ -263,6 +249,7 @@ class SavedSearchService:
                 )
 
             item = response.data[0]
+            saved_search_matcher.sync(item)
             return SavedSearchResponse(
                 id=item["id"],
                 name=item["name"],
@@ -289,13 +276,12 @@ class SavedSearchService:
         """Delete a saved search (soft delete)"""
         try:
             # Verify saved search exists and belongs to user
-            existing = (
+            existing = await execute(
                 self.supabase.table("user_saved_searches")
                 .select("id")
                 .eq("id", search_id)
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             if not existing.data:
@@ -305,12 +291,11 @@ class SavedSearchService:
                 )
 
             # Soft delete
-            response = (
+            response = await execute(
                 self.supabase.table("user_saved_searches")
                 .update({"deleted_at": datetime.now(timezone.utc).isoformat()})
                 .eq("id", search_id)
                 .eq("user_id", self.user_id)
-                .execute()
             )
 
             if not response.data:
@@ -319,6 +304,7 @@ class SavedSearchService:
                     detail="Failed to delete saved search"
                 )
 
+            saved_search_matcher.remove(search_id)
             return SavedSearchDeleteResponse(
                 message="Saved search deleted successfully",
                 deleted_id=search_id
@@ -348,7 +334,7 @@ class SavedSearchService:
             now = datetime.now(timezone.utc).isoformat()
             new_execution_count = saved_search_response.execution_count + 1
 
-            update_response = (
+            update_response = await execute(
                 self.supabase.table("user_saved_searches")
                 .update({
                     "execution_count": new_execution_count,
@@ -356,27 +342,24 @@ class SavedSearchService:
                 })
                 .eq("id", search_id)
                 .eq("user_id", self.user_id)
-                .execute()
             )
 
-            # Execute the search using Meilisearch
-            # Note: This requires integration with SearchService
-            # For now, we'll return a placeholder structure
-            # TODO: Integrate with SearchService.search() method
-
+            # Execute the search using the shared Meilisearch client
             from services.search_service import SearchService
+            from schemas.search import SearchParams
             from core.dependencies import get_meilisearch_client
 
-            # Get search service
-            meilisearch_client = get_meilisearch_client()
-            search_service = SearchService(meilisearch_client)
+            search_service = SearchService(get_meilisearch_client())
 
-            # Execute search
-            search_results = await search_service.search(
-                query=saved_search_response.query,
-                filters=saved_search_response.filters,
-                page=page,
-                page_size=page_size
+            search_results = await search_service.search_all(
+                SearchParams(
+                    q=saved_search_response.query,
+                    filters=SearchService.filters_from_saved_search(
+                        saved_search_response.filters
+                    ),
+                    page=page,
+                    page_size=page_size,
+                )
             )
 
             # Build response
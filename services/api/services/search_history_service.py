@@ -9,6 +9,8 @@ from fastapi import HTTPException, status
 from datetime import datetime, timezone
 from collections import Counter
 
+from core.database import execute
+
 from schemas.search_history import (
     SearchHistoryListResponse,
     SearchHistoryEntry,
@@ -35,24 +37,22 @@ class SearchHistoryService:
         """List user's search history with pagination"""
         try:
             # Get total count
-            count_response = (
+            count_response = await execute(
                 self.supabase.table("user_search_history")
                 .select("id", count="exact")
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
             total = count_response.count if count_response.count is not None else 0
 
             # Get paginated results
-            response = (
+            response = await execute(
                 self.supabase.table("user_search_history")
                 .select("*")
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
                 .order("created_at", desc=True)
                 .range(offset, offset + limit - 1)
-                .execute()
             )
 
             # Convert to response models
@@ -85,12 +85,11 @@ class SearchHistoryService:
         """Clear all search history for user (soft delete)"""
         try:
             # Count entries to be deleted
-            count_response = (
+            count_response = await execute(
                 self.supabase.table("user_search_history")
                 .select("id", count="exact")
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
             count = count_response.count if count_response.count is not None else 0
 
@@ -102,12 +101,11 @@ class SearchHistoryService:
 
             # Soft delete all entries
             now = datetime.now(timezone.utc).isoformat()
-            response = (
+            response = await execute(
                 self.supabase.table("user_search_history")
                 .update({"deleted_at": now})
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             return SearchHistoryClearResponse(
@@ -126,13 +124,12 @@ class SearchHistoryService:
         """Get analytics about user's search behavior"""
         try:
             # Get all search history
-            response = (
+            response = await execute(
                 self.supabase.table("user_search_history")
                 .select("*")
                 .eq("user_id", self.user_id)
                 .is_("deleted_at", "null")
                 .order("created_at", desc=False)
-                .execute()
             )
 
             if not response.data:
@@ -0,0 +1,237 @@
+"""
+Change-Data-Capture Search Indexer
+Pushes institution and program changes to Meilisearch as they are committed,
+from Supabase Realtime (Postgres logical replication) change events
+
+Bursts are coalesced: every change to a document within the window (e.g.
+an admin saving a program several times, or a bulk import) becomes one
+re-read and one batched upsert. Events only need to carry the row id; the
+current row is read back through IncrementalSync.sync_ids, so documents
+get the same shape and denormalised fields as the sync scripts produce.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from core.config import settings
+from services.search_sync import SEARCH_TARGETS, IncrementalSync, SyncTarget
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """One committed row change"""
+    table: str
+    type: str  # INSERT, UPDATE or DELETE
+    record: Dict[str, Any] = field(default_factory=dict)
+    old_record: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.record.get("id") or self.old_record.get("id")
+
+    @classmethod
+    def from_realtime(cls, payload: Dict[str, Any]) -> "ChangeEvent":
+        """Build from a Realtime postgres_changes payload"""
+        data = payload["data"]
+        return cls(
+            table=data["table"],
+            type=data["type"],
+            record=data.get("record") or {},
+            old_record=data.get("old_record") or {},
+        )
+
+
+ChangeCallback = Callable[[ChangeEvent], None]
+
+
+class LocalChangePublisher:
+    """
+    In-process stand-in for the Realtime change feed
+
+    Used by tests and local development without Realtime; `publish` plays
+    the role of a committed write.
+    """
+
+    def __init__(self):
+        self._subscribers: List[tuple] = []
+
+    async def subscribe(self, tables: Iterable[str], callback: ChangeCallback) -> None:
+        self._subscribers.append((set(tables), callback))
+
+    async def close(self) -> None:
+        self._subscribers.clear()
+
+    def publish(
+        self,
+        table: str,
+        type: str,
+        record: Optional[Dict[str, Any]] = None,
+        old_record: Optional[Dict[str, Any]] = None
+    ) -> None:
+        event = ChangeEvent(table, type, record or {}, old_record or {})
+        for tables, callback in self._subscribers:
+            if table in tables:
+                callback(event)
+
+
+class RealtimeChangeSource:
+    """
+    Supabase Realtime postgres_changes subscription
+
+    The tables must be in the `supabase_realtime` publication (see
+    database/migrations/20261016_search_change_feed.sql). Connect with the
+    service key so RLS does not hide unpublished rows.
+    """
+
+    def __init__(self, supabase_url: str, key: str):
+        self.url = f"{supabase_url.rstrip('/')}/realtime/v1"
+        self.key = key
+        self._client = None
+
+    async def subscribe(self, tables: Iterable[str], callback: ChangeCallback) -> None:
+        from realtime import AsyncRealtimeClient
+
+        self._client = AsyncRealtimeClient(self.url, token=self.key, params={"apikey": self.key})
+        await self._client.connect()
+        channel = self._client.channel("search-indexer")
+        for table in tables:
+            channel.on_postgres_changes(
+                "*",
+                schema="public",
+                table=table,
+                callback=lambda payload: callback(ChangeEvent.from_realtime(payload)),
+            )
+        await channel.subscribe()
+        logger.info(f"Subscribed to Realtime changes for {', '.join(tables)}")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+        self._client = None
+
+
+class SearchIndexer:
+    """Coalesce change events per document and apply them in batches"""
+
+    def __init__(
+        self,
+        targets: Optional[List[SyncTarget]] = None,
+        window_seconds: float = 1.0,
+        max_batch: int = 500
+    ):
+        """
+        Args:
+            targets: Index targets (default SEARCH_TARGETS)
+            window_seconds: How long to collect changes after the first one
+            max_batch: Flush early once this many documents are pending
+        """
+        self.targets = targets or SEARCH_TARGETS
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._index_by_table = {target.table: target.index for target in self.targets}
+        self._pending: Dict[str, Set[str]] = {}
+        self._changed = asyncio.Event()
+        self._full = asyncio.Event()
+        self._source = None
+        self._syncer_factory: Optional[Callable[[], IncrementalSync]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.events = 0
+        self.flushes = 0
+
+    @property
+    def pending(self) -> int:
+        return sum(len(ids) for ids in self._pending.values())
+
+    def handle(self, event: ChangeEvent) -> None:
+        """Record a change (called from the event loop by the change source)"""
+        index = self._index_by_table.get(event.table)
+        if index is None or not event.id:
+            return
+        self.events += 1
+        self._pending.setdefault(index, set()).add(event.id)
+        self._changed.set()
+        if self.pending >= self.max_batch:
+            self._full.set()
+
+    async def start(
+        self,
+        source,
+        supabase_factory: Callable[[], Any],
+        meilisearch_factory: Callable[[], Any]
+    ) -> None:
+        """
+        Subscribe to the change source and start flushing in the background
+
+        Args:
+            source: RealtimeChangeSource or LocalChangePublisher
+            supabase_factory: Returns a Supabase client (service role)
+            meilisearch_factory: Returns a (sync) meilisearch.Client
+        """
+        if self._task is not None:
+            return
+        self._syncer_factory = lambda: IncrementalSync(supabase_factory(), meilisearch_factory(), None)
+        self._source = source
+        await source.subscribe(list(self._index_by_table), self.handle)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Unsubscribe, then apply whatever is still pending"""
+        if self._source is not None:
+            await self._source.close()
+            self._source = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await self._changed.wait()
+            # Let the burst settle so repeated changes share one flush
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.window_seconds)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def flush(self) -> Optional[Dict[str, Dict[str, int]]]:
+        """
+        Re-index every pending document now
+
+        On failure the ids are put back and retried after the next window.
+
+        Returns:
+            Per-index counts from IncrementalSync.sync_ids, or None
+        """
+        pending, self._pending = self._pending, {}
+        self._changed.clear()
+        self._full.clear()
+        if not pending:
+            return None
+
+        try:
+            results = await asyncio.to_thread(self._syncer_factory().sync_ids, self.targets, pending)
+        except Exception as e:
+            logger.error(f"Search indexing failed, will retry: {str(e)}")
+            for index, ids in pending.items():
+                self._pending.setdefault(index, set()).update(ids)
+            self._changed.set()
+            return None
+
+        self.flushes += 1
+        logger.info(f"Indexed changes: {results}")
+        return results
+
+
+# Singleton instance
+search_indexer = SearchIndexer(
+    window_seconds=settings.SEARCH_CDC_WINDOW_SECONDS,
+    max_batch=settings.SEARCH_CDC_MAX_BATCH,
+)
@@ -7,9 +7,12 @@ import time
 from typing import Dict, List, Optional, Any
 from fastapi import HTTPException, status
 
-import meilisearch
 from meilisearch.errors import MeilisearchApiError
 
+from core.search_client import AsyncMeilisearchClient
+from core.singleflight import SingleFlight
+from services.autocomplete_index import autocomplete_index
+
 from schemas.search import (
     SearchParams,
     SearchResults,
@@ -21,15 +24,42 @@ from schemas.search import (
 
 logger = logging.getLogger(__name__)
 
+# Shared across SearchService instances so concurrent requests coalesce
+_autocomplete_flights = SingleFlight()
+
 
 class SearchService:
     """Service for search operations using Meilisearch"""
 
-    def __init__(self, meilisearch_client: meilisearch.Client):
+    def __init__(self, meilisearch_client: AsyncMeilisearchClient):
         self.client = meilisearch_client
         self.institutions_index = self.client.index("institutions")
         self.programs_index = self.client.index("programs")
 
+    @staticmethod
+    def filters_from_saved_search(filters: Optional[Dict[str, Any]]) -> SearchFilters:
+        """
+        Convert stored saved-search filters to SearchFilters
+
+        Args:
+            filters: `filters` JSON from user_saved_searches
+
+        Returns:
+            SearchFilters object
+        """
+        filters = filters or {}
+        return SearchFilters(
+            institution_type=filters.get("type"),
+            state=filters.get("state"),
+            degree_type=filters.get("degree_type"),
+            field_of_study=filters.get("field_of_study"),
+            mode=filters.get("mode"),
+            min_tuition=filters.get("min_tuition"),
+            max_tuition=filters.get("max_tuition"),
+            min_cutoff=int(filters["min_cutoff"]) if filters.get("min_cutoff") is not None else None,
+            max_cutoff=int(filters["max_cutoff"]) if filters.get("max_cutoff") is not None else None,
+        )
+
     def _build_filter_expression(
         self,
         filters: Optional[SearchFilters],
@@ -109,6 +139,57 @@ class SearchService:
 
         return None
 
+    def _institution_search_params(
+        self,
+        filters: Optional[SearchFilters],
+        limit: int,
+        offset: int
+    ) -> Dict[str, Any]:
+        """Build Meilisearch parameters for an institutions search"""
+        search_params = {
+            "limit": limit,
+            "offset": offset,
+            "attributesToHighlight": ["name", "short_name", "description"],
+            "highlightPreTag": "<mark>",
+            "highlightPostTag": "</mark>",
+        }
+
+        filter_expr = self._build_filter_expression(filters, "institution")
+        if filter_expr:
+            search_params["filter"] = filter_expr
+
+        return search_params
+
+    def _program_search_params(
+        self,
+        filters: Optional[SearchFilters],
+        limit: int,
+        offset: int
+    ) -> Dict[str, Any]:
+        """Build Meilisearch parameters for a programs search"""
+        search_params = {
+            "limit": limit,
+            "offset": offset,
+            "attributesToHighlight": ["name", "field_of_study", "specialization", "institution_name"],
+            "highlightPreTag": "<mark>",
+            "highlightPostTag": "</mark>",
+        }
+
+        filter_expr = self._build_filter_expression(filters, "program")
+        if filter_expr:
+            search_params["filter"] = filter_expr
+
+        return search_params
+
+    @staticmethod
+    def _format_results(results: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a raw Meilisearch response"""
+        return {
+            "hits": results["hits"],
+            "total": results.get("estimatedTotalHits", 0),
+            "processing_time_ms": results.get("processingTimeMs", 0),
+        }
+
     async def search_institutions(
         self,
         query: str,
@@ -129,29 +210,12 @@ class SearchService:
             Dict with hits, total, and processing time
         """
         try:
-            # Build filter expression
-            filter_expr = self._build_filter_expression(filters, "institution")
-
-            # Search parameters
-            search_params = {
-                "limit": limit,
-                "offset": offset,
-                "attributesToHighlight": ["name", "short_name", "description"],
-                "highlightPreTag": "<mark>",
-                "highlightPostTag": "</mark>",
-            }
-
-            if filter_expr:
-                search_params["filter"] = filter_expr
+            search_params = self._institution_search_params(filters, limit, offset)
 
             # Execute search
-            results = self.institutions_index.search(query, search_params)
+            results = await self.institutions_index.search(query, search_params)
 
-            return {
-                "hits": results["hits"],
-                "total": results.get("estimatedTotalHits", 0),
-                "processing_time_ms": results.get("processingTimeMs", 0),
-            }
+            return self._format_results(results)
 
         except MeilisearchApiError as e:
             logger.error(f"Meilisearch API error during institution search: {str(e)}")
@@ -186,29 +250,12 @@ class SearchService:
             Dict with hits, total, and processing time
         """
         try:
-            # Build filter expression
-            filter_expr = self._build_filter_expression(filters, "program")
-
-            # Search parameters
-            search_params = {
-                "limit": limit,
-                "offset": offset,
-                "attributesToHighlight": ["name", "field_of_study", "specialization", "institution_name"],
-                "highlightPreTag": "<mark>",
-                "highlightPostTag": "</mark>",
-            }
-
-            if filter_expr:
-                search_params["filter"] = filter_expr
+            search_params = self._program_search_params(filters, limit, offset)
 
             # Execute search
-            results = self.programs_index.search(query, search_params)
+            results = await self.programs_index.search(query, search_params)
 
-            return {
-                "hits": results["hits"],
-                "total": results.get("estimatedTotalHits", 0),
-                "processing_time_ms": results.get("processingTimeMs", 0),
-            }
+            return self._format_results(results)
 
         except MeilisearchApiError as e:
             logger.error(f"Meilisearch API error during program search: {str(e)}")
@@ -223,6 +270,59 @@ class SearchService:
                 detail=f"Failed to execute search: {str(e)}"
             )
 
+    async def search_both(
+        self,
+        query: str,
+        filters: Optional[SearchFilters] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Search institutions and programs in one multi-search round trip
+
+        Args:
+            query: Search query string
+            filters: Optional filters
+            limit: Maximum results to return per index
+            offset: Offset for pagination
+
+        Returns:
+            Dict with "institutions" and "programs" results
+        """
+        try:
+            response = await self.client.multi_search([
+                {
+                    "indexUid": "institutions",
+                    "q": query,
+                    **self._institution_search_params(filters, limit, offset),
+                },
+                {
+                    "indexUid": "programs",
+                    "q": query,
+                    **self._program_search_params(filters, limit, offset),
+                },
+            ])
+
+            results = {item["indexUid"]: item for item in response["results"]}
+
+            return {
+                "institutions": self._format_results(results["institutions"]),
+                "programs": self._format_results(results["programs"]),
+            }
+
+        except MeilisearchApiError as e:
+            logger.error(f"Meilisearch API error during multi-search: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Search service error: {str(e)}"
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error during multi-search: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to execute search: {str(e)}"
+            )
+
     async def search_all(
         self,
         params: SearchParams
@@ -242,35 +342,44 @@ class SearchService:
             # Calculate offset
             offset = (params.page - 1) * params.page_size
 
-            institutions = []
-            programs = []
-            institutions_total = 0
-            programs_total = 0
-            total_processing_time_ms = 0
+            inst_results = None
+            prog_results = None
 
-            # Search institutions
-            if params.type in ("all", "institutions"):
+            if params.type == "all":
+                # Both indexes in a single multi-search request
+                both = await self.search_both(
+                    query=params.q,
+                    filters=params.filters,
+                    limit=params.page_size,
+                    offset=offset
+                )
+                inst_results = both["institutions"]
+                prog_results = both["programs"]
+            elif params.type == "institutions":
                 inst_results = await self.search_institutions(
                     query=params.q,
                     filters=params.filters,
                     limit=params.page_size,
                     offset=offset
                 )
-                institutions = inst_results["hits"]
-                institutions_total = inst_results["total"]
-                total_processing_time_ms += inst_results["processing_time_ms"]
-
-            # Search programs
-            if params.type in ("all", "programs"):
+            else:
                 prog_results = await self.search_programs(
                     query=params.q,
                     filters=params.filters,
                     limit=params.page_size,
                     offset=offset
                 )
-                programs = prog_results["hits"]
-                programs_total = prog_results["total"]
-                total_processing_time_ms += prog_results["processing_time_ms"]
+
+            institutions = inst_results["hits"] if inst_results else []
+            programs = prog_results["hits"] if prog_results else []
+            institutions_total = inst_results["total"] if inst_results else 0
+            programs_total = prog_results["total"] if prog_results else 0
+
+            # Per-index Meilisearch processing time
+            meilisearch_breakdown_ms = {
+                "institutions": inst_results["processing_time_ms"] if inst_results else 0,
+                "programs": prog_results["processing_time_ms"] if prog_results else 0,
+            }
 
             # Calculate total execution time
             execution_time_ms = (time.time() - start_time) * 1000
@@ -282,7 +391,8 @@ class SearchService:
                 "programs_total": programs_total,
                 "total_results": institutions_total + programs_total,
                 "search_time_ms": round(execution_time_ms, 2),
-                "meilisearch_time_ms": total_processing_time_ms,
+                "meilisearch_time_ms": sum(meilisearch_breakdown_ms.values()),
+                "meilisearch_breakdown_ms": meilisearch_breakdown_ms,
             }
 
         except HTTPException:
@@ -302,6 +412,11 @@ class SearchService:
         """
         Autocomplete search across institutions and programs
 
+        Answered from the in-memory prefix index when it has matches.
+        Meilisearch is only queried when the index isn't loaded or the
+        prefix matches nothing (likely a typo), and identical concurrent
+        fallback requests share a single round trip.
+
         Args:
             query: Search query string (minimum 2 characters)
             limit: Maximum suggestions to return
@@ -310,72 +425,17 @@ class SearchService:
             List of AutocompleteSuggestion objects
         """
         try:
-            suggestions = []
+            normalized = " ".join(query.lower().split())
 
-            # Split limit between institutions and programs
-            per_type_limit = limit // 2 + (limit % 2)
+            suggestions = autocomplete_index.search(normalized, limit)
+            if suggestions:
+                return suggestions
 
-            # Search institutions (only get essential fields)
-            inst_results = self.institutions_index.search(
-                query,
-                {
-                    "limit": per_type_limit,
-                    "filter": 'status = "published"',
-                    "attributesToRetrieve": [
-                        "id", "name", "slug", "state", "type", "short_name"
-                    ],
-                }
+            return await _autocomplete_flights.do(
+                (normalized, limit),
+                lambda: self._autocomplete_batch(normalized, limit)
             )
 
-            # Add institution suggestions
-            for hit in inst_results["hits"]:
-                suggestions.append(
-                    AutocompleteSuggestion(
-                        type="institution",
-                        id=hit["id"],
-                        name=hit["name"],
-                        slug=hit["slug"],
-                        description=f"{hit['type'].replace('_', ' ').title()} - {hit['state']}",
-                        institution_state=hit["state"],
-                    )
-                )
-
-            # Search programs (only get essential fields)
-            prog_results = self.programs_index.search(
-                query,
-                {
-                    "limit": per_type_limit,
-                    "filter": 'status = "published" AND is_active = true',
-                    "attributesToRetrieve": [
-                        "id", "name", "slug", "institution_name",
-                        "institution_slug", "degree_type", "field_of_study"
-                    ],
-                }
-            )
-
-            # Add program suggestions
-            for hit in prog_results["hits"]:
-                description_parts = []
-                if hit.get("field_of_study"):
-                    description_parts.append(hit["field_of_study"])
-                if hit.get("institution_name"):
-                    description_parts.append(hit["institution_name"])
-
-                suggestions.append(
-                    AutocompleteSuggestion(
-                        type="program",
-                        id=hit["id"],
-                        name=hit["name"],
-                        slug=hit["slug"],
-                        description=" - ".join(description_parts) if description_parts else None,
-                        institution_name=hit.get("institution_name"),
-                        degree_type=hit.get("degree_type"),
-                    )
-                )
-
-            # Return only up to limit
-            return suggestions[:limit]
-
         except MeilisearchApiError as e:
             logger.error(f"Meilisearch API error during autocomplete: {str(e)}")
             raise HTTPException(
@@ -388,3 +448,83 @@ class SearchService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to execute autocomplete: {str(e)}"
             )
+
+    async def _autocomplete_batch(
+        self,
+        query: str,
+        limit: int
+    ) -> List[AutocompleteSuggestion]:
+        """
+        Fetch autocomplete suggestions with one multi-search request
+
+        Args:
+            query: Normalized search query
+            limit: Maximum suggestions to return
+
+        Returns:
+            List of AutocompleteSuggestion objects
+        """
+        suggestions = []
+
+        # Split limit between institutions and programs
+        per_type_limit = limit // 2 + (limit % 2)
+
+        # Search both indexes in one round trip (only get essential fields)
+        response = await self.client.multi_search([
+            {
+                "indexUid": "institutions",
+                "q": query,
+                "limit": per_type_limit,
+                "filter": 'status = "published"',
+                "attributesToRetrieve": [
+                    "id", "name", "slug", "state", "type", "short_name"
+                ],
+            },
+            {
+                "indexUid": "programs",
+                "q": query,
+                "limit": per_type_limit,
+                "filter": 'status = "published" AND is_active = true',
+                "attributesToRetrieve": [
+                    "id", "name", "slug", "institution_name",
+                    "institution_slug", "degree_type", "field_of_study"
+                ],
+            },
+        ])
+        results = {item["indexUid"]: item for item in response["results"]}
+
+        # Add institution suggestions
+        for hit in results["institutions"]["hits"]:
+            suggestions.append(
+                AutocompleteSuggestion(
+                    type="institution",
+                    id=hit["id"],
+                    name=hit["name"],
+                    slug=hit["slug"],
+                    description=f"{hit['type'].replace('_', ' ').title()} - {hit['state']}",
+                    institution_state=hit["state"],
+                )
+            )
+
+        # Add program suggestions
+        for hit in results["programs"]["hits"]:
+            description_parts = []
+            if hit.get("field_of_study"):
+                description_parts.append(hit["field_of_study"])
+            if hit.get("institution_name"):
+                description_parts.append(hit["institution_name"])
+
+            suggestions.append(
+                AutocompleteSuggestion(
+                    type="program",
+                    id=hit["id"],
+                    name=hit["name"],
+                    slug=hit["slug"],
+                    description=" - ".join(description_parts) if description_parts else None,
+                    institution_name=hit.get("institution_name"),
+                    degree_type=hit.get("degree_type"),
+                )
+            )
+
+        # Return only up to limit
+        return suggestions[:limit]
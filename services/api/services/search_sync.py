@@ -0,0 +1,409 @@
+"""
+Incremental Search Sync
+Keeps Meilisearch indexes in step with Supabase by re-indexing only the rows
+changed since a stored high-watermark
+
+Soft deletes and unpublishing are ordinary updates (the `updated_at` trigger
+bumps the timestamp), so one `updated_at >= watermark` sweep sees every
+insert, edit and soft delete. Live rows are upserted; everything else is
+removed from the index. Hard DELETEs leave no row behind and still need an
+occasional full sync.
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.saved_search_matcher import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 500
+# Rows committed by transactions still open at the last run carry slightly
+# older timestamps; re-indexing them is harmless
+WATERMARK_OVERLAP = timedelta(minutes=5)
+TASK_TIMEOUT_MS = 120_000
+
+Row = Dict[str, Any]
+
+
+def is_published(row: Row) -> bool:
+    """Whether a row belongs in the public search indexes"""
+    return row.get("status") == "published" and not row.get("deleted_at")
+
+
+@dataclass(frozen=True)
+class SyncTarget:
+    """
+    How one Supabase table maps onto one Meilisearch index
+
+    Attributes:
+        index: Meilisearch index uid
+        table: Source table
+        columns: PostgREST select (must include id, status, deleted_at,
+            updated_at and any `follows` column)
+        to_document: Row -> Meilisearch document
+        is_live: Whether a row should be searchable (otherwise it is deleted)
+        prepare: Optional bulk enrichment of fetched rows before
+            `to_document`, e.g. program counts
+        follows: (other index, our column, their column): also re-index our
+            rows whose `our column` equals `their column` of a changed row in
+            the other index, for denormalised fields such as institution_name
+    """
+    index: str
+    table: str
+    columns: str
+    to_document: Callable[[Row], Row]
+    is_live: Callable[[Row], bool] = is_published
+    prepare: Optional[Callable[[Any, List[Row]], None]] = None
+    follows: Optional[Tuple[str, str, str]] = None
+
+
+class TableWatermarks:
+    """Watermarks kept in the job_watermarks table (needs the service key)"""
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+
+    def get(self, name: str) -> Optional[str]:
+        rows = self.supabase.table("job_watermarks").select("watermark").eq("name", name).execute().data
+        return rows[0]["watermark"] if rows else None
+
+    def set(self, name: str, watermark: str) -> None:
+        self.supabase.table("job_watermarks").upsert(
+            {"name": name, "watermark": watermark},
+            on_conflict="name",
+            returning="minimal",
+        ).execute()
+
+
+class FileWatermarks:
+    """Watermarks kept in a local JSON file, for clients without table access"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def _load(self) -> Dict[str, str]:
+        return json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def get(self, name: str) -> Optional[str]:
+        return self._load().get(name)
+
+    def set(self, name: str, watermark: str) -> None:
+        stored = self._load()
+        stored[name] = watermark
+        self.path.write_text(json.dumps(stored, indent=2))
+
+
+class IncrementalSync:
+    """Re-index rows changed since the last run, then advance the watermarks"""
+
+    def __init__(self, supabase, meilisearch_client, watermarks, page_size: int = PAGE_SIZE):
+        """
+        Args:
+            supabase: Supabase client
+            meilisearch_client: Meilisearch client
+            watermarks: TableWatermarks or FileWatermarks (not needed for `sync_ids`)
+            page_size: Rows per Supabase page and documents per Meilisearch task
+        """
+        self.supabase = supabase
+        self.meilisearch = meilisearch_client
+        self.watermarks = watermarks
+        self.page_size = page_size
+
+    @staticmethod
+    def watermark_name(target: SyncTarget) -> str:
+        return f"meilisearch:{target.index}"
+
+    def since(self, target: SyncTarget) -> Optional[str]:
+        """Stored watermark rewound by WATERMARK_OVERLAP (None before the first run)"""
+        watermark = self.watermarks.get(self.watermark_name(target))
+        if not watermark:
+            return None
+        return (parse_timestamp(watermark) - WATERMARK_OVERLAP).isoformat()
+
+    def changed_rows(self, target: SyncTarget, since: Optional[str]) -> List[Row]:
+        """
+        All rows of a target updated at or after `since` (every row if None)
+
+        Pages by `id` keyset rather than offset, so rows inserted or updated
+        during the sweep cannot shift a page boundary and be skipped.
+        """
+        rows: List[Row] = []
+        last_id = None
+        while True:
+            query = self.supabase.table(target.table).select(target.columns)
+            if since:
+                query = query.gte("updated_at", since)
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(self.page_size).execute().data
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            last_id = page[-1]["id"]
+
+    def rows_where_in(self, target: SyncTarget, column: str, values: Iterable[Any]) -> List[Row]:
+        """Rows of a target whose `column` is one of `values` (chunked IN queries)"""
+        values = sorted({value for value in values if value})
+        rows: List[Row] = []
+        for start in range(0, len(values), self.page_size):
+            chunk = values[start:start + self.page_size]
+            # Each chunk can still match many rows (e.g. programs of one institution)
+            last_id = None
+            while True:
+                query = self.supabase.table(target.table).select(target.columns).in_(column, chunk)
+                if last_id:
+                    query = query.gt("id", last_id)
+                page = query.order("id").limit(self.page_size).execute().data
+                rows.extend(page)
+                if len(page) < self.page_size:
+                    break
+                last_id = page[-1]["id"]
+        return rows
+
+    def apply(self, target: SyncTarget, rows: List[Row], removed: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Upsert live rows and delete the rest, in page-sized Meilisearch tasks
+
+        Args:
+            target: Target the rows belong to
+            rows: Changed rows
+            removed: Further document ids to delete (rows that no longer exist)
+
+        Returns:
+            {"upserted": int, "deleted": int, "tasks": [task uid, ...]}
+        """
+        live = [row for row in rows if target.is_live(row)]
+        if live and target.prepare:
+            target.prepare(self.supabase, live)
+        documents = [target.to_document(row) for row in live]
+        gone = [row["id"] for row in rows if not target.is_live(row)] + list(removed)
+
+        index = self.meilisearch.index(target.index)
+        tasks = []
+        for start in range(0, len(documents), self.page_size):
+            tasks.append(index.add_documents(documents[start:start + self.page_size], primary_key="id").task_uid)
+        for start in range(0, len(gone), self.page_size):
+            tasks.append(index.delete_documents(gone[start:start + self.page_size]).task_uid)
+        return {"upserted": len(documents), "deleted": len(gone), "tasks": tasks}
+
+    def wait(self, task_uids: List[int]) -> None:
+        """
+        Block until Meilisearch has processed the tasks
+
+        Raises:
+            RuntimeError: If a task failed (the watermark must not advance)
+        """
+        for uid in task_uids:
+            task = self.meilisearch.wait_for_task(uid, timeout_in_ms=TASK_TIMEOUT_MS)
+            if task.status != "succeeded":
+                raise RuntimeError(f"Meilisearch task {uid} {task.status}: {task.error}")
+
+    def sync_once(self, targets: List[SyncTarget]) -> Dict[str, Dict[str, int]]:
+        """
+        One incremental pass over the targets
+
+        Watermarks only advance after Meilisearch confirms every task, so a
+        failed run is simply repeated from the same position.
+
+        Args:
+            targets: Targets to sync; `follows` refers to other targets in
+                this list by index name
+
+        Returns:
+            Per index: {"changed", "upserted", "deleted"}
+        """
+        changed = {target.index: self.changed_rows(target, self.since(target)) for target in targets}
+        results = self._apply_changes(targets, changed, {})
+
+        for target in targets:
+            if changed[target.index]:
+                watermark = max((row["updated_at"] for row in changed[target.index]), key=parse_timestamp)
+                self.watermarks.set(self.watermark_name(target), watermark)
+            logger.info(f"Incremental sync {target.index}: {results[target.index]}")
+        return results
+
+    def sync_ids(self, targets: List[SyncTarget], ids: Dict[str, Iterable[str]]) -> Dict[str, Dict[str, int]]:
+        """
+        Re-index specific documents, e.g. from change events
+
+        Current rows are re-read, so events only need to carry the id.
+        Ids with no row left (hard deletes) are removed from the index.
+
+        Args:
+            targets: Targets; `follows` is applied as in `sync_once`
+            ids: Changed ids per index name
+
+        Returns:
+            Per index: {"changed", "upserted", "deleted"}
+        """
+        changed: Dict[str, List[Row]] = {}
+        missing: Dict[str, List[str]] = {}
+        for target in targets:
+            wanted = set(ids.get(target.index, ()))
+            changed[target.index] = self.rows_where_in(target, "id", wanted)
+            missing[target.index] = sorted(wanted - {row["id"] for row in changed[target.index]})
+        return self._apply_changes(targets, changed, missing)
+
+    def _apply_changes(
+        self,
+        targets: List[SyncTarget],
+        changed: Dict[str, List[Row]],
+        missing: Dict[str, List[str]]
+    ) -> Dict[str, Dict[str, int]]:
+        """Add `follows` rows, upsert/delete everything and wait for Meilisearch"""
+        rows = {index: list(found) for index, found in changed.items()}
+        for target in targets:
+            if not target.follows or target.follows[0] not in changed:
+                continue
+            other, ours, theirs = target.follows
+            seen = {row["id"] for row in rows[target.index]}
+            followers = self.rows_where_in(target, ours, (row.get(theirs) for row in changed[other]))
+            rows[target.index].extend(row for row in followers if row["id"] not in seen)
+
+        results: Dict[str, Dict[str, int]] = {}
+        tasks: List[int] = []
+        for target in targets:
+            applied = self.apply(target, rows[target.index], missing.get(target.index, []))
+            tasks.extend(applied.pop("tasks"))
+            results[target.index] = {"changed": len(changed[target.index]), **applied}
+        self.wait(tasks)
+        return results
+
+    async def run_forever(self, targets: List[SyncTarget], interval: float) -> None:
+        """
+        Run `sync_once` every `interval` seconds until cancelled
+
+        Errors are logged and the pass retried on the next tick.
+        """
+        while True:
+            try:
+                await asyncio.to_thread(self.sync_once, targets)
+            except Exception as e:
+                logger.error(f"Incremental search sync failed: {str(e)}")
+            await asyncio.sleep(interval)
+
+
+def program_counts(supabase, institution_ids: Iterable[str], page_size: int = PAGE_SIZE) -> Dict[str, int]:
+    """
+    Published program count per institution, in bulk
+
+    Args:
+        supabase: Supabase client
+        institution_ids: Institutions to count for
+
+    Returns:
+        {institution_id: count}; institutions without programs are absent
+    """
+    ids = sorted(set(institution_ids))
+    counts: Dict[str, int] = {}
+    for start in range(0, len(ids), page_size):
+        chunk = ids[start:start + page_size]
+        offset = 0
+        while True:
+            page = (
+                supabase.table("programs")
+                .select("institution_id")
+                .in_("institution_id", chunk)
+                .eq("status", "published")
+                .is_("deleted_at", "null")
+                .order("id")
+                .range(offset, offset + page_size - 1)
+                .execute()
+                .data
+            )
+            for program in page:
+                counts[program["institution_id"]] = counts.get(program["institution_id"], 0) + 1
+            if len(page) < page_size:
+                break
+            offset += page_size
+    return counts
+
+
+def institution_document(inst: Dict[str, Any]) -> Dict[str, Any]:
+    """Meilisearch document for an institution row (program_count already set)"""
+    # Convert datetime to string
+    if inst.get("created_at"):
+        inst["created_at"] = str(inst["created_at"])
+    if inst.get("updated_at"):
+        inst["updated_at"] = str(inst["updated_at"])
+
+    # Remove fields not needed for search
+    fields_to_keep = [
+        "id", "slug", "name", "short_name", "type", "state", "city",
+        "logo_url", "website", "verified", "accreditation_status",
+        "program_count", "description", "status", "created_at"
+    ]
+
+    return {k: v for k, v in inst.items() if k in fields_to_keep}
+
+
+def program_document(prog: Dict[str, Any]) -> Dict[str, Any]:
+    """Meilisearch document for a program row (institution embedded)"""
+    # Extract institution data
+    institution_data = prog.get("institution") or {}
+    institution_name = institution_data.get("name", "Unknown")
+    institution_slug = institution_data.get("slug", "")
+    institution_state = institution_data.get("state", "")
+
+    # Get cutoff score (aggregate from program_cutoffs table - we'll add a simple fallback)
+    # For now, set to None - can be enhanced later
+    cutoff_score = None
+
+    # Get tuition (aggregate from program_costs table - we'll add a simple fallback)
+    # For now, set to None - can be enhanced later
+    tuition_annual = None
+
+    # Convert datetime to string
+    created_at = str(prog["created_at"]) if prog.get("created_at") else None
+
+    # Build document
+    fields_to_keep = [
+        "id", "institution_id", "slug", "name", "degree_type",
+        "field_of_study", "specialization", "qualification",
+        "duration_years", "duration_text", "mode", "description",
+        "status", "is_active"
+    ]
+
+    document = {k: v for k, v in prog.items() if k in fields_to_keep}
+
+    # Add institution fields
+    document["institution_name"] = institution_name
+    document["institution_slug"] = institution_slug
+    document["institution_state"] = institution_state
+    document["created_at"] = created_at
+    document["tuition_annual"] = tuition_annual
+    document["cutoff_score"] = cutoff_score
+
+    return document
+
+
+def add_program_counts(supabase, institutions: List[Dict[str, Any]]) -> None:
+    """Set program_count on institution rows with one bulk query"""
+    counts = program_counts(supabase, [inst["id"] for inst in institutions])
+    for inst in institutions:
+        inst["program_count"] = counts.get(inst["id"], 0)
+
+
+# Index documents as read by SearchService (see scripts/setup_meilisearch.py)
+SEARCH_TARGETS = [
+    SyncTarget(
+        index="institutions",
+        table="institutions",
+        columns="*",
+        to_document=institution_document,
+        prepare=add_program_counts,
+        follows=("programs", "id", "institution_id"),
+    ),
+    SyncTarget(
+        index="programs",
+        table="programs",
+        columns="*, institution:institutions(name, slug, state)",
+        to_document=program_document,
+        follows=("institutions", "institution_id", "id"),
+    ),
+]
@@ -8,6 +8,8 @@ from supabase import Client
 from fastapi import HTTPException, status
 from datetime import datetime, timezone
 
+from core.database import execute
+
 from schemas.user_profile import (
     UserProfileResponse,
     UserProfileUpdate,
@@ -31,12 +33,11 @@ class UserProfileService:
     async def get_profile(self) -> UserProfileResponse:
         """Get user profile"""
         try:
-            response = (
+            response = await execute(
                 self.supabase.table("user_profiles")
                 .select("*")
                 .eq("id", self.user_id)
                 .is_("deleted_at", "null")
-                .execute()
             )
 
             if not response.data:
@@ -99,11 +100,10 @@ class UserProfileService:
                 return await self.get_profile()
 
             # Update profile
-            response = (
+            response = await execute(
                 self.supabase.table("user_profiles")
                 .update(update_fields)
                 .eq("id", self.user_id)
-                .execute()
             )
 
             if not response.data:
@@ -157,11 +157,10 @@ class UserProfileService:
                     new_preferences["search_defaults"][key] = value
 
             # Update in database
-            response = (
+            response = await execute(
                 self.supabase.table("user_profiles")
                 .update({"preferences": new_preferences})
                 .eq("id", self.user_id)
-                .execute()
             )
 
             if not response.data:
@@ -201,7 +200,7 @@ class UserProfileService:
             now = datetime.now(timezone.utc).isoformat()
 
             # Soft delete user profile
-            profile_response = (
+            profile_response = await execute(
                 self.supabase.table("user_profiles")
                 .update({
                     "deleted_at": now,
@@ -211,7 +210,6 @@ class UserProfileService:
                     }
                 })
                 .eq("id", self.user_id)
-                .execute()
             )
 
             if not profile_response.data:
@@ -225,25 +223,25 @@ class UserProfileService:
 
             try:
                 # Delete bookmarks
-                self.supabase.table("user_bookmarks").update(
+                await execute(self.supabase.table("user_bookmarks").update(
                     {"deleted_at": now}
-                ).eq("user_id", self.user_id).is_("deleted_at", "null").execute()
+                ).eq("user_id", self.user_id).is_("deleted_at", "null"))
             except Exception as e:
                 logger.warning(f"Failed to cascade delete bookmarks: {e}")
 
             try:
                 # Delete saved searches
-                self.supabase.table("user_saved_searches").update(
+                await execute(self.supabase.table("user_saved_searches").update(
                     {"deleted_at": now}
-                ).eq("user_id", self.user_id).is_("deleted_at", "null").execute()
+                ).eq("user_id", self.user_id).is_("deleted_at", "null"))
             except Exception as e:
                 logger.warning(f"Failed to cascade delete saved searches: {e}")
 
             try:
                 # Delete search history
-                self.supabase.table("user_search_history").update(
+                await execute(self.supabase.table("user_search_history").update(
                     {"deleted_at": now}
-                ).eq("user_id", self.user_id).is_("deleted_at", "null").execute()
+                ).eq("user_id", self.user_id).is_("deleted_at", "null"))
             except Exception as e:
                 logger.warning(f"Failed to cascade delete search history: {e}")
 
@@ -6,6 +6,8 @@ Usage:
     python sync_meilisearch.py --index institutions
     python sync_meilisearch.py --index programs
     python sync_meilisearch.py --index all
+    python sync_meilisearch.py --incremental
+    python sync_meilisearch.py --incremental --daemon --interval 60
 """
 
 import asyncio
@@ -15,6 +17,13 @@ from typing import List, Dict, Any
 import meilisearch
 from supabase import create_client, Client
 from core.config import settings
+from services.search_sync import (
+    IncrementalSync,
+    SyncTarget,
+    TableWatermarks,
+    is_published,
+    program_counts,
+)
 
 # Setup logging
 logging.basicConfig(
@@ -45,6 +54,89 @@ class MeilisearchSync:
         )
         logger.info(f"✓ Connected to Meilisearch: {settings.MEILISEARCH_HOST}")
 
+    @staticmethod
+    def institution_document(inst: Dict[str, Any]) -> Dict[str, Any]:
+        """Meilisearch document for an institution row (with program_count)"""
+        return {
+            'id': inst['id'],
+            'slug': inst['slug'],
+            'name': inst['name'],
+            'short_name': inst.get('short_name', ''),
+            'type': inst['type'],
+            'state': inst['state'],
+            'city': inst.get('city', ''),
+            'logo_url': inst.get('logo_url'),
+            'website': inst.get('website'),
+            'verified': inst.get('verified', False),
+            'program_count': inst.get('program_count', 0),
+            'description': inst.get('description', ''),
+            'status': inst['status'],
+            'created_at': inst.get('created_at', ''),
+        }
+
+    @staticmethod
+    def program_document(prog: Dict[str, Any]) -> Dict[str, Any]:
+        """Meilisearch document for a program row (with institution embedded)"""
+        institution = prog.get('institution', {}) or {}
+
+        return {
+            'id': prog['id'],
+            'slug': prog.get('slug', ''),
+            'name': prog['name'],
+            'degree_type': prog.get('degree_type', ''),
+            'field_of_study': prog.get('field_of_study', ''),
+            'specialization': prog.get('specialization'),
+            'mode': prog.get('mode', ''),
+            'duration_years': prog.get('duration_years'),
+            'institution_id': prog.get('institution_id', ''),
+            'institution_name': institution.get('name', ''),
+            'institution_slug': institution.get('slug', ''),
+            'institution_state': institution.get('state', ''),
+            'description': prog.get('description', ''),
+            'status': prog['status'],
+            'is_active': prog.get('is_active', True),
+            'created_at': prog.get('created_at', ''),
+        }
+
+    @staticmethod
+    def add_program_counts(supabase: Client, institutions: List[Dict[str, Any]]):
+        """Set program_count on institution rows with one bulk query"""
+        counts = program_counts(supabase, [inst['id'] for inst in institutions])
+        for inst in institutions:
+            inst['program_count'] = counts.get(inst['id'], 0)
+
+    def incremental_targets(self, index_name: str) -> List[SyncTarget]:
+        """
+        Incremental sync targets for `--index`
+
+        Institution renames re-index their programs (institution_name is
+        denormalised) and program changes recount their institution.
+        """
+        targets = {
+            'institutions': SyncTarget(
+                index='institutions',
+                table='institutions',
+                columns='*',
+                to_document=self.institution_document,
+                prepare=self.add_program_counts,
+                follows=('programs', 'id', 'institution_id'),
+            ),
+            'programs': SyncTarget(
+                index='programs',
+                table='programs',
+                columns='*, institution:institutions(name, slug, state)',
+                to_document=self.program_document,
+                is_live=lambda prog: is_published(prog) and prog.get('is_active', True),
+                follows=('institutions', 'institution_id', 'id'),
+            ),
+        }
+        names = ['institutions', 'programs'] if index_name == 'all' else [index_name]
+        return [targets[name] for name in names]
+
+    def incremental(self) -> IncrementalSync:
+        """Incremental syncer with watermarks in the job_watermarks table"""
+        return IncrementalSync(self.supabase, self.meilisearch, TableWatermarks(self.supabase))
+
     def configure_institutions_index(self):
         """Configure institutions index with searchable attributes and filters"""
         logger.info("Configuring institutions index...")
@@ -186,24 +278,7 @@ class MeilisearchSync:
             inst['program_count'] = prog_response.count or 0
 
         # Format for Meilisearch (ensure all fields are present)
-        documents = []
-        for inst in institutions:
-            documents.append({
-                'id': inst['id'],
-                'slug': inst['slug'],
-                'name': inst['name'],
-                'short_name': inst.get('short_name', ''),
-                'type': inst['type'],
-                'state': inst['state'],
-                'city': inst.get('city', ''),
-                'logo_url': inst.get('logo_url'),
-                'website': inst.get('website'),
-                'verified': inst.get('verified', False),
-                'program_count': inst.get('program_count', 0),
-                'description': inst.get('description', ''),
-                'status': inst['status'],
-                'created_at': inst.get('created_at', ''),
-            })
+        documents = [self.institution_document(inst) for inst in institutions]
 
         # Index in Meilisearch
         logger.info(f"Indexing {len(documents)} institutions in Meilisearch...")
@@ -255,28 +330,7 @@ class MeilisearchSync:
             return 0
 
         # Format for Meilisearch
-        documents = []
-        for prog in programs:
-            institution = prog.get('institution', {}) or {}
-
-            documents.append({
-                'id': prog['id'],
-                'slug': prog.get('slug', ''),
-                'name': prog['name'],
-                'degree_type': prog.get('degree_type', ''),
-                'field_of_study': prog.get('field_of_study', ''),
-                'specialization': prog.get('specialization'),
-                'mode': prog.get('mode', ''),
-                'duration_years': prog.get('duration_years'),
-                'institution_id': prog.get('institution_id', ''),
-                'institution_name': institution.get('name', ''),
-                'institution_slug': institution.get('slug', ''),
-                'institution_state': institution.get('state', ''),
-                'description': prog.get('description', ''),
-                'status': prog['status'],
-                'is_active': prog.get('is_active', True),
-                'created_at': prog.get('created_at', ''),
-            })
+        documents = [self.program_document(prog) for prog in programs]
 
         # Index in Meilisearch
         logger.info(f"Indexing {len(documents)} programs in Meilisearch...")
@@ -328,11 +382,43 @@ async def main():
         help='Show index statistics after sync'
     )
 
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only sync rows changed since the last run (first run syncs everything)'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='With --incremental: keep running, syncing every --interval seconds'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=60,
+        help='Seconds between incremental passes in daemon mode (default: 60)'
+    )
+
     args = parser.parse_args()
 
     # Initialize sync
     sync = MeilisearchSync()
 
+    if args.incremental:
+        if args.index in ['institutions', 'all']:
+            sync.configure_institutions_index()
+        if args.index in ['programs', 'all']:
+            sync.configure_programs_index()
+
+        targets = sync.incremental_targets(args.index)
+        if args.daemon:
+            logger.info(f"Incremental sync daemon started (every {args.interval}s)")
+            await sync.incremental().run_forever(targets, args.interval)
+        else:
+            results = sync.incremental().sync_once(targets)
+            logger.info(f"✓ Incremental sync completed: {results}")
+        return
+
     try:
         # Sync institutions
         if args.index in ['institutions', 'all']:
@@ -12,7 +12,16 @@ from pathlib import Path
 api_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(api_dir))
 
-from main import app
+from core.cache import response_cache  # noqa: E402
+from main import app  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Keep in-process cached responses from leaking between tests"""
+    response_cache.l1.clear()
+    yield
+    response_cache.l1.clear()
 
 
 @pytest.fixture
@@ -0,0 +1,135 @@
+"""
+Autocomplete Index Tests
+Tests for the in-memory prefix index behind /api/v1/search/autocomplete
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.autocomplete_index import AutocompleteIndex
+from services.search_service import SearchService
+
+
+def institution(id, name, short_name=None, **extra):
+    return {
+        "id": id, "name": name, "short_name": short_name, "slug": id,
+        "type": "federal_university", "state": "Lagos", "status": "published",
+        "deleted_at": None, **extra,
+    }
+
+
+def program(id, name, institution_id, field_of_study=None, **extra):
+    return {
+        "id": id, "name": name, "slug": id, "degree_type": "undergraduate",
+        "field_of_study": field_of_study, "institution_id": institution_id,
+        "status": "published", "is_active": True, "deleted_at": None,
+        "institution": {"name": "University of Lagos", "slug": "unilag", "state": "Lagos"},
+        **extra,
+    }
+
+
+@pytest.fixture
+def index():
+    idx = AutocompleteIndex()
+    idx.apply(
+        institutions=[
+            institution("unilag", "University of Lagos", "UNILAG"),
+            institution("ui", "University of Ibadan", "UI"),
+        ],
+        programs=[
+            program("cs", "Computer Science", "unilag", "Sciences"),
+            program("ce", "Computer Engineering", "unilag", "Engineering", annual_intake=200),
+            program("med", "Medicine and Surgery", "ui", "Medicine"),
+        ],
+    )
+    return idx
+
+
+def test_not_ready_until_loaded():
+    """Lookups return None so the caller falls back to Meilisearch"""
+    assert AutocompleteIndex().search("uni") is None
+
+
+def test_matches_any_word_and_short_name(index):
+    """Prefixes match later words, short names and program fields"""
+    assert [s.id for s in index.search("lagos")][0] == "unilag"
+    assert [s.id for s in index.search("unil")] == ["unilag"]
+    assert {s.id for s in index.search("engin")} == {"ce"}
+
+
+def test_ranked_by_popularity_with_types_split(index):
+    """Higher-weight entries first, institutions before programs"""
+    results = index.search("comp", limit=10)
+
+    assert [s.id for s in results] == ["ce", "cs"]
+    assert results[1].description == "Sciences - University of Lagos"
+
+    results = index.search("university", limit=2)
+    # Only one slot per type: UNILAG has more programs than UI, and
+    # Computer Engineering has the larger annual intake
+    assert [s.id for s in results] == ["unilag", "ce"]
+
+
+def test_incremental_updates(index):
+    """Unpublished rows are dropped and renames reach program suggestions"""
+    index.apply(
+        institutions=[institution("unilag", "Lagos State University of Tech")],
+        programs=[program("med", "Medicine and Surgery", "ui", status="archived")],
+    )
+
+    assert index.search("medicine") == []
+    cs = next(s for s in index.search("comp") if s.id == "cs")
+    assert cs.institution_name == "Lagos State University of Tech"
+
+
+def test_refresh_uses_watermark(index):
+    """Later refreshes only ask for rows changed since the last one"""
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value
+    query.order.return_value.range.return_value.execute.return_value.data = [
+        institution("oau", "Obafemi Awolowo University", updated_at="2025-01-02T00:00:00+00:00")
+    ]
+    query.gte.return_value.order.return_value.range.return_value.execute.return_value.data = []
+
+    assert index.refresh(supabase) == 2
+    index.refresh(supabase)
+
+    query.gte.assert_called_with("updated_at", "2025-01-02T00:00:00+00:00")
+    assert [s.id for s in index.search("obaf")] == ["oau"]
+
+
+def test_refresh_removes_unpublished_and_soft_deleted_rows(index):
+    """Rows hidden since the last load (seen with the service-role client) drop out"""
+    tables = {"institutions": MagicMock(), "programs": MagicMock()}
+    tables["institutions"].select.return_value.order.return_value.range.return_value.execute.return_value.data = [
+        institution("ui", "University of Ibadan", "UI", status="draft", updated_at="2025-01-02T00:00:00+00:00"),
+    ]
+    tables["programs"].select.return_value.order.return_value.range.return_value.execute.return_value.data = [
+        program("cs", "Computer Science", "unilag", "Sciences", deleted_at="2025-01-02T00:00:00+00:00"),
+    ]
+    supabase = MagicMock()
+    supabase.table.side_effect = tables.get
+
+    assert index.refresh(supabase) == 2
+
+    assert index.search("ibadan") == []
+    assert [s.id for s in index.search("comp")] == ["ce"]
+
+
+async def test_service_answers_from_memory(index, monkeypatch):
+    """Autocomplete doesn't touch Meilisearch when the index has matches"""
+    monkeypatch.setattr("services.search_service.autocomplete_index", index)
+    client = MagicMock()
+    client.multi_search = AsyncMock(return_value={"results": [
+        {"indexUid": "institutions", "hits": []},
+        {"indexUid": "programs", "hits": []},
+    ]})
+    service = SearchService(client)
+
+    results = await service.autocomplete("Comp", 5)
+    assert [s.id for s in results] == ["ce", "cs"]
+    client.multi_search.assert_not_called()
+
+    # A typo misses the prefix index and goes to Meilisearch
+    await service.autocomplete("cmoputer", 5)
+    client.multi_search.assert_awaited_once()
@@ -0,0 +1,74 @@
+"""
+Bookmark Service Tests
+Tests for batched entity hydration in bookmark listings
+"""
+import httpx
+from postgrest import SyncPostgrestClient
+
+from core.cache import ResponseCache, program_tag
+from services.bookmark_service import BookmarkService
+
+
+def make_service(handler):
+    class Client:
+        postgrest = SyncPostgrestClient(
+            "http://db.test/rest/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        def table(self, name):
+            return self.postgrest.from_(name)
+
+    return BookmarkService(Client(), "user-1")
+
+
+def bookmark(i, entity_type):
+    return {
+        "id": f"b{i}", "entity_type": entity_type, "entity_id": f"{entity_type[0]}{i}",
+        "notes": None, "created_at": "2025-01-01T00:00:00+00:00",
+    }
+
+
+async def test_list_bookmarks_hydrates_entities_in_batches(monkeypatch):
+    """One query per entity type, then snapshots come from the cache"""
+    cache = ResponseCache("redis://127.0.0.1:1", retry_after=30)
+    monkeypatch.setattr("services.bookmark_service.response_cache", cache)
+
+    bookmarks = [bookmark(i, "program") for i in range(30)] + [bookmark(i, "institution") for i in range(10)]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        table = request.url.path.rsplit("/", 1)[-1]
+        if table == "user_bookmarks":
+            return httpx.Response(200, json=bookmarks, headers={"Content-Range": "0-39/40"})
+        ids = request.url.params["id"].removeprefix("in.(").removesuffix(")").split(",")
+        if table == "programs":
+            rows = [
+                {"id": i, "name": i, "slug": i, "institution": {"id": "i0", "name": "UNILAG"}}
+                for i in ids if i != "p7"
+            ]
+        else:
+            rows = [{"id": i, "name": i, "slug": i} for i in ids]
+        return httpx.Response(200, json=rows)
+
+    service = make_service(handler)
+    first = await service.list_bookmarks(page_size=40)
+
+    tables = [r.url.path.rsplit("/", 1)[-1] for r in requests]
+    assert tables == ["user_bookmarks", "programs", "institutions"]
+    assert first.data[0].entity["institution"]["name"] == "UNILAG"
+    assert next(b for b in first.data if b.entity_id == "p7").entity is None
+
+    requests.clear()
+    await service.list_bookmarks(page_size=40)
+    tables = [r.url.path.rsplit("/", 1)[-1] for r in requests]
+    assert tables == ["user_bookmarks", "programs"]
+    assert requests[1].url.params["id"] == "in.(p7)"
+
+    # Editing a program drops its snapshot
+    await cache.invalidate_tags(program_tag("p3"))
+    requests.clear()
+    await service.list_bookmarks(page_size=40)
+    assert requests[1].url.params["id"] == "in.(p3,p7)"
+    await cache.close()
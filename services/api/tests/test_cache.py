@@ -0,0 +1,270 @@
+"""
+Response Cache Tests
+Tests for the two-tier (in-process + Redis) catalog response cache
+"""
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.cache import (
+    INSTITUTION_DETAIL,
+    PROGRAM_SNAPSHOTS,
+    PROGRAMS_LIST,
+    LRUCache,
+    ResponseCache,
+    catalog_tags,
+    institution_tag,
+    program_tag,
+)
+from schemas.institutions import InstitutionFilters
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio commands the cache uses"""
+
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+        self.published = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.sets.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.results = []
+
+    def set(self, key, value, ex=None):
+        self.redis.data[key] = value
+        self.results.append(True)
+
+    def sadd(self, key, *members):
+        self.redis.sets.setdefault(key, set()).update(members)
+        self.results.append(len(members))
+
+    def expire(self, key, seconds):
+        self.results.append(True)
+
+    def smembers(self, key):
+        self.results.append(set(self.redis.sets.get(key, set())))
+
+    async def execute(self):
+        return self.results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache("redis://localhost:6379", default_ttl=60, l1_max_entries=0)
+    fake = FakeRedis()
+    cache._client = lambda: fake
+    cache.fake = fake
+    return cache
+
+
+def test_keys_ignore_filter_order_and_empty_values(cache):
+    """Equivalent filter sets map to the same key"""
+    a = InstitutionFilters(state=["Lagos", "Oyo"], search=" unilag ")
+    b = InstitutionFilters(state=["Oyo", "Lagos", "Lagos"], search="unilag", type=[])
+
+    assert cache.make_key("x", a) == cache.make_key("x", b)
+    assert cache.make_key("x", a) != cache.make_key("x", InstitutionFilters(state=["Lagos"]))
+
+
+async def test_get_or_load_caches_value(cache):
+    """The loader runs once; later calls are served from Redis"""
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"id": "1", "name": "University of Lagos"}
+
+    first = await cache.get_or_load(INSTITUTION_DETAIL, {"slug": "unilag"}, loader)
+    second = await cache.get_or_load(INSTITUTION_DETAIL, {"slug": "unilag"}, loader)
+
+    assert first == second == {"id": "1", "name": "University of Lagos"}
+    assert len(calls) == 1
+
+
+async def test_concurrent_misses_share_one_load(cache):
+    """Stampede protection: one loader call for concurrent misses"""
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"data": []}
+
+    await asyncio.gather(*[
+        cache.get_or_load(PROGRAMS_LIST, {"page": 1}, loader) for _ in range(5)
+    ])
+
+    assert len(calls) == 1
+
+
+async def test_invalidate_drops_namespace(cache):
+    """Invalidation clears only the given namespace"""
+    async def loader():
+        return {"ok": True}
+
+    await cache.get_or_load(INSTITUTION_DETAIL, {"slug": "unilag"}, loader)
+    await cache.get_or_load(PROGRAMS_LIST, {"page": 1}, loader)
+
+    await cache.invalidate(INSTITUTION_DETAIL)
+
+    assert await cache.fake.get(cache.make_key(INSTITUTION_DETAIL, {"slug": "unilag"})) is None
+    assert await cache.fake.get(cache.make_key(PROGRAMS_LIST, {"page": 1})) is not None
+
+
+async def test_bypasses_cache_when_redis_is_down():
+    """An unreachable Redis never breaks the request"""
+    cache = ResponseCache("redis://127.0.0.1:1", retry_after=30, l1_max_entries=0)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"ok": True}
+
+    assert await cache.get_or_load(PROGRAMS_LIST, {}, loader) == {"ok": True}
+    assert await cache.get_or_load(PROGRAMS_LIST, {}, loader) == {"ok": True}
+
+    assert len(calls) == 2
+    assert cache._unavailable_until > time.monotonic()
+    await cache.close()
+
+
+def test_lru_evicts_least_recently_used_and_by_tag():
+    """L1 is size-bounded and drops entries by tag"""
+    lru = LRUCache(max_entries=2)
+    lru.set("a", 1, 60, ["institution:1"])
+    lru.set("b", 2, 60, ["institution:2"])
+    lru.get("a")
+    lru.set("c", 3, 60, ["institution:1"])
+
+    assert lru.get("b") is None
+    assert lru.invalidate_tags(["institution:1"]) == 2
+    assert len(lru) == 0
+
+
+def test_catalog_tags_from_pages_and_rows():
+    """Responses are tagged with the institutions and programs they contain"""
+    page = {"data": [{"id": "p1", "institution_id": "i1"}, {"id": "p2", "institution_id": "i2"}]}
+
+    assert catalog_tags(page) == ["institution:i1", "institution:i2", "program:p1", "program:p2"]
+    assert catalog_tags({"id": "i1", "name": "UNILAG"}) == ["institution:i1"]
+
+
+async def test_l1_serves_hot_entries_without_redis():
+    """After the first load, hits come from the in-process tier"""
+    cache = ResponseCache("redis://localhost:6379", default_ttl=60)
+    fake = FakeRedis()
+    gets = []
+    original_get = fake.get
+
+    async def counting_get(key):
+        gets.append(key)
+        return await original_get(key)
+
+    fake.get = counting_get
+    cache._client = lambda: fake
+
+    async def loader():
+        return {"id": "i1", "slug": "university-of-lagos"}
+
+    for _ in range(3):
+        await cache.get_or_load(INSTITUTION_DETAIL, {"slug": "university-of-lagos"}, loader, tags=catalog_tags)
+
+    assert len(gets) == 1
+
+
+async def test_tag_invalidation_is_exact_and_published():
+    """Only entries carrying the tag are dropped, and other workers are told"""
+    cache = ResponseCache("redis://localhost:6379", default_ttl=60)
+    fake = FakeRedis()
+    cache._client = lambda: fake
+
+    async def unilag():
+        return {"id": "i1"}
+
+    async def ui():
+        return {"id": "i2"}
+
+    await cache.get_or_load(INSTITUTION_DETAIL, {"slug": "unilag"}, unilag, tags=catalog_tags)
+    await cache.get_or_load(INSTITUTION_DETAIL, {"slug": "ui"}, ui, tags=catalog_tags)
+
+    await cache.invalidate_tags(institution_tag("i1"))
+
+    assert await fake.get(cache.make_key(INSTITUTION_DETAIL, {"slug": "unilag"})) is None
+    assert await fake.get(cache.make_key(INSTITUTION_DETAIL, {"slug": "ui"})) is not None
+    assert cache.l1.get(cache.make_key(INSTITUTION_DETAIL, {"slug": "ui"}))[0] == {"id": "i2"}
+    assert fake.published[0][1]["tags"] == ["institution:i1"]
+
+
+async def test_admin_program_status_invalidates_affected_entries(monkeypatch):
+    """update_program_status drops the program, its institution and program lists"""
+    from services.admin_program_service import AdminProgramService
+
+    cache = ResponseCache("redis://localhost:6379", default_ttl=60)
+    fake = FakeRedis()
+    cache._client = lambda: fake
+    monkeypatch.setattr("services.admin_program_service.response_cache", cache)
+
+    async def other_institution():
+        return {"id": "i2"}
+
+    await cache.get_or_load(INSTITUTION_DETAIL, {"slug": "ui"}, other_institution, tags=catalog_tags)
+
+    supabase = MagicMock()
+    table = supabase.table.return_value
+    table.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value.data = {
+        "id": "p1", "institution_id": "i1"
+    }
+    table.update.return_value.eq.return_value.execute.return_value.data = [{"id": "p1"}]
+    service = AdminProgramService(supabase)
+    monkeypatch.setattr(service, "get_program", lambda program_id: asyncio.sleep(0, result=None))
+
+    await service.update_program_status("p1", "archived")
+
+    assert fake.published[0][1]["tags"] == [
+        program_tag("p1"), institution_tag("i1"), "ns:programs:list", "ns:institutions:programs"
+    ]
+    assert cache.l1.get(cache.make_key(INSTITUTION_DETAIL, {"slug": "ui"}))[0] == {"id": "i2"}
+
+
+async def test_get_many_or_load_only_loads_missing_ids(cache):
+    """Cached snapshots are reused; one loader call covers the rest"""
+    calls = []
+
+    async def loader(ids):
+        calls.append(sorted(ids))
+        return {i: {"id": i} for i in ids if i != "gone"}
+
+    await cache.get_many_or_load(PROGRAM_SNAPSHOTS, ["p1", "p2"], loader)
+    result = await cache.get_many_or_load(PROGRAM_SNAPSHOTS, ["p2", "p3", "gone", "p3"], loader)
+
+    assert calls == [["p1", "p2"], ["gone", "p3"]]
+    assert result == {"p2": {"id": "p2"}, "p3": {"id": "p3"}}
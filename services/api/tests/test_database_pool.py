@@ -0,0 +1,107 @@
+"""
+Supabase Connection Pool Tests
+Tests for the process-wide pooled Supabase client
+"""
+import asyncio
+import threading
+import time
+
+import httpx
+from postgrest import SyncPostgrestClient
+
+from core.database import QueryExecutor, SupabaseClientPool
+
+
+def make_pool():
+    return SupabaseClientPool("https://example.supabase.co", "anon-key")
+
+
+def test_pool_starts_lazily_and_shares_http_client():
+    """Scoped clients reuse the pool's single HTTP client"""
+    pool = make_pool()
+    assert not pool.started
+
+    first = pool.scoped()
+    second = pool.scoped("user-token")
+
+    assert pool.started
+    assert first.postgrest.session is second.postgrest.session
+    pool.close()
+
+
+def test_scoped_clients_do_not_leak_tokens():
+    """A user's token only applies to the client it was scoped to"""
+    pool = make_pool()
+
+    user_client = pool.scoped("user-token")
+    anon_client = pool.scoped()
+    user_client.postgrest.auth("other-token")
+
+    assert user_client.postgrest.headers["Authorization"] == "Bearer other-token"
+    assert anon_client.postgrest.headers["Authorization"] == "Bearer anon-key"
+    assert pool.scoped().postgrest.headers["Authorization"] == "Bearer anon-key"
+    pool.close()
+
+
+def test_pool_stats_shape():
+    """Pool metrics report in-use, idle and wait time"""
+    pool = make_pool()
+    pool.start()
+
+    stats = pool.stats().to_dict()
+
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 0
+    assert stats["max_connections"] == 100
+    assert stats["wait_time_ms_avg"] == 0.0
+    pool.close()
+
+
+def test_health_reports_pool_metrics(client):
+    """Health endpoint exposes Supabase pool metrics"""
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert "supabase" in response.json()["pools"]
+
+
+async def test_queries_run_off_the_event_loop_with_bounded_concurrency():
+    """Slow queries overlap (up to the worker count) while the loop keeps running"""
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def handler(request):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.1)
+        with lock:
+            active -= 1
+        return httpx.Response(200, json=[{"id": 1}])
+
+    postgrest = SyncPostgrestClient("http://db.test/rest/v1", http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    executor = QueryExecutor(max_workers=4)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    heartbeat = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(executor.execute(postgrest.from_("programs").select("id")) for _ in range(8)))
+    elapsed = time.perf_counter() - started
+    heartbeat.cancel()
+
+    assert [response.data for response in responses] == [[{"id": 1}]] * 8
+    assert peak == 4
+    assert elapsed < 0.4  # two waves of 0.1s, not eight
+    assert ticks >= 10  # the loop kept serving while queries ran
+    stats = executor.stats().to_dict()
+    assert stats["total_queries"] == 8 and stats["running"] == 0 and stats["queued"] == 0
+    assert stats["wait_time_ms_max"] > 50  # the second wave queued for a worker
+    executor.close()
+
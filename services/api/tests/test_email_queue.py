@@ -0,0 +1,212 @@
+"""
+Email Queue Tests
+Tests for the rate-limited, retrying, idempotent outbound email queue
+"""
+import asyncio
+import json
+import time
+
+import pytest
+from resend import exceptions as resend_errors
+
+from services.email_queue import (
+    EmailQueue,
+    FileBackend,
+    IdempotencyStore,
+    OutboundEmail,
+    TokenBucket,
+)
+
+
+class RecordingBackend:
+    """Records sends and fails the first `failures` attempts per recipient"""
+
+    def __init__(self, failures=0, error=RuntimeError("503 from provider")):
+        self.failures = failures
+        self.error = error
+        self.attempts = {}
+        self.sent = []
+        self.batches = []
+
+    async def send(self, email):
+        self.attempts[email.to] = self.attempts.get(email.to, 0) + 1
+        if self.attempts[email.to] <= self.failures:
+            raise self.error
+        self.sent.append((time.monotonic(), email.to))
+        return {"id": f"id-{email.to}"}
+
+    async def send_batch(self, emails):
+        self.batches.append([email.to for email in emails])
+        if self.failures:
+            raise self.error
+        return [await self.send(email) for email in emails]
+
+
+class SharedRedis:
+    """The subset of the Redis API the idempotency store uses, shared by queues"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+def shared_store(redis_client):
+    store = IdempotencyStore("redis://unused")
+    store._client = lambda: redis_client
+    return store
+
+
+def message(to="student@example.com"):
+    return OutboundEmail(to=to, subject="Hi", html="<p>Hi</p>", from_email="Admitly <hello@admitly.com.ng>")
+
+
+async def test_workers_send_concurrently_within_rate_limit():
+    """A burst is spread out by the token bucket"""
+    backend = RecordingBackend()
+    queue = EmailQueue(backend, workers=4, rate_per_second=50, burst=5, batch_size=1)
+
+    results = await asyncio.gather(*(queue.send(message(f"u{i}@example.com")) for i in range(15)))
+
+    times = [t for t, _ in backend.sent]
+    assert len(results) == 15
+    # 5 immediately, the remaining 10 at 50/s
+    assert times[-1] - times[0] >= 0.15
+    await queue.stop()
+
+
+async def test_queued_emails_are_sent_in_batches():
+    """Waiting emails go out together, one rate-limit token per provider call"""
+    backend = RecordingBackend()
+    queue = EmailQueue(backend, workers=1, rate_per_second=0, batch_size=4)
+
+    results = await asyncio.gather(*(queue.send(message(f"u{i}@example.com")) for i in range(10)))
+
+    assert [len(batch) for batch in backend.batches] == [4, 4, 2]
+    assert len(backend.sent) == 10
+    assert results[7] == {"id": "id-u7@example.com"}
+    await queue.stop()
+
+
+async def test_rejected_batch_is_split_into_single_sends():
+    """A batch the provider rejects as a whole is retried one email at a time"""
+    backend = RecordingBackend(failures=1, error=resend_errors.ValidationError("bad to", "validation_error", 422))
+    queue = EmailQueue(backend, workers=1, rate_per_second=0, batch_size=10)
+
+    results = await asyncio.gather(
+        *(queue.send(message(f"u{i}@example.com")) for i in range(3)), return_exceptions=True
+    )
+
+    assert backend.batches == [["u0@example.com", "u1@example.com", "u2@example.com"]]
+    # Each email then failed validation on its own, without retries
+    assert all(isinstance(r, resend_errors.ValidationError) for r in results)
+    assert backend.attempts == {f"u{i}@example.com": 1 for i in range(3)}
+    await queue.stop()
+
+
+async def test_transient_errors_are_retried_with_backoff():
+    backend = RecordingBackend(failures=2)
+    queue = EmailQueue(backend, rate_per_second=0, retry_base_seconds=0.01)
+
+    assert await queue.send(message()) == {"id": "id-student@example.com"}
+    assert backend.attempts["student@example.com"] == 3
+    await queue.stop()
+
+
+async def test_permanent_errors_fail_without_retry():
+    backend = RecordingBackend(failures=5, error=resend_errors.ValidationError("bad to", "validation_error", 422))
+    queue = EmailQueue(backend, rate_per_second=0, retry_base_seconds=0.01)
+
+    with pytest.raises(resend_errors.ValidationError):
+        await queue.send(message())
+    assert backend.attempts["student@example.com"] == 1
+    await queue.stop()
+
+
+async def test_idempotency_key_prevents_duplicate_sends():
+    backend = RecordingBackend()
+    queue = EmailQueue(backend, rate_per_second=0)
+
+    first, second = await asyncio.gather(
+        queue.send(message(), idempotency_key="deadline-alert:u1:p1:2025-06-01"),
+        queue.send(message(), idempotency_key="deadline-alert:u1:p1:2025-06-01"),
+    )
+    again = await queue.send(message(), idempotency_key="deadline-alert:u1:p1:2025-06-01")
+
+    assert len(backend.sent) == 1
+    assert "duplicate" not in first
+    assert second["duplicate"] and again["duplicate"]
+    await queue.stop()
+
+
+async def test_failed_send_releases_idempotency_key():
+    backend = RecordingBackend(failures=1)
+    queue = EmailQueue(backend, rate_per_second=0, max_retries=0)
+
+    with pytest.raises(RuntimeError):
+        await queue.send(message(), idempotency_key="k")
+    assert await queue.send(message(), idempotency_key="k") == {"id": "id-student@example.com"}
+    await queue.stop()
+
+
+async def test_idempotency_keys_are_shared_across_workers():
+    backend = RecordingBackend()
+    redis_client = SharedRedis()
+    worker_a = EmailQueue(backend, rate_per_second=0, store=shared_store(redis_client))
+    worker_b = EmailQueue(backend, rate_per_second=0, store=shared_store(redis_client))
+
+    first = await worker_a.send(message(), idempotency_key="k")
+    # Another worker (or this one after a restart) skips the send
+    again = await worker_b.send(message(), idempotency_key="k")
+
+    assert len(backend.sent) == 1
+    assert again == {**first, "duplicate": True}
+    await worker_a.stop()
+    await worker_b.stop()
+
+
+async def test_failed_send_releases_shared_key():
+    redis_client = SharedRedis()
+    queue = EmailQueue(RecordingBackend(failures=1), rate_per_second=0, max_retries=0, store=shared_store(redis_client))
+
+    with pytest.raises(RuntimeError):
+        await queue.send(message(), idempotency_key="k")
+    assert redis_client.values == {}
+    await queue.stop()
+
+
+async def test_sends_without_redis():
+    backend = RecordingBackend()
+    queue = EmailQueue(backend, rate_per_second=0, store=IdempotencyStore("redis://127.0.0.1:1"))
+
+    assert await queue.send(message(), idempotency_key="k") == {"id": "id-student@example.com"}
+    assert (await queue.send(message(), idempotency_key="k"))["duplicate"]
+    assert len(backend.sent) == 1
+    await queue.stop()
+
+
+async def test_file_backend_writes_json(tmp_path):
+    result = await FileBackend(str(tmp_path)).send(message())
+
+    [path] = tmp_path.iterdir()
+    stored = json.loads(path.read_text())
+    assert stored["id"] == result["id"]
+    assert stored["to"] == "student@example.com"
+
+
+async def test_token_bucket_allows_burst_then_refills():
+    bucket = TokenBucket(rate=100, capacity=3)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert 0.015 <= time.monotonic() - started < 0.5
@@ -0,0 +1,48 @@
+"""
+Email Template Tests
+Tests for precompiled email templates
+"""
+from datetime import datetime
+
+from services.email_service import EmailService
+from services.email_templates import EmailTemplate, Markup, Template
+
+
+def test_template_render_and_partial():
+    """Static values are baked in once; the rest are substituted per render"""
+    template = Template("<p>{{ greeting }}, {{name}}! Contact {{support}}</p>", escape=True)
+    compiled = template.partial(support="help@admitly.com.ng")
+
+    assert compiled.fields == ["greeting", "name"]
+    assert compiled.render(greeting="Hi", name="Ada") == "<p>Hi, Ada! Contact help@admitly.com.ng</p>"
+
+
+def test_html_values_are_escaped_unless_markup():
+    template = EmailTemplate(subject="{{name}}", html_body="<b>{{name}}</b>{{fragment}}", text="{{name}}")
+
+    rendered = template.render(name="<script>A&B</script>", fragment=Markup("<i>ok</i>"))
+
+    assert rendered["html"] == "<b>&lt;script&gt;A&amp;B&lt;/script&gt;</b><i>ok</i>"
+    assert rendered["subject"] == rendered["text"] == "<script>A&B</script>"
+
+
+async def test_deadline_alert_uses_urgency_variant():
+    sent = []
+    service = EmailService()
+
+    async def capture(**email):
+        sent.append(email)
+        return {"id": "e1"}
+
+    service.send_email = capture
+    await service.send_deadline_alert(
+        to="ada@example.com", user_name="Ada", program_name="Law", institution_name="UNILAG",
+        deadline_date=datetime(2026, 1, 5), days_remaining=2, application_url="https://apply.test/?a=1&b=2",
+    )
+
+    email = sent[0]
+    assert email["subject"] == "🔴 URGENT: Law deadline in 2 day(s)"
+    assert "#dc2626" in email["html"] and "January 05, 2026" in email["html"]
+    assert 'href="https://apply.test/?a=1&amp;b=2"' in email["html"]
+    assert "Apply now: https://apply.test/?a=1&b=2" in email["text"]
+    assert "{{" not in email["html"]
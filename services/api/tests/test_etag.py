@@ -0,0 +1,75 @@
+"""
+Conditional GET Tests
+Tests for ETag / If-None-Match support on catalog endpoints
+"""
+from unittest.mock import MagicMock
+
+from fastapi import Response
+from starlette.requests import Request
+
+from core.dependencies import get_institution_service
+from core.etag import conditional_response, etag_matches, set_current_etag
+from main import app
+
+
+class StubInstitutionService:
+    """Returns a fixed programs page without touching the database"""
+
+    def __init__(self, programs):
+        self.programs = programs
+
+    async def get_programs(self, slug, page, page_size, **options):
+        return {
+            "data": self.programs,
+            "pagination": {"page": page, "page_size": page_size, "total": len(self.programs)},
+        }
+
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_etag_matching_rules():
+    """If-None-Match uses weak comparison and accepts lists and *"""
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"x", "a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+def test_cached_etag_skips_serialization():
+    """A 304 for a cached value never serializes the value"""
+    value = MagicMock()
+    value.model_dump.side_effect = AssertionError("should not serialize")
+
+    set_current_etag('"abc"')
+    result = conditional_response(make_request('"abc"'), Response(), value)
+
+    assert result.status_code == 304
+    assert result.headers["ETag"] == '"abc"'
+
+
+def test_institution_programs_conditional_get(client):
+    """Unchanged responses return 304, changed ones a new ETag"""
+    service = StubInstitutionService([{"id": "p1", "name": "Law"}])
+    app.dependency_overrides[get_institution_service] = lambda: service
+
+    try:
+        first = client.get("/api/v1/institutions/unilag/programs")
+        etag = first.headers["ETag"]
+        assert first.status_code == 200
+
+        cached = client.get("/api/v1/institutions/unilag/programs", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+        service.programs = [{"id": "p1", "name": "Law (LLB)"}]
+        changed = client.get("/api/v1/institutions/unilag/programs", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+    finally:
+        app.dependency_overrides.clear()
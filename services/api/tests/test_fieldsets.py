@@ -0,0 +1,148 @@
+"""
+Sparse Fieldset Tests
+Tests for `fields=` column selection on catalog list endpoints
+"""
+import httpx
+import pytest
+from postgrest import SyncPostgrestClient
+
+from core.cache import program_tags
+from core.config import settings
+from core.database import get_supabase
+from core.fieldsets import Fieldsets
+from main import app
+
+INSTITUTION = {
+    "id": "i1", "slug": "unilag", "name": "University of Lagos", "short_name": "UNILAG",
+    "type": "federal_university", "state": "Lagos", "city": "Lagos", "logo_url": None,
+    "website": "https://unilag.edu.ng", "verified": True, "description": "A long description",
+}
+PROGRAM = {
+    "id": "p1", "slug": "law", "name": "Law", "institution_id": "i1", "degree_type": "undergraduate",
+    "qualification": "LLB", "mode": "full_time", "is_active": True, "curriculum_summary": "Long text",
+}
+
+
+class Supabase:
+    """Supabase-like client that answers PostgREST with the requested columns only"""
+
+    def __init__(self):
+        self.requests = []
+
+        def handler(request):
+            params = dict(request.url.params)
+            self.requests.append((request.url.path.rsplit("/", 1)[-1], params))
+            if request.url.path.endswith("/institutions"):
+                rows = [INSTITUTION]
+            else:
+                institution = {"name": "University of Lagos", "slug": "unilag", "state": "Lagos"}
+                rows = [{**PROGRAM, "institution": institution}]
+            select = params.get("select", "*")
+            if select != "*":
+                columns = select.split(",")
+                rows = [{k: v for k, v in row.items() if k in columns or k == "institution"} for row in rows]
+            return httpx.Response(200, json=rows, headers={"Content-Range": f"0-{len(rows) - 1}/{len(rows)}"})
+
+        self.postgrest = SyncPostgrestClient(
+            "http://db.test/rest/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    def table(self, name):
+        return self.postgrest.from_(name)
+
+    def selects(self, table):
+        return [params.get("select") for name, params in self.requests if name == table]
+
+
+@pytest.fixture
+def supabase():
+    supabase = Supabase()
+    app.dependency_overrides[get_supabase] = lambda: supabase
+    yield supabase
+    app.dependency_overrides.pop(get_supabase, None)
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_card_preset_selects_card_columns(client, supabase, monkeypatch, fast):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+
+    response = client.get("/api/v1/institutions", params={"fields": "card"})
+
+    assert response.status_code == 200
+    assert supabase.selects("institutions") == ["id,name,slug,short_name,type,state,logo_url,verified"]
+    # No program_count in the card, so no program count query
+    assert supabase.selects("programs") == []
+    assert set(response.json()["data"][0]) == {
+        "id", "slug", "name", "short_name", "type", "state", "logo_url", "verified",
+    }
+
+
+def test_default_is_the_detail_list(client, supabase):
+    response = client.get("/api/v1/institutions")
+
+    assert response.status_code == 200
+    assert "description" not in supabase.selects("institutions")[0].split(",")
+    assert supabase.selects("programs") == ["institution_id"]
+    assert response.json()["data"][0]["program_count"] == 1
+    assert response.json()["data"][0]["website"] == "https://unilag.edu.ng"
+
+
+def test_explicit_fields_keep_pagination_keys(client, supabase):
+    response = client.get("/api/v1/institutions", params={"fields": "state, program_count"})
+
+    assert response.status_code == 200
+    assert supabase.selects("institutions") == ["id,name,state"]
+    assert response.json()["data"] == [
+        {"id": "i1", "name": "University of Lagos", "state": "Lagos", "program_count": 1}
+    ]
+
+
+def test_unknown_fields_are_rejected(client, supabase):
+    response = client.get("/api/v1/programs", params={"fields": "name,curriculum_summary"})
+
+    assert response.status_code == 400
+    assert "curriculum_summary" in response.json()["detail"]
+    assert supabase.requests == []
+
+
+def test_program_card_embeds_only_requested_institution_fields(client, supabase):
+    response = client.get("/api/v1/programs", params={"fields": "card"})
+
+    assert response.status_code == 200
+    assert supabase.selects("programs") == [
+        "id,name,institution_id,slug,degree_type,qualification,mode,institution:institutions(name,slug)"
+    ]
+    assert response.json()["data"] == [{
+        "id": "p1", "slug": "law", "name": "Law", "institution_id": "i1", "institution_name": "University of Lagos",
+        "institution_slug": "unilag", "degree_type": "undergraduate", "qualification": "LLB", "mode": "full_time",
+    }]
+    # Cached card pages are invalidated by program edits and institution renames
+    assert program_tags(response.json()) == ["institution:i1", "program:p1"]
+
+
+def test_state_filter_joins_without_institution_fields(client, supabase):
+    response = client.get("/api/v1/programs", params={"fields": "id,slug", "state": "Lagos"})
+
+    assert response.status_code == 200
+    assert supabase.selects("programs") == ["id,name,institution_id,slug,institution:institutions!inner(state)"]
+    assert response.json()["data"] == [{"id": "p1", "slug": "law", "name": "Law", "institution_id": "i1"}]
+    assert program_tags(response.json()) == ["institution:i1", "program:p1"]
+
+
+def test_institution_programs_default_to_full_rows(client, supabase):
+    full = client.get("/api/v1/institutions/unilag/programs")
+    card = client.get("/api/v1/institutions/unilag/programs", params={"fields": "card"})
+
+    assert full.status_code == card.status_code == 200
+    assert supabase.selects("programs") == ["*", "id,name,institution_id,slug,degree_type,qualification,mode"]
+    assert "curriculum_summary" in full.json()["data"][0]
+    assert "curriculum_summary" not in card.json()["data"][0]
+
+
+def test_equivalent_field_lists_share_a_key():
+    fieldsets = Fieldsets({"card": ["slug"], "detail": ["slug", "state", "city"]})
+
+    assert fieldsets.resolve("state,name").key == fieldsets.resolve(" name , id,state").key
+    assert fieldsets.resolve("state,name").fields == ("id", "name", "state")
+    assert fieldsets.resolve(None).preset == "detail"
@@ -0,0 +1,128 @@
+"""
+JWT Verifier Tests
+Tests for local Supabase access-token verification
+"""
+import time
+from types import SimpleNamespace
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk, jwt
+from supabase_auth.errors import AuthApiError
+
+from core import jwt_verifier
+from core.jwt_verifier import (
+    InvalidTokenError,
+    JWKSCache,
+    SupabaseTokenVerifier,
+    VerifiedToken,
+)
+
+SECRET = "super-secret-jwt-token-with-at-least-32-characters"
+
+
+def claims(**overrides):
+    now = int(time.time())
+    return {"sub": "user-1", "email": "ada@example.com", "aud": "authenticated", "role": "authenticated",
+            "iat": now, "exp": now + 3600, **overrides}
+
+
+class Remote:
+    """Stand-in for supabase.auth.get_user"""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+
+    async def __call__(self, token):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return SimpleNamespace(user=SimpleNamespace(id="user-1", email="ada@example.com"))
+
+
+def es256_key(kid):
+    private = ec.generate_private_key(ec.SECP256R1())
+    pem = private.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                serialization.NoEncryption())
+    public = jwk.construct(pem, "ES256").public_key().to_dict()
+    return pem, {**public, "kid": kid, "alg": "ES256"}
+
+
+async def test_hs256_tokens_are_verified_locally_and_cached():
+    verifier = SupabaseTokenVerifier(jwt_secret=SECRET)
+    remote = Remote()
+    token = jwt.encode(claims(), SECRET, algorithm="HS256")
+
+    first = await verifier.verify(token, remote)
+    second = await verifier.verify(token, remote)
+
+    assert isinstance(first, VerifiedToken) and second is first
+    assert first.user.id == "user-1" and first.user.email == "ada@example.com"
+    assert remote.calls == 0
+
+
+@pytest.mark.parametrize("token", [
+    jwt.encode(claims(exp=int(time.time()) - 120), SECRET, algorithm="HS256"),
+    jwt.encode(claims(aud="anon"), SECRET, algorithm="HS256"),
+    jwt.encode(claims(), "another-secret-another-secret-another", algorithm="HS256"),
+    "not-a-jwt",
+])
+async def test_invalid_tokens_are_rejected(token):
+    remote = Remote()
+    with pytest.raises(InvalidTokenError):
+        await SupabaseTokenVerifier(jwt_secret=SECRET).verify(token, remote)
+    assert remote.calls == 0
+
+
+async def test_without_secret_falls_back_to_supabase_auth_once():
+    verifier = SupabaseTokenVerifier()
+    remote = Remote()
+    token = jwt.encode(claims(), SECRET, algorithm="HS256")
+
+    await verifier.verify(token, remote)
+    user = await verifier.verify(token, remote)
+
+    assert user.user.id == "user-1" and remote.calls == 1
+
+
+async def test_jwks_keys_are_cached_and_refreshed_on_rotation(monkeypatch):
+    monkeypatch.setattr(jwt_verifier, "JWKS_MIN_REFRESH_SECONDS", 0)
+    old_pem, old_key = es256_key("old")
+    new_pem, new_key = es256_key("new")
+    published = {"keys": [old_key]}
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        return published
+
+    verifier = SupabaseTokenVerifier(jwks=JWKSCache("https://x.supabase.co/jwks", fetch=fetch))
+    remote = Remote()
+
+    for i in range(3):
+        token = jwt.encode(claims(n=i), old_pem, algorithm="ES256", headers={"kid": "old"})
+        assert (await verifier.verify(token, remote)).user.id == "user-1"
+    assert len(fetches) == 1
+
+    # Signing key rotated: the unknown kid triggers one refetch
+    published = {"keys": [old_key, new_key]}
+    token = jwt.encode(claims(), new_pem, algorithm="ES256", headers={"kid": "new"})
+    assert (await verifier.verify(token, remote)).user.id == "user-1"
+    assert len(fetches) == 2 and remote.calls == 0
+
+    forged = jwt.encode(claims(), old_pem, algorithm="ES256", headers={"kid": "new"})
+    with pytest.raises(InvalidTokenError):
+        await verifier.verify(forged, remote)
+
+
+async def test_sampled_revocation_check_evicts_revoked_user():
+    verifier = SupabaseTokenVerifier(jwt_secret=SECRET, revocation_sample_rate=1.0)
+    token = jwt.encode(claims(), SECRET, algorithm="HS256")
+    await verifier.verify(token, Remote())
+
+    revoked = Remote(error=AuthApiError("Session not found", 403, "session_not_found"))
+    with pytest.raises(InvalidTokenError):
+        await verifier.verify(token, revoked)
+    assert revoked.calls == 1 and len(verifier.cache) == 0
@@ -0,0 +1,173 @@
+"""
+Notification Service Tests
+Tests for the set-based deadline alert engine and incremental saved-search
+notifications
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from postgrest import SyncPostgrestClient
+
+from services.notification_service import NotificationService
+
+
+class FakeEmailService:
+    """Records deadline alerts, reporting repeated idempotency keys as duplicates"""
+
+    def __init__(self, fail_for=()):
+        self.sent = []
+        self.keys = set()
+        self.fail_for = set(fail_for)
+
+    async def send_deadline_alert(self, **alert):
+        await asyncio.sleep(0)
+        if alert["to"] in self.fail_for:
+            raise RuntimeError("provider error")
+        if alert["idempotency_key"] in self.keys:
+            return {"id": "x", "duplicate": True}
+        self.keys.add(alert["idempotency_key"])
+        self.sent.append(alert)
+        return {"id": "x"}
+
+    async def send_saved_search_notification(self, **notification):
+        self.sent.append(notification)
+        return {"id": "x"}
+
+
+def make_client(handler):
+    class Client:
+        postgrest = SyncPostgrestClient(
+            "http://db.test/rest/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        def table(self, name):
+            return self.postgrest.from_(name)
+
+    return Client()
+
+
+async def test_deadline_alerts_use_bulk_queries():
+    """A handful of queries regardless of how many programs/bookmarks match"""
+    deadline = (datetime.now(timezone.utc) + timedelta(days=3, hours=1)).isoformat()
+
+    programs = [
+        {"id": f"p{i}", "name": f"Program {i}", "institution_id": "i1",
+         "application_deadline": deadline, "institution": {"name": "UNILAG"}}
+        for i in range(20)
+    ]
+    bookmarks = [
+        {"id": f"b{u}-{i}", "user_id": f"u{u}", "entity_id": f"p{i}"}
+        for u in range(5) for i in range(20)
+    ]
+    # Duplicate bookmark and a user without an email
+    bookmarks.append({"id": "dup", "user_id": "u0", "entity_id": "p0"})
+    users = [{"id": f"u{u}", "full_name": f"User {u}", "email": f"u{u}@example.com"} for u in range(4)]
+    users.append({"id": "u4", "full_name": "No Email", "email": None})
+
+    requests = []
+
+    def handler(request):
+        table = request.url.path.rsplit("/", 1)[-1]
+        requests.append(table)
+        rows = {"programs": programs, "user_bookmarks": bookmarks, "user_profiles": users}[table]
+        return httpx.Response(200, json=rows)
+
+    email = FakeEmailService(fail_for={"u3@example.com"})
+    service = NotificationService(make_client(handler), email, search_service=None)
+
+    result = await service.send_deadline_alerts(days_before=7)
+
+    assert requests == ["programs", "user_bookmarks", "user_profiles"]
+    assert result == {"sent": 60, "failed": 20, "skipped": 0}
+    alert = email.sent[0]
+    assert alert["institution_name"] == "UNILAG"
+    assert alert["days_remaining"] == 3
+
+    # Re-running the job the same day sends nothing twice
+    rerun = await service.send_deadline_alerts(days_before=7)
+    assert rerun == {"sent": 0, "failed": 20, "skipped": 60}
+
+
+async def test_deadline_alerts_without_programs_send_nothing():
+    """No upcoming deadlines means one query and no emails"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=[])
+
+    email = FakeEmailService()
+    service = NotificationService(make_client(handler), email, search_service=None)
+
+    assert await service.send_deadline_alerts() == {"sent": 0, "failed": 0, "skipped": 0}
+    assert len(requests) == 1
+
+
+async def test_saved_search_notifications_only_touch_matching_searches():
+    """Changed programs are matched in memory; only matching searches are emailed"""
+    searches = [
+        {"id": "s-law", "user_id": "u1", "name": "Law in Lagos", "query": "law",
+         "filters": {"state": ["Lagos"]}, "notify_on_new_results": True,
+         "created_at": "2026-01-01T00:00:00+00:00", "last_notified_at": None},
+        {"id": "s-med", "user_id": "u2", "name": "Medicine", "query": "medicine",
+         "filters": {}, "notify_on_new_results": True,
+         "created_at": "2026-01-01T00:00:00+00:00", "last_notified_at": None},
+    ]
+    programs = [
+        {"id": "p-law", "name": "Law", "status": "published", "is_active": True,
+         "created_at": "2026-02-01T00:00:00+00:00", "updated_at": "2026-02-01T00:00:00+00:00",
+         "institution": {"name": "UNILAG", "state": "Lagos"}},
+        {"id": "p-old-law", "name": "Law", "status": "published", "is_active": True,
+         "created_at": "2025-06-01T00:00:00+00:00", "updated_at": "2026-02-02T00:00:00+00:00",
+         "institution": {"name": "UNILAG", "state": "Lagos"}},
+    ]
+    users = [{"id": "u1", "full_name": "Ada", "email": "ada@example.com"}]
+    matches, writes = [], []
+
+    def handler(request):
+        table = request.url.path.rsplit("/", 1)[-1]
+        if request.method == "GET":
+            rows = {
+                "job_watermarks": [],
+                "programs": programs,
+                "user_saved_searches": searches,
+                "saved_search_matches": matches,
+                "user_profiles": users,
+            }[table]
+            ids = request.url.params.get("id", "")
+            if ids.startswith("in.("):
+                rows = [row for row in rows if row["id"] in ids[4:-1].split(",")]
+            return httpx.Response(200, json=rows)
+        body = json.loads(request.content) if request.content else None
+        writes.append((request.method, table, body))
+        if table == "saved_search_matches" and request.method == "POST":
+            matches.extend(body)
+        return httpx.Response(201 if request.method == "POST" else 200, json=[])
+
+    email = FakeEmailService()
+    service = NotificationService(make_client(handler), email, search_service=None)
+
+    result = await service.process_all_saved_searches()
+
+    # Only the new Lagos law program matches, and only the law search
+    assert matches == [{"saved_search_id": "s-law", "program_id": "p-law"}]
+    assert result == {"matched": 1, "checked": 1, "sent": 1, "failed": 0}
+    assert email.sent[0]["to"] == "ada@example.com"
+    assert email.sent[0]["results_preview"] == [{"name": "Law", "institution": "UNILAG", "state": "Lagos"}]
+    assert ("POST", "job_watermarks", {"name": "saved_search_matches", "watermark": "2026-02-02T00:00:00+00:00"}) in writes
+    assert [w[:2] for w in writes if w[0] == "PATCH"] == [
+        ("PATCH", "saved_search_matches"), ("PATCH", "user_saved_searches")
+    ]
+
+
+def test_router_uses_a_service_role_client():
+    """Saved searches are owner-only and the job tables admin-only under RLS"""
+    from core.config import settings
+    from routers.notifications import get_notification_service
+
+    service = get_notification_service(email_service=FakeEmailService(), search_service=None)
+
+    assert service.supabase.postgrest.headers["authorization"] == f"Bearer {settings.SUPABASE_SERVICE_KEY}"
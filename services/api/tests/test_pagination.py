@@ -0,0 +1,143 @@
+"""
+Pagination Tests
+Tests for keyset (cursor) pagination helpers and cursor-mode listings
+"""
+import httpx
+import pytest
+from fastapi import HTTPException
+from postgrest import SyncPostgrestClient
+
+from core.pagination import (
+    NAME_ORDER,
+    RECENT_ORDER,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+)
+from schemas.programs import ProgramFilters
+from services.program_service import ProgramService
+
+
+def mock_client(handler):
+    """Supabase-like client whose PostgREST requests go to `handler`"""
+
+    class Client:
+        postgrest = SyncPostgrestClient(
+            "http://db.test/rest/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        def table(self, name):
+            return self.postgrest.from_(name)
+
+    return Client()
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque and decode to the row's sort-key values"""
+    cursor = encode_cursor({"id": "p9", "name": "Law, (LLB)", "slug": "law"}, NAME_ORDER)
+
+    assert "Law" not in cursor
+    assert decode_cursor(cursor, NAME_ORDER) == ["Law, (LLB)", "p9"]
+
+
+def test_cursor_rejects_garbage_and_other_sort_orders():
+    """Malformed cursors and cursors for a different sort are 400s"""
+    cursor = encode_cursor({"id": "p9", "name": "Law"}, NAME_ORDER)
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", NAME_ORDER)
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, RECENT_ORDER)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_filter_expands_row_comparison():
+    """(a, b) > (x, y) becomes a PostgREST or/and tree with quoted values"""
+    assert keyset_filter(NAME_ORDER, ["Law, (LLB)", "p9"]) == (
+        'name.gt."Law, (LLB)",and(name.eq."Law, (LLB)",id.gt."p9")'
+    )
+    assert keyset_filter(RECENT_ORDER, ["2025-01-01T00:00:00+00:00", "p9"]) == (
+        'updated_at.lt."2025-01-01T00:00:00+00:00",'
+        'and(updated_at.eq."2025-01-01T00:00:00+00:00",id.lt."p9")'
+    )
+
+
+async def test_list_programs_cursor_mode():
+    """Cursor mode seeks past the cursor, over-fetches one row and asks for an estimate"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        rows = [
+            {
+                "id": f"p{i}", "institution_id": "i1", "slug": f"p{i}", "name": f"Program {i}",
+                "degree_type": "undergraduate", "status": "published", "is_active": True,
+                "institution": {"name": "University of Lagos", "slug": "unilag", "state": "Lagos"},
+            }
+            for i in range(3)
+        ]
+        return httpx.Response(200, json=rows, headers={"Content-Range": "0-2/5000"})
+
+    service = ProgramService(mock_client(handler))
+    first = await service._query_list_programs(ProgramFilters(paginate="cursor", page_size=2))
+
+    params = requests[0].url.params
+    assert params["limit"] == "3"
+    assert params["order"] == "name.asc,id.asc"
+    assert "offset" not in params
+    assert "count=estimated" in requests[0].headers["prefer"]
+    assert [p.id for p in first.data] == ["p0", "p1"]
+    assert first.pagination.has_next and not first.pagination.has_prev
+    assert first.pagination.estimated and first.pagination.total == 5000
+
+    second = await service._query_list_programs(
+        ProgramFilters(cursor=first.pagination.next_cursor, page_size=2)
+    )
+
+    assert requests[1].url.params["or"] == '(name.gt."Program 1",and(name.eq."Program 1",id.gt."p1"))'
+    assert second.pagination.has_prev
+
+
+@pytest.mark.parametrize("listing", ["admin_programs", "bookmarks", "saved_searches"])
+async def test_listings_use_one_round_trip(listing):
+    """Rows and the exact count come back from a single request"""
+    from services.admin_program_service import AdminProgramService
+    from services.bookmark_service import BookmarkService
+    from services.saved_search_service import SavedSearchService
+
+    requests = []
+    row = {
+        "id": "r1", "name": "Law", "slug": "law", "institution_id": "i1", "degree_type": "undergraduate",
+        "duration_years": 4, "mode": "full_time", "status": "published",
+        "entity_type": "program", "entity_id": "p1", "query": "law",
+        "created_at": "2025-01-01T00:00:00+00:00", "updated_at": "2025-01-01T00:00:00+00:00",
+    }
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=[row], headers={"Content-Range": "0-0/45"})
+
+    client = mock_client(handler)
+    if listing == "admin_programs":
+        result = await AdminProgramService(client).list_programs(page=2, page_size=20)
+        pagination = result["pagination"]
+    elif listing == "bookmarks":
+        service = BookmarkService(client, "u1")
+        service._get_entities_details = lambda bookmarks: _no_entities()
+        pagination = (await service.list_bookmarks(page=2, page_size=20)).pagination
+    else:
+        pagination = (await SavedSearchService(client, "u1").list_saved_searches(page=2, page_size=20)).pagination
+
+    assert len(requests) == 1
+    assert "count=exact" in requests[0].headers["prefer"]
+    assert requests[0].url.params["offset"] == "20"
+    assert pagination["total"] == 45
+    assert pagination["total_pages"] == 3
+    assert pagination["has_prev"] and pagination["has_next"]
+
+
+async def _no_entities():
+    return {}
@@ -361,3 +361,41 @@ def test_program_detail_has_extra_fields(client: TestClient):
                 # Detail should have timestamps
                 assert "created_at" in program
                 assert "updated_at" in program
+
+
+async def test_state_filter_is_applied_in_sql():
+    """State filter uses an inner-joined embed so the DB returns one exact page"""
+    import httpx
+    from postgrest import SyncPostgrestClient
+
+    from schemas.programs import ProgramFilters
+    from services.program_service import ProgramService
+
+    seen = {}
+
+    def handler(request):
+        seen["params"] = dict(request.url.params)
+        row = {
+            "id": "p1", "institution_id": "i1", "slug": "law", "name": "Law",
+            "degree_type": "undergraduate", "status": "published", "is_active": True,
+            "institution": {"name": "University of Lagos", "slug": "unilag", "state": "Lagos"},
+        }
+        return httpx.Response(200, json=[row], headers={"Content-Range": "0-0/41"})
+
+    class Client:
+        postgrest = SyncPostgrestClient(
+            "http://db.test/rest/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        def table(self, name):
+            return self.postgrest.from_(name)
+
+    result = await ProgramService(Client())._query_list_programs(
+        ProgramFilters(state=["Lagos", "Ogun"], page=1, page_size=1)
+    )
+
+    assert "institutions!inner" in seen["params"]["select"]
+    assert seen["params"]["institution.state"] == "in.(Lagos,Ogun)"
+    assert result.pagination.total == 41
+    assert len(result.data) == 1
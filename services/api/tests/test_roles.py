@@ -0,0 +1,82 @@
+"""
+Role Resolution Tests
+Tests for cached admin role lookups
+"""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from postgrest import SyncPostgrestClient
+
+from core.dependencies import require_admin
+from core.jwt_verifier import VerifiedToken
+from core.roles import RoleResolver
+
+
+class Profiles:
+    """user_profiles over a mock PostgREST, counting queries"""
+
+    def __init__(self, roles):
+        self.roles = roles
+        self.queries = 0
+        transport = httpx.MockTransport(self.handle)
+        self.postgrest = SyncPostgrestClient("http://db.test/rest/v1", http_client=httpx.Client(transport=transport))
+
+    def table(self, name):
+        return self.postgrest.from_(name)
+
+    def handle(self, request):
+        self.queries += 1
+        user_id = request.url.params["id"].removeprefix("eq.")
+        if user_id not in self.roles:
+            return httpx.Response(406, json={
+                "code": "PGRST116", "message": "JSON object requested, multiple (or no) rows returned",
+                "details": "The result contains 0 rows", "hint": None,
+            })
+        return httpx.Response(200, json={"role": self.roles[user_id]})
+
+
+def user(user_id, **claims):
+    return VerifiedToken.from_claims({"sub": user_id, "exp": 0, **claims})
+
+
+async def test_role_is_cached_per_user_and_lookups_coalesce():
+    profiles = Profiles({"u1": "internal_admin", "u2": "student"})
+    resolver = RoleResolver(ttl_seconds=60)
+
+    roles = await asyncio.gather(*(resolver.get_role(user("u1"), profiles) for _ in range(5)))
+    assert roles == ["internal_admin"] * 5
+    assert await resolver.get_role(SimpleNamespace(user=SimpleNamespace(id="u1")), profiles) == "internal_admin"
+    assert profiles.queries == 1
+
+    assert await resolver.get_role(user("u2"), profiles) == "student"
+    resolver.invalidate("u1")
+    await resolver.get_role(user("u1"), profiles)
+    assert profiles.queries == 3
+
+
+async def test_signed_role_claim_skips_the_lookup():
+    profiles = Profiles({})
+    resolver = RoleResolver()
+
+    assert await resolver.get_role(user("u1", user_role="internal_admin"), profiles) == "internal_admin"
+    assert profiles.queries == 0
+    # user_metadata is user-editable and never consulted
+    assert await resolver.get_role(user("u1", user_metadata={"role": "internal_admin"}), profiles) is None
+
+
+async def test_require_admin_rejects_other_roles(monkeypatch):
+    from core import dependencies
+
+    monkeypatch.setattr(dependencies, "role_resolver", RoleResolver())
+    profiles = Profiles({"admin": "internal_admin", "student": "student"})
+
+    await require_admin(user("admin"), profiles)
+    with pytest.raises(HTTPException) as denied:
+        await require_admin(user("student"), profiles)
+    assert denied.value.status_code == 403
+    with pytest.raises(HTTPException) as missing:
+        await require_admin(user("nobody"), profiles)
+    assert missing.value.status_code == 403 and "not found" in missing.value.detail
@@ -0,0 +1,162 @@
+"""
+Saved Search Matcher Tests
+Tests for reverse matching of programs against the saved-search index
+"""
+import asyncio
+import random
+import time
+
+import httpx
+from postgrest import SyncPostgrestClient
+
+from services.saved_search_matcher import (
+    SavedSearchMatcher,
+    SavedSearchPredicate,
+    program_document,
+)
+
+
+def program(**overrides):
+    row = {
+        "id": "p1", "name": "Computer Science", "degree_type": "undergraduate", "mode": "full_time",
+        "field_of_study": "Engineering", "status": "published", "is_active": True,
+        "created_at": "2026-02-01T00:00:00+00:00",
+        "institution": {"name": "University of Lagos", "state": "Lagos"},
+    }
+    row.update(overrides)
+    return program_document(row)
+
+
+def test_predicate_mirrors_program_search():
+    """Any-of list filters, all query words (last one as a prefix), published only"""
+    predicate = SavedSearchPredicate.from_saved_search(
+        "computer sci", {"state": ["Lagos", "Ogun"], "degree_type": ["undergraduate"]}
+    )
+
+    assert predicate.matches(program())
+    assert not predicate.matches(program(institution={"name": "OAU", "state": "Osun"}))
+    assert not predicate.matches(program(name="Computer Engineering"))
+    assert not predicate.matches(program(status="draft"))
+    assert SavedSearchPredicate.from_saved_search("lagos", {}).matches(program())
+    # Ranges never match a missing value
+    assert not SavedSearchPredicate.from_saved_search("computer", {"max_tuition": 500000}).matches(program())
+
+
+def test_matcher_groups_identical_searches_and_respects_notification_window():
+    matcher = SavedSearchMatcher()
+    matcher.rebuild([
+        {"id": "s1", "query": "Computer", "filters": {"state": ["Lagos"]}, "created_at": "2026-01-01T00:00:00Z"},
+        {"id": "s2", "query": "computer", "filters": {"state": ["Lagos"]}, "created_at": "2026-01-01T00:00:00Z"},
+        {"id": "s3", "query": "computer", "filters": {}, "created_at": "2026-01-01T00:00:00Z",
+         "last_notified_at": "2026-03-01T00:00:00Z"},
+        {"id": "s4", "query": "medicine", "filters": {}, "created_at": "2026-01-01T00:00:00Z"},
+    ])
+
+    assert len(matcher) == 4 and matcher.group_count == 3
+    assert sorted(matcher.match([program()])) == [("s1", "p1"), ("s2", "p1")]
+
+    matcher.remove("s1")
+    assert matcher.match([program()]) == [("s2", "p1")]
+
+
+def test_inverted_index_agrees_with_brute_force():
+    """Candidates from the postings never miss a matching search"""
+    rng = random.Random(7)
+    states = ["Lagos", "Ogun", "Oyo", "Kano", "Rivers"]
+    degrees = ["undergraduate", "nd", "hnd"]
+    queries = ["computer", "computer science", "law", "medicine", "engineering", "science lagos", "comp"]
+    searches = []
+    for i in range(2000):
+        filters = {}
+        if rng.random() < 0.6:
+            filters["state"] = rng.sample(states, rng.randint(1, 2))
+        if rng.random() < 0.5:
+            filters["degree_type"] = [rng.choice(degrees)]
+        searches.append({
+            "id": f"s{i}", "query": rng.choice(queries), "filters": filters,
+            "created_at": "2026-01-01T00:00:00Z",
+        })
+    matcher = SavedSearchMatcher()
+    matcher.rebuild(searches)
+
+    for state in states:
+        for degree in degrees:
+            document = program(degree_type=degree, institution={"name": "Federal University", "state": state})
+            expected = sorted(
+                (s["id"], "p1") for s in searches
+                if SavedSearchPredicate.from_saved_search(s["query"], s["filters"]).matches(document)
+            )
+            assert sorted(matcher.match([document])) == expected
+            assert len(matcher.candidates(document, set())) < matcher.group_count
+
+
+async def test_index_is_patched_and_refreshed_incrementally():
+    rows = [
+        {"id": "s1", "query": "computer", "filters": {}, "notify_on_new_results": True,
+         "created_at": "2026-01-01T00:00:00Z", "updated_at": "2026-01-01T00:00:00Z"},
+    ]
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.params)
+        return httpx.Response(200, json=rows)
+
+    class Client:
+        postgrest = SyncPostgrestClient(
+            "http://db.test/rest/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        def table(self, name):
+            return self.postgrest.from_(name)
+
+    matcher = SavedSearchMatcher()
+    assert await matcher.refresh(Client()) == 1
+    assert requests[0]["notify_on_new_results"] == "eq.True"
+    assert matcher.match([program()]) == [("s1", "p1")]
+
+    # Patched in-process by SavedSearchService
+    matcher.sync({"id": "s2", "query": "science", "filters": {}, "notify_on_new_results": True,
+                  "created_at": "2026-01-01T00:00:00Z"})
+    assert sorted(matcher.match([program()])) == [("s1", "p1"), ("s2", "p1")]
+
+    # Another worker turned notifications off: picked up from the watermark
+    rows[:] = [{**rows[0], "notify_on_new_results": False, "updated_at": "2026-01-02T00:00:00Z"}]
+    await matcher.refresh(Client())
+    assert requests[1]["updated_at"] == "gte.2026-01-01T00:00:00Z"
+    assert matcher.match([program()]) == [("s2", "p1")]
+
+
+async def test_refreshes_are_serialized_and_swap_the_index():
+    rows = [
+        {"id": "s1", "query": "computer", "filters": {}, "notify_on_new_results": True,
+         "created_at": "2026-01-01T00:00:00Z", "updated_at": "2026-01-01T00:00:00Z"},
+    ]
+    in_flight = []
+    overlapped = []
+
+    def handler(request):
+        in_flight.append(request)
+        overlapped.append(len(in_flight) > 1)
+        time.sleep(0.05)
+        in_flight.remove(request)
+        return httpx.Response(200, json=rows)
+
+    class Client:
+        postgrest = SyncPostgrestClient(
+            "http://db.test/rest/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+        def table(self, name):
+            return self.postgrest.from_(name)
+
+    matcher = SavedSearchMatcher()
+    refreshes = asyncio.gather(*(matcher.refresh(Client()) for _ in range(3)))
+    # The loop stays free to match while the index loads off-thread
+    await asyncio.sleep(0.01)
+    assert matcher.match([program()]) == []
+
+    assert await refreshes == [1, 1, 1]
+    assert not any(overlapped)
+    assert matcher.match([program()]) == [("s1", "p1")]
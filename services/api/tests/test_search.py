@@ -4,7 +4,7 @@ Comprehensive tests for search functionality
 """
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 import meilisearch
 
 from main import app
@@ -20,6 +20,17 @@ def client():
 def mock_meilisearch_client():
     """Mock Meilisearch client"""
     client = MagicMock()
+
+    async def _multi_search(queries):
+        # Dispatch each query to the per-index mock so tests can mock indexes
+        results = []
+        for query in queries:
+            params = {k: v for k, v in query.items() if k not in ("indexUid", "q")}
+            result = await client.index(query["indexUid"]).search(query["q"], params)
+            results.append({"indexUid": query["indexUid"], **result})
+        return {"results": results}
+
+    client.multi_search = _multi_search
     return client
 
 
@@ -42,7 +53,7 @@ def override_search_service(mock_meilisearch_client):
 def test_search_institutions_success(client, mock_meilisearch_client, override_search_service):
     """Test successful institution search"""
     # Setup mock response
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.return_value = {
         "hits": [
             {
@@ -66,7 +77,7 @@ def test_search_institutions_success(client, mock_meilisearch_client, override_s
         "estimatedTotalHits": 1,
         "processingTimeMs": 5,
     }
-    programs_index = MagicMock()
+    programs_index = AsyncMock()
     programs_index.search.return_value = {
         "hits": [],
         "estimatedTotalHits": 0,
@@ -93,13 +104,13 @@ def test_search_institutions_success(client, mock_meilisearch_client, override_s
 def test_search_programs_success(client, mock_meilisearch_client, override_search_service):
     """Test successful program search"""
     # Setup mock response
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.return_value = {
         "hits": [],
         "estimatedTotalHits": 0,
         "processingTimeMs": 2,
     }
-    programs_index = MagicMock()
+    programs_index = AsyncMock()
     programs_index.search.return_value = {
         "hits": [
             {
@@ -147,7 +158,7 @@ def test_search_programs_success(client, mock_meilisearch_client, override_searc
 def test_search_all_types(client, mock_meilisearch_client, override_search_service):
     """Test search across all types"""
     # Setup mock response
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.return_value = {
         "hits": [
             {
@@ -171,7 +182,7 @@ def test_search_all_types(client, mock_meilisearch_client, override_search_servi
         "estimatedTotalHits": 1,
         "processingTimeMs": 5,
     }
-    programs_index = MagicMock()
+    programs_index = AsyncMock()
     programs_index.search.return_value = {
         "hits": [
             {
@@ -215,16 +226,37 @@ def test_search_all_types(client, mock_meilisearch_client, override_search_servi
     assert data["data"]["total_results"] == 2
 
 
+def test_search_all_uses_single_multi_search(client, mock_meilisearch_client, override_search_service):
+    """type=all sends both index queries in one multi-search round trip"""
+    index = AsyncMock()
+    index.search.return_value = {"hits": [], "estimatedTotalHits": 0, "processingTimeMs": 3}
+    mock_meilisearch_client.index = lambda name: index
+
+    calls = []
+    multi_search = mock_meilisearch_client.multi_search
+
+    async def _counting_multi_search(queries):
+        calls.append([q["indexUid"] for q in queries])
+        return await multi_search(queries)
+
+    mock_meilisearch_client.multi_search = _counting_multi_search
+
+    response = client.get("/api/v1/search?q=computer&type=all")
+
+    assert response.status_code == 200
+    assert calls == [["institutions", "programs"]]
+
+
 def test_search_with_filters(client, mock_meilisearch_client, override_search_service):
     """Test search with filters"""
     # Setup mock response
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.return_value = {
         "hits": [],
         "estimatedTotalHits": 0,
         "processingTimeMs": 2,
     }
-    programs_index = MagicMock()
+    programs_index = AsyncMock()
     programs_index.search.return_value = {
         "hits": [
             {
@@ -278,7 +310,7 @@ def test_search_typo_tolerance(client, mock_meilisearch_client, override_search_
     """Test typo-tolerant search"""
     # Meilisearch handles typo tolerance internally
     # We just verify the search works with misspelled query
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.return_value = {
         "hits": [
             {
@@ -302,7 +334,7 @@ def test_search_typo_tolerance(client, mock_meilisearch_client, override_search_
         "estimatedTotalHits": 1,
         "processingTimeMs": 5,
     }
-    programs_index = MagicMock()
+    programs_index = AsyncMock()
     programs_index.search.return_value = {
         "hits": [],
         "estimatedTotalHits": 0,
@@ -324,7 +356,7 @@ def test_search_typo_tolerance(client, mock_meilisearch_client, override_search_
 
 def test_search_pagination(client, mock_meilisearch_client, override_search_service):
     """Test search pagination"""
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.return_value = {
         "hits": [{"id": f"inst-{i}", "slug": f"inst-{i}", "name": f"Institution {i}",
                   "type": "federal_university", "state": "Lagos", "city": "Lagos",
@@ -333,7 +365,7 @@ def test_search_pagination(client, mock_meilisearch_client, override_search_serv
         "estimatedTotalHits": 50,
         "processingTimeMs": 5,
     }
-    programs_index = MagicMock()
+    programs_index = AsyncMock()
     programs_index.search.return_value = {
         "hits": [],
         "estimatedTotalHits": 0,
@@ -363,13 +395,13 @@ def test_search_pagination(client, mock_meilisearch_client, override_search_serv
 
 def test_search_empty_results(client, mock_meilisearch_client, override_search_service):
     """Test search with no results"""
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.return_value = {
         "hits": [],
         "estimatedTotalHits": 0,
         "processingTimeMs": 2,
     }
-    programs_index = MagicMock()
+    programs_index = AsyncMock()
     programs_index.search.return_value = {
         "hits": [],
         "estimatedTotalHits": 0,
@@ -411,7 +443,7 @@ def test_search_invalid_type(client):
 
 def test_autocomplete_endpoint(client, mock_meilisearch_client, override_search_service):
     """Test autocomplete endpoint"""
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.return_value = {
         "hits": [
             {
@@ -426,7 +458,7 @@ def test_autocomplete_endpoint(client, mock_meilisearch_client, override_search_
         "estimatedTotalHits": 1,
         "processingTimeMs": 3,
     }
-    programs_index = MagicMock()
+    programs_index = AsyncMock()
     programs_index.search.return_value = {
         "hits": [
             {
@@ -474,7 +506,7 @@ def test_autocomplete_query_too_short(client):
 
 def test_autocomplete_limit_enforced(client, mock_meilisearch_client, override_search_service):
     """Test autocomplete respects limit parameter"""
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.return_value = {
         "hits": [{"id": f"inst-{i}", "slug": f"inst-{i}", "name": f"Institution {i}",
                   "state": "Lagos", "type": "federal_university", "short_name": f"INST{i}"}
@@ -482,7 +514,7 @@ def test_autocomplete_limit_enforced(client, mock_meilisearch_client, override_s
         "estimatedTotalHits": 10,
         "processingTimeMs": 3,
     }
-    programs_index = MagicMock()
+    programs_index = AsyncMock()
     programs_index.search.return_value = {
         "hits": [{"id": f"prog-{i}", "slug": f"prog-{i}", "name": f"Program {i}",
                   "institution_name": "Test", "institution_slug": "test",
@@ -507,7 +539,7 @@ def test_autocomplete_limit_enforced(client, mock_meilisearch_client, override_s
 
 def test_search_meilisearch_error(client, mock_meilisearch_client, override_search_service):
     """Test search handles Meilisearch errors gracefully"""
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.side_effect = Exception("Connection error")
 
     mock_meilisearch_client.index = lambda name: institutions_index
@@ -522,7 +554,7 @@ def test_search_meilisearch_error(client, mock_meilisearch_client, override_sear
 
 def test_autocomplete_meilisearch_error(client, mock_meilisearch_client, override_search_service):
     """Test autocomplete handles Meilisearch errors gracefully"""
-    institutions_index = MagicMock()
+    institutions_index = AsyncMock()
     institutions_index.search.side_effect = Exception("Connection error")
 
     mock_meilisearch_client.index = lambda name: institutions_index
@@ -533,3 +565,97 @@ def test_autocomplete_meilisearch_error(client, mock_meilisearch_client, overrid
     # Assertions
     assert response.status_code == 500
     assert "Failed to execute autocomplete" in response.json()["detail"]
+
+
+# ===== Shared Meilisearch Client Tests =====
+
+def _client_with_transport(handler):
+    """Build an AsyncMeilisearchClient backed by an in-memory transport"""
+    import httpx
+
+    from core.search_client import AsyncMeilisearchClient
+
+    meili = AsyncMeilisearchClient("http://meili.test", "key")
+    meili._http = httpx.AsyncClient(
+        base_url="http://meili.test",
+        transport=httpx.MockTransport(handler),
+    )
+    return meili
+
+
+def test_meilisearch_client_is_app_scoped():
+    """Dependency returns the same client and cached index handles"""
+    from core.dependencies import get_meilisearch_client
+
+    meili = get_meilisearch_client()
+    assert meili is get_meilisearch_client()
+    assert meili.index("programs") is meili.index("programs")
+
+
+@pytest.mark.asyncio
+async def test_meilisearch_client_search_request():
+    """Index search posts the query and params to the search route"""
+    import json
+
+    import httpx
+
+    seen = {}
+
+    def handler(request):
+        seen["path"] = request.url.path
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json={"hits": [], "estimatedTotalHits": 0})
+
+    meili = _client_with_transport(handler)
+    result = await meili.index("programs").search("law", {"limit": 5})
+
+    assert seen["path"] == "/indexes/programs/search"
+    assert seen["body"] == {"q": "law", "limit": 5}
+    assert result["estimatedTotalHits"] == 0
+    await meili.close()
+
+
+@pytest.mark.asyncio
+async def test_meilisearch_client_raises_api_error():
+    """Non-2xx responses raise MeilisearchApiError"""
+    import httpx
+    from meilisearch.errors import MeilisearchApiError
+
+    def handler(request):
+        return httpx.Response(404, json={"message": "Index not found", "code": "index_not_found"})
+
+    meili = _client_with_transport(handler)
+    with pytest.raises(MeilisearchApiError):
+        await meili.index("missing").search("x")
+    await meili.close()
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_coalesces_identical_prefixes():
+    """Concurrent identical autocomplete requests share one backend call"""
+    import asyncio
+
+    from services.search_service import SearchService
+
+    calls = []
+
+    class SlowClient:
+        def index(self, name):
+            return MagicMock()
+
+        async def multi_search(self, queries):
+            calls.append(queries[0]["q"])
+            await asyncio.sleep(0.01)
+            return {"results": [
+                {"indexUid": "institutions", "hits": []},
+                {"indexUid": "programs", "hits": []},
+            ]}
+
+    service = SearchService(SlowClient())
+    await asyncio.gather(
+        service.autocomplete("Comp", 10),
+        service.autocomplete("comp ", 10),
+        service.autocomplete("comp", 10),
+    )
+
+    assert calls == ["comp"]
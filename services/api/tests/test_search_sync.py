@@ -0,0 +1,250 @@
+"""
+Search Sync Tests
+Tests for watermark-based incremental and change-driven Meilisearch sync
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from urllib.parse import parse_qsl
+
+import httpx
+import pytest
+from postgrest import SyncPostgrestClient
+
+import sync_meilisearch_production
+from services.search_indexer import LocalChangePublisher, SearchIndexer
+from services.search_sync import (
+    FileWatermarks,
+    IncrementalSync,
+    SyncTarget,
+    TableWatermarks,
+    program_counts,
+)
+
+
+def matches(row, column, condition):
+    op, _, value = condition.partition(".")
+    if op == "eq":
+        return str(row.get(column)) == value
+    if op == "is":
+        return row.get(column) is None
+    if op == "in":
+        return str(row.get(column)) in value.strip("()").split(",")
+    if op in ("gt", "gte"):
+        if row.get(column) is None:
+            return False
+        return row[column] > value or (op == "gte" and row[column] == value)
+    raise AssertionError(f"unsupported filter {condition}")
+
+
+class Database:
+    """In-memory PostgREST: eq/is/in/gt/gte filters, ordered by id, limit/offset"""
+
+    def __init__(self, **tables):
+        self.tables = tables
+        self.requests = []
+        transport = httpx.MockTransport(self.handle)
+        self.postgrest = SyncPostgrestClient("http://db.test/rest/v1", http_client=httpx.Client(transport=transport))
+
+    def table(self, name):
+        return self.postgrest.from_(name)
+
+    def handle(self, request):
+        name = request.url.path.rsplit("/", 1)[-1]
+        rows = self.tables.setdefault(name, [])
+        if request.method == "POST":
+            body = json.loads(request.content)
+            for row in body if isinstance(body, list) else [body]:
+                rows[:] = [r for r in rows if r["name"] != row["name"]] + [row]
+            return httpx.Response(201, json=[])
+
+        params = parse_qsl(request.url.query.decode())
+        self.requests.append((name, params))
+        limit, result = None, list(rows)
+        for key, value in params:
+            if key == "limit":
+                limit = int(value)
+            elif key not in ("select", "order", "offset"):
+                result = [row for row in result if matches(row, key, value)]
+        result.sort(key=lambda row: row["id"])
+        offset = int(dict(params).get("offset", 0))
+        result = result[offset:offset + limit if limit else None]
+        return httpx.Response(200, json=[dict(row) for row in result])
+
+
+class FakeIndex:
+    def __init__(self, client, uid):
+        self.client, self.uid = client, uid
+
+    def add_documents(self, documents, primary_key=None):
+        self.client.documents.setdefault(self.uid, {}).update({d["id"]: d for d in documents})
+        return self.client.task()
+
+    def __getattr__(self, name):
+        if name.startswith("update_"):  # index settings
+            return lambda *args: self.client.task()
+        raise AttributeError(name)
+
+    def delete_documents(self, ids):
+        for uid in ids:
+            self.client.documents.setdefault(self.uid, {}).pop(uid, None)
+        return self.client.task()
+
+
+class FakeMeilisearch:
+    def __init__(self, fail=False):
+        self.documents = {}
+        self.tasks = 0
+        self.fail = fail
+
+    def index(self, uid):
+        return FakeIndex(self, uid)
+
+    def task(self):
+        self.tasks += 1
+        return SimpleNamespace(task_uid=self.tasks)
+
+    def wait_for_task(self, uid, timeout_in_ms=None):
+        return SimpleNamespace(status="failed" if self.fail else "succeeded", error={"code": "bad"})
+
+
+def institution(id, name, updated_at, **extra):
+    return {"id": id, "name": name, "status": "published", "deleted_at": None, "updated_at": updated_at, **extra}
+
+
+def program(id, institution_id, updated_at, **extra):
+    return {"id": id, "name": f"Program {id}", "institution_id": institution_id, "status": "published",
+            "deleted_at": None, "updated_at": updated_at, **extra}
+
+
+def add_counts(supabase, rows):
+    counts = program_counts(supabase, [row["id"] for row in rows])
+    for row in rows:
+        row["program_count"] = counts.get(row["id"], 0)
+
+
+TARGETS = [
+    SyncTarget(
+        index="institutions", table="institutions", columns="*",
+        to_document=lambda row: {"id": row["id"], "name": row["name"], "program_count": row["program_count"]},
+        prepare=add_counts, follows=("programs", "id", "institution_id"),
+    ),
+    SyncTarget(
+        index="programs", table="programs", columns="*",
+        to_document=lambda row: {"id": row["id"], "institution_id": row["institution_id"]},
+        follows=("institutions", "institution_id", "id"),
+    ),
+]
+
+
+def test_first_run_indexes_live_rows_and_stores_watermarks():
+    db = Database(
+        institutions=[institution("i1", "UNILAG", "2026-01-01T00:00:00+00:00"),
+                      institution("i2", "Closed", "2026-01-02T00:00:00+00:00", status="draft")],
+        programs=[program(f"p{n}", "i1", f"2026-01-0{n}T00:00:00+00:00") for n in range(1, 6)]
+        + [program("p9", "i1", "2026-01-09T00:00:00+00:00", deleted_at="2026-01-09T00:00:00+00:00")],
+    )
+    meili = FakeMeilisearch()
+
+    results = IncrementalSync(db, meili, TableWatermarks(db), page_size=2).sync_once(TARGETS)
+
+    assert results["programs"] == {"changed": 6, "upserted": 5, "deleted": 1}
+    assert results["institutions"] == {"changed": 2, "upserted": 1, "deleted": 1}
+    assert meili.documents["institutions"] == {"i1": {"id": "i1", "name": "UNILAG", "program_count": 5}}
+    assert sorted(meili.documents["programs"]) == ["p1", "p2", "p3", "p4", "p5"]
+    assert {row["name"]: row["watermark"] for row in db.tables["job_watermarks"]} == {
+        "meilisearch:institutions": "2026-01-02T00:00:00+00:00",
+        "meilisearch:programs": "2026-01-09T00:00:00+00:00",
+    }
+
+
+def test_next_run_only_pulls_changes_and_follows_denormalised_rows(tmp_path):
+    db = Database(
+        institutions=[institution("i1", "UNILAG", "2026-01-01T00:00:00+00:00"),
+                      institution("i2", "OAU", "2025-06-01T00:00:00+00:00")],
+        programs=[program("p1", "i1", "2025-06-01T00:00:00+00:00"),
+                  program("p2", "i2", "2026-01-01T00:00:00+00:00")],
+    )
+    watermarks = FileWatermarks(str(tmp_path / "state.json"))
+    syncer = IncrementalSync(db, FakeMeilisearch(), watermarks)
+    syncer.sync_once(TARGETS)
+
+    # i1 renamed, p2 soft-deleted; both stamped after the watermark
+    db.tables["institutions"][0].update(name="University of Lagos", updated_at="2026-02-01T00:00:00+00:00")
+    db.tables["programs"][1].update(deleted_at="2026-02-01T00:00:00+00:00", updated_at="2026-02-01T00:00:00+00:00")
+    db.requests.clear()
+    results = syncer.sync_once(TARGETS)
+
+    # Sweeps start at the stored watermark minus the overlap
+    sweep = next(params for name, params in db.requests if name == "programs")
+    assert ("updated_at", "gte.2025-12-31T23:55:00+00:00") in sweep
+    assert results["institutions"] == {"changed": 1, "upserted": 2, "deleted": 0}  # i2 recounted
+    assert results["programs"] == {"changed": 1, "upserted": 1, "deleted": 1}  # p1 follows i1
+    documents = syncer.meilisearch.documents
+    assert documents["institutions"]["i1"]["name"] == "University of Lagos"
+    assert documents["institutions"]["i2"]["program_count"] == 0
+    assert "p2" not in documents["programs"]
+    assert watermarks.get("meilisearch:programs") == "2026-02-01T00:00:00+00:00"
+
+
+def test_failed_task_does_not_advance_watermark():
+    db = Database(institutions=[], programs=[program("p1", "i1", "2026-01-01T00:00:00+00:00")])
+
+    with pytest.raises(RuntimeError, match="failed"):
+        IncrementalSync(db, FakeMeilisearch(fail=True), TableWatermarks(db)).sync_once(TARGETS[1:])
+    assert db.tables.get("job_watermarks", []) == []
+
+
+async def test_production_full_sync_joins_institutions_in_memory(monkeypatch):
+    """One paged institutions sweep instead of a lookup per program"""
+    monkeypatch.setattr(sync_meilisearch_production, "PAGE_SIZE", 3)
+    monkeypatch.setattr(sync_meilisearch_production, "BATCH_SIZE", 2)
+    monkeypatch.setattr(sync_meilisearch_production, "MAX_IN_FLIGHT", 2)
+    db = Database(
+        institutions=[
+            {"id": f"i{n}", "name": f"Uni {n}", "short_name": f"U{n}", "state": "Lagos", "type": "federal"}
+            for n in range(4)
+        ],
+        programs=[program(f"p{n}", f"i{n % 4}", "2026-01-01T00:00:00+00:00") for n in range(7)]
+        + [program("p9", "i0", "2026-01-01T00:00:00+00:00", status="draft")],
+    )
+    meili = FakeMeilisearch()
+
+    result = await sync_meilisearch_production.sync_programs_to_meilisearch(db, meili)
+
+    assert result["success"] and result["programs_synced"] == 7
+    assert set(result["timings"]) == {"fetch institutions", "fetch + submit programs", "indexing", "total"}
+    assert [name for name, _ in db.requests].count("institutions") == 2  # pages of 3 + 1
+    documents = meili.documents["programs"]
+    assert sorted(documents) == [f"p{n}" for n in range(7)]
+    assert documents["p5"]["institution_name"] == "Uni 1" and documents["p5"]["state"] == "Lagos"
+    assert "institution" not in documents["p5"]
+
+
+async def test_change_events_are_coalesced_and_indexed_in_one_batch():
+    db = Database(
+        institutions=[institution("i1", "UNILAG", "2026-01-01T00:00:00+00:00")],
+        programs=[program("p1", "i1", "2026-01-01T00:00:00+00:00"),
+                  program("p2", "i1", "2026-01-01T00:00:00+00:00")],
+    )
+    meili = FakeMeilisearch()
+    meili.documents["programs"] = {"p3": {"id": "p3"}}
+    publisher = LocalChangePublisher()
+    indexer = SearchIndexer(TARGETS, window_seconds=0.05)
+    await indexer.start(publisher, lambda: db, lambda: meili)
+
+    # An admin saving p1 five times, then a hard delete of p3
+    for _ in range(5):
+        publisher.publish("programs", "UPDATE", {"id": "p1", "institution_id": "i1"})
+    publisher.publish("programs", "DELETE", old_record={"id": "p3"})
+    publisher.publish("deadlines", "UPDATE", {"id": "d1"})
+    await asyncio.sleep(0.2)
+
+    assert indexer.events == 6 and indexer.flushes == 1
+    assert meili.tasks == 3  # programs upsert, programs delete, institution recount
+    assert sorted(meili.documents["programs"]) == ["p1"]
+    assert meili.documents["institutions"]["i1"]["program_count"] == 2
+
+    publisher.publish("programs", "UPDATE", {"id": "p2"})
+    await indexer.stop()  # flushes what is pending
+    assert sorted(meili.documents["programs"]) == ["p1", "p2"]
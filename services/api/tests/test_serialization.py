@@ -0,0 +1,56 @@
+"""
+Response Serialization Tests
+Tests for the FAST_JSON_RESPONSES path
+"""
+import pytest
+
+from core.config import settings
+from core.dependencies import get_institution_service
+from core.serialization import model_response
+from main import app
+from schemas.institutions import InstitutionListResponse
+
+ROW = {
+    "id": "i1", "slug": "unilag", "name": "University of Lagos", "short_name": "UNILAG",
+    "type": "federal_university", "state": "Lagos", "city": "Lagos", "verified": True,
+    "program_count": 3, "description": "not part of the list model",
+}
+PAGINATION = {"page": 1, "page_size": 20, "total": 1, "total_pages": 1, "has_prev": False, "has_next": False}
+
+
+class Institutions:
+    async def list_institutions(self, filters):
+        return InstitutionListResponse.model_validate({"data": [ROW], "pagination": PAGINATION})
+
+
+@pytest.fixture
+def institutions_client(client):
+    app.dependency_overrides[get_institution_service] = Institutions
+    yield client
+    app.dependency_overrides.pop(get_institution_service, None)
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_fast_path_sends_the_same_body(institutions_client, monkeypatch, fast):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+
+    response = institutions_client.get("/api/v1/institutions")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["etag"]
+    assert response.json()["data"] == [{k: v for k, v in ROW.items() if k != "description"} | {
+        "logo_url": None, "website": None,
+    }]
+    revalidated = institutions_client.get("/api/v1/institutions", headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_only_models_bypass_response_model(monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    rows = {"data": [ROW], "pagination": PAGINATION}
+
+    # Plain data still goes through response_model, which drops extra columns
+    assert model_response(rows) is rows
+    sent = model_response(InstitutionListResponse.model_validate(rows))
+    assert b"description" not in sent.body